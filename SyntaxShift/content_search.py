@@ -0,0 +1,393 @@
+"""
+This module provides the builtin engine behind the 'search' command.
+
+The files are searched by a pool of worker processes, so the regular
+expression engine, which holds the GIL, runs on every core. Each worker
+memory-maps the file it is given and runs a compiled bytes regex over the
+mapping: the file is never read into a Python string, and the pages are
+shared with the page cache instead of copied.
+
+The candidate files are the files with an extension of 'VALID_EXTENSIONS'
+(or of '--ext'), found by the parallel walker of 'find'. They are cut into
+ranges of at most 'CHUNK_SIZE' bytes: a large file is searched by several
+workers at once, small files are grouped into one task to save the cost of
+sending them to a worker one by one. A range is extended to whole lines,
+a worker reports the lines that start in its range and the number of lines
+of the range, from which the line numbers are computed.
+
+Results are written in the order the files were found, as soon as the
+tasks before them are done. At most 'PENDING_PER_WORKER' tasks per worker
+are submitted ahead of the output, so memory stays bounded whatever the
+size of the tree. A file with a NUL byte in its first 'BINARY_CHECK_BYTES'
+bytes is binary and skipped, as 'grep' does.
+
+Output, one line per matching line:
+    path:line:text
+
+Supported options:
+    search <pattern> <path> [--ignore-case] [--ext .log,.csv]
+"""
+
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from threading import Event
+from typing import Deque, Iterator, List, NamedTuple, TextIO, Tuple
+import mmap
+import multiprocessing
+import os
+import re
+import signal
+import sys
+
+from SyntaxShift.file_finder import FileFinder, FindOptions
+from validator.static.constant_types import VALID_EXTENSIONS
+from validator.static.exceptions import InspectionError
+
+
+# the largest range of a file searched by one task
+CHUNK_SIZE = 16 * 1024 * 1024
+# small files are grouped into tasks of up to this many bytes, or files
+TASK_BYTES = 4 * 1024 * 1024
+TASK_FILES = 256
+# tasks submitted ahead of the output, per worker
+PENDING_PER_WORKER = 4
+# a file with a NUL byte in its first bytes is binary
+BINARY_CHECK_BYTES = 8192
+# matching lines are cut at this many bytes
+MAX_LINE_BYTES = 1024
+# the lines of a range are counted in pieces of this size, each piece is copied once
+COUNT_PIECE = 1024 * 1024
+
+IGNORE_CASE_OPTIONS = ("--ignore-case", "-i")
+
+
+@dataclass
+class SearchOptions:
+    """
+    The options accepted by the 'search' command.
+
+    Attributes:
+        ignore_case (bool): Match the pattern case-insensitively (ASCII letters only).
+        extensions (tuple[str, ...]): The extensions of the files searched,
+            'VALID_EXTENSIONS' by default.
+    """
+    ignore_case: bool = False
+    extensions: tuple[str, ...] = tuple(VALID_EXTENSIONS)
+
+    @classmethod
+    def from_arguments(cls, arguments: List[str]) -> "SearchOptions":
+        """
+        Builds the options from the words following the searched path.
+
+        Raises:
+            InspectionError: If an option is unknown, is missing its value or has an invalid value.
+        """
+        options = cls()
+        words = iter(arguments)
+
+        for word in words:
+            if word in IGNORE_CASE_OPTIONS:
+                options.ignore_case = True
+                continue
+            if word != "--ext":
+                raise InspectionError(
+                    f"Invalid option '{word}' for search, type help search to see valid options"
+                )
+
+            value = next(words, None)
+            extensions = tuple(extension for extension in (value or "").split(",") if extension)
+            invalid = [extension for extension in extensions if extension not in VALID_EXTENSIONS]
+            if invalid or not extensions:
+                raise InspectionError(f"Invalid extension filter '{value}' for search")
+            options.extensions = extensions
+
+        return options
+
+    @property
+    def flags(self) -> int:
+        """
+        The flags the pattern is compiled with.
+        """
+        return re.MULTILINE | (re.IGNORECASE if self.ignore_case else 0)
+
+
+def compile_pattern(pattern: str, options: SearchOptions) -> re.Pattern:
+    """
+    Raises:
+        InspectionError: If the pattern is not a valid regular expression.
+    """
+    try:
+        return compiled(os.fsencode(pattern), options.flags)
+    except re.error as error:
+        raise InspectionError(f"Invalid pattern '{pattern}' for search: {error}") from error
+
+
+@lru_cache(maxsize=16)
+def compiled(pattern: bytes, flags: int) -> re.Pattern:
+    """
+    Compiles the pattern once per worker process, every task of a search sends the same pattern.
+    """
+    return re.compile(pattern, flags)
+
+
+class RangeResult(NamedTuple):
+    """
+    The matching lines of a range of a file, found by a worker.
+
+    Attributes:
+        path (str): The searched file.
+        lines (int): The number of line breaks in the range.
+        matches (List[Tuple[int, bytes]]): The line number in the range, from 1, and the
+            text of every matching line.
+        binary (bool): Whether the file is binary, it was not searched.
+        error (str | None): Why the file could not be read.
+    """
+    path: str
+    lines: int
+    matches: List[Tuple[int, bytes]]
+    binary: bool = False
+    error: str | None = None
+
+
+def line_start_at_or_after(mapped: mmap.mmap, position: int) -> int:
+    """
+    Returns the start of the first line starting at or after the position.
+    """
+    if position <= 0:
+        return 0
+    if position >= len(mapped) or mapped[position - 1] == 0x0A:
+        return min(position, len(mapped))
+    newline = mapped.find(b"\n", position)
+    return len(mapped) if newline == -1 else newline + 1
+
+
+def count_lines(mapped: mmap.mmap, start: int, end: int) -> int:
+    """
+    Counts the line breaks in [start, end), 'COUNT_PIECE' bytes at a time.
+    """
+    return sum(
+        mapped[offset:min(offset + COUNT_PIECE, end)].count(b"\n")
+        for offset in range(start, end, COUNT_PIECE)
+    )
+
+
+def search_range(regex: re.Pattern, path: str, start: int, end: int) -> RangeResult:
+    """
+    Searches the lines starting within [start, end) of the file.
+    """
+    try:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return RangeResult(path, 0, [])
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if mapped.find(b"\0", 0, BINARY_CHECK_BYTES) != -1:
+                    return RangeResult(path, 0, [], binary=True)
+
+                first = line_start_at_or_after(mapped, start)
+                last = line_start_at_or_after(mapped, end)
+                matches = []
+                # the number of the line starting at 'counted', within the range
+                line, counted, position = 1, first, first
+                while position < last:
+                    match = regex.search(mapped, position, last)
+                    if match is None:
+                        break
+                    if match.start() >= last:
+                        # an empty match at the end of the range is at the start of the next line,
+                        # searched by the next range, or past the last line of the file
+                        break
+                    line_start = mapped.rfind(b"\n", first, match.start()) + 1 or first
+                    line += count_lines(mapped, counted, line_start)
+                    counted = line_start
+                    line_end = mapped.find(b"\n", line_start, last)
+                    line_end = last if line_end == -1 else line_end
+                    text_end = min(line_end, line_start + MAX_LINE_BYTES)
+                    matches.append((line, mapped[line_start:text_end]))
+                    # one result per line, as 'grep'
+                    position = line_end + 1
+                return RangeResult(path, line - 1 + count_lines(mapped, counted, last), matches)
+    except (OSError, ValueError) as error:
+        # ValueError: the file was emptied since its size was read
+        return RangeResult(path, 0, [], error=str(error))
+
+
+def search_ranges(pattern: bytes, flags: int,
+                  ranges: List[Tuple[str, int, int]]) -> List[RangeResult]:
+    """
+    The task run by the workers: searches every range with the pattern.
+    """
+    regex = compiled(pattern, flags)
+    return [search_range(regex, path, start, end) for path, start, end in ranges]
+
+
+def ignore_interrupts() -> None:
+    """
+    Run in every worker: Ctrl-C reaches the whole process group, the search
+    is stopped by the shell, not by the workers.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def process_pool(jobs: int) -> ProcessPoolExecutor:
+    """
+    Returns a pool of 'jobs' worker processes that ignore Ctrl-C.
+    """
+    # a forked child of the threads of the shell could deadlock, the workers are started clean
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+    return ProcessPoolExecutor(jobs, mp_context=context, initializer=ignore_interrupts)
+
+
+@dataclass
+class SearchSummary:
+    """
+    The totals of a 'search', printed once it is done.
+    """
+    matches: int = 0
+    files: int = 0
+    matching_files: int = 0
+    binary: int = 0
+    unreadable: int = 0
+    stopped: bool = False
+
+    def __str__(self) -> str:
+        summary = (
+            f"{self.matches} matching line(s) in {self.matching_files} of {self.files} file(s)"
+        )
+        if self.binary:
+            summary += f", {self.binary} binary file(s) skipped"
+        if self.unreadable:
+            summary += f", {self.unreadable} could not be read"
+        return summary
+
+
+class ContentSearch:
+    """
+    Searches the files of a path with a regular expression on a pool of
+    'jobs' worker processes and writes every matching line.
+
+    Attributes:
+        pattern (str): The regular expression, matched against the bytes of the files.
+        path (str): A file, or a directory searched recursively.
+        options (SearchOptions): The options of the search.
+        jobs (int): The number of worker processes.
+    """
+
+    def __init__(self, pattern: str, path: str, options: SearchOptions | None = None,
+                 jobs: int = 1):
+        self.pattern = pattern
+        self.path = path
+        self.options = options or SearchOptions()
+        self.jobs = jobs if jobs > 1 else os.cpu_count() or 1
+        self.summary = SearchSummary()
+        self.regex = compile_pattern(pattern, self.options)
+        # the results come in the order of the files: the file being written,
+        # and the number of lines of its ranges written so far
+        self._current: str | None = None
+        self._lines_before = 0
+        self._matched = False
+        self._skipped = False
+
+    def files(self, stop: Event | None) -> Iterator[str]:
+        """
+        Yields the searched path when it is a file, every file of the tree
+        with a searched extension otherwise.
+        """
+        if not os.path.isdir(self.path):
+            yield self.path
+            return
+        finder = FileFinder(self.path, FindOptions(extensions=self.options.extensions))
+        for batch in finder.batches(stop):
+            yield from batch
+
+    def tasks(self, stop: Event | None) -> Iterator[List[Tuple[str, int, int]]]:
+        """
+        Yields the ranges of the files to search, grouped into tasks.
+        """
+        task: List[Tuple[str, int, int]] = []
+        task_bytes = 0
+        for path in self.files(stop):
+            self.summary.files += 1
+            try:
+                size = os.stat(path).st_size
+            except OSError:
+                # searched anyway, the worker reports the error
+                size = 0
+            for start in range(0, max(size, 1), CHUNK_SIZE):
+                end = min(start + CHUNK_SIZE, size)
+                task.append((path, start, end))
+                task_bytes += end - start
+                if task_bytes >= TASK_BYTES or len(task) >= TASK_FILES:
+                    yield task
+                    task, task_bytes = [], 0
+        if task:
+            yield task
+
+    def run(self, output: TextIO | None = None, stop: Event | None = None) -> SearchSummary:
+        """
+        Searches the path, writing the matching lines to the output (the
+        terminal by default) in the order of the files, until the search is
+        done or 'stop' is set. A file smaller than a chunk is searched in-process.
+        """
+        output = output or sys.stdout
+        stop = stop or Event()
+        if not os.path.isdir(self.path) and os.path.getsize(self.path) <= CHUNK_SIZE:
+            self.summary.files = 1
+            self.write(output, [search_range(self.regex, self.path, 0, CHUNK_SIZE)])
+            return self.summary
+
+        pending: Deque[Future] = deque()
+        with process_pool(self.jobs) as pool:
+            try:
+                for task in self.tasks(stop):
+                    pending.append(
+                        pool.submit(search_ranges, self.regex.pattern, self.regex.flags, task)
+                    )
+                    # write what is done, and wait for the oldest task once enough are ahead
+                    # of the output
+                    while pending and not stop.is_set() and (
+                            pending[0].done() or len(pending) >= self.jobs * PENDING_PER_WORKER):
+                        self.write(output, pending.popleft().result())
+                    if stop.is_set():
+                        break
+                while pending and not stop.is_set():
+                    self.write(output, pending.popleft().result())
+            finally:
+                for future in pending:
+                    future.cancel()
+
+        self.summary.stopped = stop.is_set()
+        return self.summary
+
+    def write(self, output: TextIO, results: List[RangeResult]) -> None:
+        """
+        Writes the matching lines of the results, numbered from the lines of
+        the ranges of the same file written before them.
+        """
+        lines = []
+        for result in results:
+            if result.path != self._current:
+                self._current, self._lines_before, self._matched = result.path, 0, False
+                self._skipped = result.binary or result.error is not None
+                if result.binary:
+                    self.summary.binary += 1
+                elif result.error is not None:
+                    self.summary.unreadable += 1
+            if self._skipped:
+                # every range of a binary file is binary, it is only counted once
+                continue
+
+            if result.matches and not self._matched:
+                self._matched = True
+                self.summary.matching_files += 1
+            base = self._lines_before
+            self._lines_before += result.lines
+            self.summary.matches += len(result.matches)
+            for line, text in result.matches:
+                text = text.rstrip(b"\r").decode(errors="replace")
+                lines.append(f"{result.path}:{base + line}:{text}")
+        if lines:
+            output.write("\n".join(lines) + "\n")
+            output.flush()
@@ -1,5 +1,15 @@
-from validator.static.constant_types import DIRECTORY_OPERATIONS, DirectoryOperation
+from typing import TextIO
+import os
+
+from SyntaxShift.tree_remover import RemovalProgress, TreeRemover
+from validator.static.constant_types import (
+    DIRECTORY_OPERATIONS,
+    MAKE_PARENTS_FLAGS,
+    MAKE_PARENTS_OPTIONS,
+    DirectoryOperation,
+)
 from validator.static.exceptions import DirectoryManagementError
+from validator.stat_snapshot import current_snapshot
 
 
 class DirectoryManagementHandler:
@@ -9,6 +19,19 @@ class DirectoryManagementHandler:
         self.operating_system = operation_system
 
 
+    def platform_command(self):
+        """
+        Returns the platform command of the operation, for pipelines and redirection.
+        """
+        return self.make_directory_command()
+
+    @property
+    def parents(self) -> bool:
+        """
+        Whether 'make' was asked to create the missing parent directories too.
+        """
+        return any(option in MAKE_PARENTS_OPTIONS for option in self.operation[2:])
+
     def make_directory_command(self):
 
         operation = DirectoryOperation(self.operation[0])
@@ -16,4 +39,47 @@ class DirectoryManagementHandler:
 
         if operation == DirectoryOperation.CURRENT:
             return command
+        if operation == DirectoryOperation.MAKE and self.parents:
+            return command + MAKE_PARENTS_FLAGS[self.operating_system] + [self.operation[1]]
         return command + [self.operation[1]]
+
+    def make_directory(self) -> None:
+        """
+        Creates the directory in-process, in parents mode every missing
+        directory of the path is created in a single pass from the top down.
+
+        Raises:
+            DirectoryManagementError: If a directory could not be created.
+        """
+        path = self.operation[1]
+        try:
+            if self.parents:
+                os.makedirs(path, exist_ok=True)
+            else:
+                os.mkdir(path)
+        except OSError as error:
+            raise DirectoryManagementError(f"Failed to make '{path}': {error.strerror}") from error
+        finally:
+            current_snapshot().invalidate(path)
+
+    def remove_directory(self, jobs: int = 1, output: TextIO | None = None) -> RemovalProgress:
+        """
+        Removes the directory and its whole tree in-process with 'jobs' worker threads,
+        printing progress to 'output' while it runs.
+
+        Returns:
+            RemovalProgress: The totals of the removal.
+
+        Raises:
+            DirectoryManagementError: With the totals and the failures when anything
+                was left behind.
+        """
+        path = self.operation[1]
+        try:
+            progress = TreeRemover(path, jobs, output).remove()
+        finally:
+            current_snapshot().invalidate(path)
+
+        if progress.failures:
+            raise DirectoryManagementError(str(progress))
+        return progress
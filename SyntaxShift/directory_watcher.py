@@ -0,0 +1,537 @@
+"""
+This module provides the builtin engine behind the 'watch' command.
+
+Instead of running 'list' over and over, which rereads the whole directory
+every time, the directory is watched for changes and only the changes are
+printed: files created, deleted, renamed and modified.
+
+On Linux the kernel reports the changes through inotify, called with
+ctypes: the watcher sleeps in 'select' on the inotify descriptor and costs
+nothing while the directory is quiet. Elsewhere, when inotify is not
+available or its watch limit is reached, and with '--poll' (network file
+systems do not report remote changes to inotify) the directory is scanned
+every 'PollingWatcher.INTERVAL' seconds and compared to the previous scan.
+
+The changes are coalesced: the events read within 'COALESCE_DELAY' of the
+first one are merged per path before they are printed, so a file written
+a thousand times is reported modified once, a file created then written is
+only reported created, and a temporary file created then deleted is not
+reported at all. With '--recursive' the subdirectories are watched too,
+including those created while the command runs.
+
+Supported options:
+    watch <directory> [--recursive] [--poll]
+"""
+
+from enum import StrEnum
+from functools import lru_cache
+from threading import Event
+from time import monotonic, sleep
+from typing import Dict, Iterator, List, NamedTuple
+import ctypes
+import errno
+import os
+import select
+import stat
+import struct
+import sys
+
+
+# events read within this delay of the first one are merged into one batch
+COALESCE_DELAY = 0.2
+# how often a watcher that can be stopped checks whether it was
+WAKEUP_INTERVAL = 0.5
+
+# inotify(7)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = getattr(os, "O_NONBLOCK", 0)
+IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0)
+
+WATCH_MASK = (IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+              | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+
+# struct inotify_event { int wd; uint32_t mask; uint32_t cookie; uint32_t len; char name[]; }
+EVENT_HEADER = struct.Struct("iIII")
+READ_SIZE = 64 * 1024
+
+
+class ChangeKind(StrEnum):
+    """
+    The kinds of changes reported by 'watch'.
+    """
+    CREATED = "created"
+    DELETED = "deleted"
+    MODIFIED = "modified"
+    RENAMED = "renamed"
+    # the kernel queue overflowed, changes were lost
+    OVERFLOW = "overflow"
+
+
+class WatchEvent(NamedTuple):
+    """
+    A change of the watched tree.
+
+    Attributes:
+        kind (ChangeKind): What changed.
+        path (str): The path that changed, the new path of a renamed entry.
+        source (str | None): The previous path of a renamed entry.
+    """
+    kind: ChangeKind
+    path: str
+    source: str | None = None
+
+    def __str__(self) -> str:
+        if self.kind == ChangeKind.RENAMED:
+            return f"{self.kind:<9}{self.source} -> {self.path}"
+        if self.kind == ChangeKind.OVERFLOW:
+            return f"{self.kind:<9}too many changes at once, some were not reported"
+        return f"{self.kind:<9}{self.path}"
+
+
+class EventBatch:
+    """
+    Merges the changes of one batch per path, in the order the paths first changed.
+    """
+
+    def __init__(self) -> None:
+        self._events: Dict[str, WatchEvent] = {}
+        # the sources of the renames whose destination has not been read yet, by cookie
+        self._moves: Dict[int, str] = {}
+        self.overflowed = False
+
+    def created(self, path: str) -> None:
+        """
+        Records a new entry, a deleted entry created again is modified.
+        """
+        previous = self._events.pop(path, None)
+        # deleted then created again is a replaced file
+        replaced = previous is not None and previous.kind == ChangeKind.DELETED
+        kind = ChangeKind.MODIFIED if replaced else ChangeKind.CREATED
+        self._events[path] = WatchEvent(kind, path)
+
+    def deleted(self, path: str) -> None:
+        """
+        Records a removed entry, cancelling the changes of the batch it undoes.
+        """
+        previous = self._events.pop(path, None)
+        if previous is None or previous.kind in (ChangeKind.MODIFIED, ChangeKind.DELETED):
+            self._events[path] = WatchEvent(ChangeKind.DELETED, path)
+        elif previous.kind == ChangeKind.RENAMED:
+            self._events[previous.source] = WatchEvent(ChangeKind.DELETED, previous.source)
+        # created then deleted within the batch: nothing to report
+
+    def modified(self, path: str) -> None:
+        """
+        Records a change of content, unless the entry already has an event.
+        """
+        if path not in self._events:
+            self._events[path] = WatchEvent(ChangeKind.MODIFIED, path)
+
+    def moved_from(self, cookie: int, path: str) -> None:
+        """
+        Records the source of a rename until its destination is read.
+        """
+        self._moves[cookie] = path
+
+    def moved_to(self, cookie: int, path: str) -> str | None:
+        """
+        Records the destination of a rename.
+
+        Returns:
+            str | None: The source of the rename, None when it was moved in from outside the tree.
+        """
+        source = self._moves.pop(cookie, None)
+        if source is None:
+            self.created(path)
+            return None
+
+        previous = self._events.pop(source, None)
+        renamed = previous is not None and previous.kind == ChangeKind.RENAMED
+        if previous is not None and previous.kind == ChangeKind.CREATED:
+            self.created(path)
+        elif renamed and previous.source == path:
+            # renamed back to its original name
+            pass
+        else:
+            original = previous.source if renamed else source
+            self._events.pop(path, None)
+            self._events[path] = WatchEvent(ChangeKind.RENAMED, path, original)
+        return source
+
+    def flush(self) -> List[WatchEvent]:
+        """
+        Returns the merged changes, a rename whose destination is outside the tree is a deletion.
+        """
+        for source in self._moves.values():
+            self.deleted(source)
+        self._moves.clear()
+        events = list(self._events.values())
+        if self.overflowed:
+            events.insert(0, WatchEvent(ChangeKind.OVERFLOW, ""))
+        return events
+
+
+@lru_cache(maxsize=None)
+def inotify_library():
+    """
+    Returns the C library with its inotify functions typed, None where inotify is not available.
+    """
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        # the C library the interpreter is linked with, without searching for it with ldconfig
+        libc = ctypes.CDLL(None, use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+class DirectoryWatcher:
+    """
+    Base class of the watchers, a watcher is iterated with 'batches' then closed.
+
+    Attributes:
+        root (str): The watched directory, as given by the user.
+        recursive (bool): Whether the subdirectories are watched too.
+    """
+
+    backend = ""
+
+    def __init__(self, root: str, recursive: bool):
+        self.root = root
+        self.recursive = recursive
+
+    def batches(self, stop: Event | None = None) -> Iterator[List[WatchEvent]]:
+        """
+        Yields the coalesced changes as they happen, until 'stop' is set or
+        the watched directory is removed.
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """
+        Releases what the watcher holds, nothing for the base class.
+        """
+        pass
+
+    def __enter__(self) -> "DirectoryWatcher":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class InotifyWatcher(DirectoryWatcher):
+    """
+    Watches the tree with inotify, one kernel watch per directory.
+    """
+
+    backend = "inotify"
+
+    def __init__(self, root: str, recursive: bool, libc):
+        super().__init__(root, recursive)
+        self._libc = libc
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            code = ctypes.get_errno()
+            raise OSError(code, os.strerror(code))
+        # the directory of every watch descriptor, and back
+        self._paths: Dict[int, str] = {}
+        self._watches: Dict[str, int] = {}
+        self._root_removed = False
+        try:
+            self.add_watch(root)
+            if recursive:
+                self.add_tree(root)
+        except OSError:
+            self.close()
+            raise
+
+    def add_watch(self, directory: str) -> None:
+        """
+        Raises:
+            OSError: If the directory cannot be watched, ENOSPC once the
+                per user watch limit (fs.inotify.max_user_watches) is reached.
+        """
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            code = ctypes.get_errno()
+            raise OSError(code, os.strerror(code), directory)
+        self._paths[wd] = directory
+        self._watches[directory] = wd
+
+    def add_tree(self, directory: str, batch: EventBatch | None = None) -> None:
+        """
+        Watches every subdirectory of the directory. The entries found in a
+        directory created while the command runs are reported created in the
+        batch, they may have been created before its watch was added.
+        """
+        for current, directories, files in os.walk(directory):
+            if batch is not None and current != directory:
+                batch.created(current)
+            for name in directories:
+                path = os.path.join(current, name)
+                try:
+                    self.add_watch(path)
+                except OSError as error:
+                    if error.errno == errno.ENOSPC and batch is None:
+                        raise
+                    # removed meanwhile, or out of watches for a new directory: not watched
+            if batch is not None:
+                for name in files:
+                    batch.created(os.path.join(current, name))
+
+    def forget_tree(self, directory: str) -> None:
+        """
+        Removes the watches of a directory moved out of the tree, the kernel keeps watching it.
+        """
+        prefix = directory + os.sep
+        watched = [path for path in self._watches if path == directory or path.startswith(prefix)]
+        for path in watched:
+            self._libc.inotify_rm_watch(self.fd, self._watches.pop(path))
+
+    def move_tree(self, source: str, destination: str) -> None:
+        """
+        Renames the paths of the watches of a directory renamed within the tree.
+        """
+        prefix = source + os.sep
+        for path in [path for path in self._watches if path == source or path.startswith(prefix)]:
+            wd = self._watches.pop(path)
+            moved = destination + path[len(source):]
+            self._paths[wd] = moved
+            self._watches[moved] = wd
+
+    def wait_readable(self, timeout: float | None) -> bool:
+        """
+        Returns:
+            bool: Whether events can be read before 'timeout' seconds.
+        """
+        return bool(select.select([self.fd], [], [], timeout)[0])
+
+    def batches(self, stop: Event | None = None) -> Iterator[List[WatchEvent]]:
+        # a watcher nobody can stop sleeps until the kernel has an event
+        timeout = WAKEUP_INTERVAL if stop is not None else None
+        while not self._root_removed and not (stop is not None and stop.is_set()):
+            if not self.wait_readable(timeout):
+                continue
+
+            batch = EventBatch()
+            deadline = monotonic() + COALESCE_DELAY
+            while True:
+                self.read_events(batch)
+                remaining = deadline - monotonic()
+                if self._root_removed or remaining <= 0 or not self.wait_readable(remaining):
+                    break
+
+            events = batch.flush()
+            for event in events:
+                if event.kind == ChangeKind.DELETED and event.path in self._watches:
+                    self.forget_tree(event.path)
+            if events:
+                yield events
+
+    def read_events(self, batch: EventBatch) -> None:
+        """
+        Reads every event queued by the kernel into the batch.
+        """
+        while True:
+            try:
+                data = os.read(self.fd, READ_SIZE)
+            except BlockingIOError:
+                return
+            offset = 0
+            while offset < len(data):
+                wd, mask, cookie, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+                offset += length
+                self.handle_event(batch, wd, mask, cookie, name)
+
+    def handle_event(self, batch: EventBatch, wd: int, mask: int, cookie: int, name: str) -> None:
+        """
+        Adds one inotify event to the batch, watching the directories created in the tree.
+        """
+        if mask & IN_Q_OVERFLOW:
+            batch.overflowed = True
+            return
+
+        directory = self._paths.get(wd)
+        if directory is None:
+            return
+        if mask & IN_IGNORED:
+            # the directory was removed or is no longer watched
+            del self._paths[wd]
+            if self._watches.get(directory) == wd:
+                del self._watches[directory]
+            return
+        if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+            # a subdirectory is reported by the event of its parent
+            if directory == self.root:
+                batch.deleted(self.root)
+                self._root_removed = True
+            return
+
+        path = os.path.join(directory, name)
+        is_directory = bool(mask & IN_ISDIR)
+        if mask & IN_CREATE:
+            batch.created(path)
+            if is_directory and self.recursive:
+                self.add_watch_of_new(path, batch)
+        elif mask & IN_DELETE:
+            batch.deleted(path)
+        elif mask & IN_MOVED_FROM:
+            batch.moved_from(cookie, path)
+        elif mask & IN_MOVED_TO:
+            source = batch.moved_to(cookie, path)
+            if is_directory and self.recursive:
+                if source is not None and source in self._watches:
+                    self.move_tree(source, path)
+                else:
+                    self.add_watch_of_new(path, None)
+        elif not is_directory:
+            batch.modified(path)
+
+    def add_watch_of_new(self, directory: str, batch: EventBatch | None) -> None:
+        """
+        Watches a directory created in or moved into the tree, with its subdirectories.
+        """
+        try:
+            self.add_watch(directory)
+        except OSError:
+            # already removed again, or out of watches
+            return
+        self.add_tree(directory, batch)
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class EntryState(NamedTuple):
+    """
+    What a scan of 'PollingWatcher' keeps of an entry to detect its changes.
+    """
+    inode: int
+    mtime_ns: int
+    size: int
+    is_directory: bool
+
+
+class PollingWatcher(DirectoryWatcher):
+    """
+    Watches the tree by scanning it every 'INTERVAL' seconds and comparing
+    the scans. A rename is recognized by the inode of the entry.
+    """
+
+    backend = "polling"
+    INTERVAL = 1.0
+
+    def __init__(self, root: str, recursive: bool):
+        super().__init__(root, recursive)
+        self._entries = self.scan()
+
+    def scan(self) -> Dict[str, EntryState]:
+        """
+        Returns:
+            Dict[str, EntryState]: The state of every entry below the root, by path.
+        """
+        entries: Dict[str, EntryState] = {}
+        pending = [self.root]
+        while pending:
+            try:
+                with os.scandir(pending.pop()) as iterator:
+                    for entry in iterator:
+                        try:
+                            info = entry.stat(follow_symlinks=False)
+                        except OSError:
+                            continue
+                        is_directory = stat.S_ISDIR(info.st_mode)
+                        entries[entry.path] = EntryState(
+                            info.st_ino, info.st_mtime_ns, info.st_size, is_directory
+                        )
+                        if is_directory and self.recursive:
+                            pending.append(entry.path)
+            except OSError:
+                # removed since its parent was read
+                continue
+        return entries
+
+    @staticmethod
+    def compare(previous: Dict[str, EntryState],
+                current: Dict[str, EntryState]) -> List[WatchEvent]:
+        """
+        Returns:
+            List[WatchEvent]: The changes between two scans, a rename is matched by inode.
+        """
+        events = []
+        renames: Dict[str, str] = {}
+        added = {current[path].inode: path for path in current.keys() - previous.keys()}
+        for path in previous.keys() - current.keys():
+            destination = added.pop(previous[path].inode, None)
+            if destination is None:
+                events.append(WatchEvent(ChangeKind.DELETED, path))
+            else:
+                renames[path] = destination
+        events.extend(WatchEvent(ChangeKind.CREATED, path) for path in added.values())
+        # the entries of a renamed directory are renamed with it, only the directory is reported
+        events.extend(
+            WatchEvent(ChangeKind.RENAMED, destination, source)
+            for source, destination in renames.items()
+            if renames.get(os.path.dirname(source)) != os.path.dirname(destination)
+        )
+
+        for path in current.keys() & previous.keys():
+            state, old = current[path], previous[path]
+            if not state.is_directory and (state.mtime_ns, state.size, state.inode) != (
+                    old.mtime_ns, old.size, old.inode):
+                events.append(WatchEvent(ChangeKind.MODIFIED, path))
+        return sorted(events, key=lambda event: event.path)
+
+    def batches(self, stop: Event | None = None) -> Iterator[List[WatchEvent]]:
+        while True:
+            if stop is None:
+                sleep(PollingWatcher.INTERVAL)
+            elif stop.wait(PollingWatcher.INTERVAL):
+                return
+
+            if not os.path.isdir(self.root):
+                yield [WatchEvent(ChangeKind.DELETED, self.root)]
+                return
+            entries = self.scan()
+            events = self.compare(self._entries, entries)
+            self._entries = entries
+            if events:
+                yield events
+
+
+def open_watcher(root: str, recursive: bool = False, poll: bool = False) -> DirectoryWatcher:
+    """
+    Returns an inotify watcher where it is available, a polling watcher otherwise.
+
+    Raises:
+        OSError: If the directory cannot be read.
+    """
+    libc = None if poll else inotify_library()
+    if libc is not None:
+        try:
+            return InotifyWatcher(root, recursive, libc)
+        except OSError as error:
+            # out of inotify instances or watches: poll instead
+            if error.errno not in (errno.EMFILE, errno.ENOSPC):
+                raise
+    return PollingWatcher(root, recursive)
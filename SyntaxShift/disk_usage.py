@@ -0,0 +1,423 @@
+"""
+This module provides the builtin engine behind the 'usage' command.
+
+The tree is walked by the worker threads of 'find': a worker reads a
+directory with 'os.scandir', adds up the space taken by its files and hands
+its subdirectories to the other workers. The total of every directory is
+then added up from the bottom of the tree once the walk is done.
+
+What a directory holds by itself (the space of its files, their number and
+the names of its subdirectories) is cached, keyed by the device and inode
+of the directory and checked against its mtime. Creating, deleting or
+renaming an entry changes the mtime of its directory, so on the next run a
+directory whose mtime has not changed is not read again: the worker only
+stats it and goes on with the subdirectories of the cache. Running 'usage'
+again on a mostly unchanged tree costs one 'stat' per directory instead of
+one per entry. A file rewritten in place does not change the mtime of its
+directory, '--no-cache' reads every directory again.
+
+A file with several hard links is counted once, as 'du' does: the files
+with more than one link are kept apart with their inode, and only the first
+link met while adding up the totals is counted.
+
+The cache is kept in memory for the session and saved to 'CACHE_PATH'
+after every run, so it is shared by the shells of the user.
+
+Supported options:
+    usage <directory> [--sort size|name] [--top N] [--depth N] [--no-cache]
+"""
+
+from dataclasses import dataclass
+from threading import Event, Lock
+from time import time
+from typing import Dict, List, Set, TextIO, Tuple
+import json
+import os
+import sys
+
+from SyntaxShift.file_finder import FileFinder
+from validator.static.exceptions import InspectionError
+
+
+CACHE_PATH = os.path.join("~", ".cshell_usage_cache")
+CACHE_VERSION = 1
+# directories kept in the cache file, those not seen for the longest time are dropped first
+CACHE_ENTRIES = 1_000_000
+# a directory modified this recently could change again within the same mtime, it is not cached
+RACY_SECONDS = 2
+
+SORT_ORDERS = ("size", "name")
+SIZE_UNITS = ("B", "K", "M", "G", "T", "P")
+
+# (device, inode) of a directory
+DirectoryKey = Tuple[int, int]
+
+
+@dataclass
+class UsageOptions:
+    """
+    The options accepted by the 'usage' command.
+
+    Attributes:
+        sort (str): 'name' lists the directories in the order of their paths,
+            'size' the largest first.
+        top (int | None): Only list the largest 'top' directories.
+        depth (int): List the directories down to this depth below the root,
+            1 for its subdirectories.
+        use_cache (bool): Reuse the cached contents of the directories that have not changed.
+    """
+    sort: str = "name"
+    top: int | None = None
+    depth: int = 1
+    use_cache: bool = True
+
+    @classmethod
+    def from_arguments(cls, arguments: List[str]) -> "UsageOptions":
+        """
+        Builds the options from the words following the directory, '--top'
+        sorts by size unless '--sort' is given.
+
+        Raises:
+            InspectionError: If an option is unknown, is missing its value or has an invalid value.
+        """
+        options = cls()
+        sort = None
+        words = iter(arguments)
+
+        for word in words:
+            if word == "--no-cache":
+                options.use_cache = False
+                continue
+            if word not in ("--sort", "--top", "--depth"):
+                raise InspectionError(
+                    f"Invalid option '{word}' for usage, type help usage to see valid options"
+                )
+
+            value = next(words, None)
+            if value is None:
+                raise InspectionError(f"Option '{word}' for usage is missing a value")
+
+            if word == "--sort":
+                if value not in SORT_ORDERS:
+                    raise InspectionError(
+                        f"Invalid value '{value}' for usage --sort, expected one of {SORT_ORDERS}"
+                    )
+                sort = value
+            elif not value.isdigit() or (word == "--top" and int(value) == 0):
+                raise InspectionError(
+                    f"Invalid value '{value}' for usage {word}, expected a positive number"
+                )
+            elif word == "--top":
+                options.top = int(value)
+            else:
+                options.depth = int(value)
+
+        options.sort = sort or ("size" if options.top is not None else "name")
+        return options
+
+
+@dataclass
+class DirectoryUsage:
+    """
+    The contents of a directory, without those of its subdirectories.
+
+    Attributes:
+        mtime_ns (int): The mtime of the directory when it was read.
+        size (int): The space taken by the directory and its files with a single link, in bytes.
+        files (int): The number of entries that are not directories, hard links included.
+        children (Tuple[str, ...]): The names of its subdirectories.
+        links (Tuple[Tuple[int, int, int], ...]): The device, inode and space of its files
+            with several links.
+    """
+    mtime_ns: int
+    size: int
+    files: int
+    children: Tuple[str, ...]
+    links: Tuple[Tuple[int, int, int], ...] = ()
+
+
+def disk_size(info: os.stat_result) -> int:
+    """
+    Returns the space a file takes: its allocated blocks, as 'du', where the
+    platform reports them, its size otherwise.
+    """
+    blocks = getattr(info, "st_blocks", None)
+    return info.st_size if blocks is None else blocks * 512
+
+
+def format_size(size: int) -> str:
+    """
+    Returns the size with a binary unit, '1.5M' for 1.5 MiB.
+    """
+    amount = float(size)
+    for unit in SIZE_UNITS[:-1]:
+        if amount < 1024:
+            break
+        amount /= 1024
+    else:
+        unit = SIZE_UNITS[-1]
+    return f"{size}B" if unit == "B" else f"{amount:.1f}{unit}"
+
+
+class UsageCache:
+    """
+    The contents of the directories read by previous runs, keyed by device
+    and inode, loaded from the cache file on first use.
+
+    Attributes:
+        path (str): The cache file.
+        entries (Dict[DirectoryKey, DirectoryUsage]): The cached directories, least recently
+            seen first.
+    """
+
+    def __init__(self, path: str = CACHE_PATH):
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self.entries: Dict[DirectoryKey, DirectoryUsage] = {}
+        self._loaded = False
+        self._lock = Lock()
+
+    def load(self) -> None:
+        """
+        Reads the cache file once, a missing or unreadable file is an empty cache.
+        """
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != CACHE_VERSION:
+                return
+            self.entries = {
+                (device, inode): DirectoryUsage(
+                    mtime_ns, size, files, tuple(children), tuple(tuple(link) for link in links)
+                )
+                for device, inode, mtime_ns, size, files, children, links in data["entries"]
+            }
+        except (OSError, ValueError, KeyError, TypeError):
+            self.entries = {}
+
+    def get(self, key: DirectoryKey, mtime_ns: int) -> DirectoryUsage | None:
+        """
+        Returns:
+            DirectoryUsage | None: The cached contents of the directory, None when it is not
+            cached or was modified since it was read.
+        """
+        usage = self.entries.get(key)
+        return usage if usage is not None and usage.mtime_ns == mtime_ns else None
+
+    def update(self, seen: Dict[DirectoryKey, DirectoryUsage]) -> None:
+        """
+        Records the directories of a run as the most recently seen ones.
+        """
+        with self._lock:
+            for key, usage in seen.items():
+                self.entries.pop(key, None)
+                self.entries[key] = usage
+            for key in list(self.entries)[:max(0, len(self.entries) - CACHE_ENTRIES)]:
+                del self.entries[key]
+
+    def save(self) -> None:
+        """
+        Rewrites the cache file, through a temporary file so a reader never sees half of it.
+        """
+        with self._lock:
+            entries = [
+                [device, inode, usage.mtime_ns, usage.size, usage.files,
+                 usage.children, usage.links]
+                for (device, inode), usage in self.entries.items()
+            ]
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(temporary, "w", encoding="utf-8") as f:
+                json.dump({"version": CACHE_VERSION, "entries": entries}, f, separators=(",", ":"))
+            os.replace(temporary, self.path)
+        except OSError:
+            # the cache only saves time, the command already succeeded
+            try:
+                os.remove(temporary)
+            except OSError:
+                pass
+
+
+# shared by the 'usage' commands of the session
+USAGE_CACHE = UsageCache()
+
+
+@dataclass
+class UsageSummary:
+    """
+    The totals of a 'usage', printed once it is done.
+    """
+    size: int = 0
+    files: int = 0
+    directories: int = 0
+    scanned: int = 0
+    unreadable: int = 0
+    stopped: bool = False
+
+    def __str__(self) -> str:
+        summary = (
+            f"{format_size(self.size)} in {self.files} file(s) and {self.directories} directories, "
+            f"{self.scanned} read, {self.directories - self.scanned} unchanged since the last run"
+        )
+        if self.unreadable:
+            summary += f", {self.unreadable} could not be read"
+        return summary
+
+
+class DiskUsage(FileFinder):
+    """
+    Adds up the space taken by every directory of a tree, read by 'jobs'
+    worker threads, and writes the largest or every directory down to the
+    depth of the options.
+
+    Attributes:
+        root (str): The directory the walk starts from, the paths written start with it.
+        options (UsageOptions): The options of the command.
+        jobs (int): The number of worker threads.
+        cache (UsageCache): The cache of the directories read by previous runs.
+    """
+
+    def __init__(self, root: str, options: UsageOptions | None = None, jobs: int = 1,
+                 cache: UsageCache | None = None):
+        super().__init__(root, jobs=jobs)
+        self.usage_options = options or UsageOptions()
+        self.cache = cache or USAGE_CACHE
+        self.summary = UsageSummary()
+        # the directories of this run, by path and by key
+        self._usages: Dict[str, DirectoryUsage] = {}
+        self._seen: Dict[DirectoryKey, DirectoryUsage] = {}
+        self._started = time()
+
+    def run(self, output: TextIO | None = None, stop: Event | None = None) -> UsageSummary:
+        """
+        Walks the tree and writes the size of its directories to the output
+        (the terminal by default), unless 'stop' is set before the walk is done.
+        The directories read are cached either way.
+        """
+        output = output or sys.stdout
+        # loaded with '--no-cache' as well, the directories read replace their entries
+        self.cache.load()
+        self._started = time()
+
+        # the workers report nothing through the queue of matches, the walk is over when it ends
+        for _ in self.batches(stop):
+            pass
+        self.cache.update(self._seen)
+        self.cache.save()
+        if self.summary.stopped:
+            return self.summary
+
+        totals = self.totals()
+        root_size, root_files = totals.get(self.root, (0, 0))
+        self.summary.size, self.summary.files = root_size, root_files
+        output.write("\n".join(self.report(totals)) + "\n")
+        output.flush()
+        return self.summary
+
+    def scan(self, directory: str, stack: List[str]) -> None:
+        """
+        Adds the usage of a directory, read again only when the cache has no
+        entry for its current modification time, and queues its subdirectories.
+        """
+        try:
+            # the root may be given through a symlink, the directories below it are never followed
+            info = os.stat(directory) if directory == self.root else os.lstat(directory)
+            key = (info.st_dev, info.st_ino)
+            usage = self.cache.get(key, info.st_mtime_ns) if self.usage_options.use_cache else None
+            if usage is None:
+                usage = self.read(directory, info)
+                scanned = 1
+            else:
+                scanned = 0
+        except OSError:
+            with self._lock:
+                self.summary.unreadable += 1
+            return
+
+        self._usages[directory] = usage
+        if self._started - info.st_mtime > RACY_SECONDS:
+            self._seen[key] = usage
+        with self._lock:
+            self.summary.directories += 1
+            self.summary.scanned += scanned
+        for name in usage.children:
+            self.found_directory(os.path.join(directory, name), stack)
+
+    @staticmethod
+    def read(directory: str, info: os.stat_result) -> DirectoryUsage:
+        """
+        Returns:
+            DirectoryUsage: The space of the directory and of its files, files
+            with several links apart, and the names of its subdirectories.
+        """
+        size, files, children, links = disk_size(info), 0, [], []
+        with os.scandir(directory) as iterator:
+            for entry in iterator:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        children.append(entry.name)
+                        continue
+                    entry_info = entry.stat(follow_symlinks=False)
+                    files += 1
+                    if entry_info.st_nlink > 1:
+                        links.append((entry_info.st_dev, entry_info.st_ino, disk_size(entry_info)))
+                    else:
+                        size += disk_size(entry_info)
+                except OSError:
+                    # removed since the directory was read
+                    continue
+        return DirectoryUsage(info.st_mtime_ns, size, files, tuple(children), tuple(links))
+
+    def totals(self) -> Dict[str, Tuple[int, int]]:
+        """
+        Returns the size and number of files of every directory read, with
+        those of its subdirectories, added up from the bottom of the tree.
+        A file with several links is counted in the first directory added up.
+        """
+        totals: Dict[str, Tuple[int, int]] = {}
+        counted_links: Set[Tuple[int, int]] = set()
+        stack = [(self.root, False)]
+        while stack:
+            directory, expanded = stack.pop()
+            usage = self._usages.get(directory)
+            if usage is None:
+                # could not be read
+                continue
+            children = [os.path.join(directory, name) for name in usage.children]
+            if not expanded:
+                stack.append((directory, True))
+                stack.extend((child, False) for child in children)
+                continue
+            size, files = usage.size, usage.files
+            for device, inode, space in usage.links:
+                if (device, inode) not in counted_links:
+                    counted_links.add((device, inode))
+                    size += space
+            for child in children:
+                child_size, child_files = totals.get(child, (0, 0))
+                size += child_size
+                files += child_files
+            totals[directory] = (size, files)
+        return totals
+
+    def report(self, totals: Dict[str, Tuple[int, int]]) -> List[str]:
+        """
+        Returns the lines of the directories down to the depth of the options,
+        sorted and cut to the top ones, followed by the line of the root.
+        """
+        depth = self.usage_options.depth
+        base = self.root.rstrip(os.sep).count(os.sep)
+        listed = [
+            (path, size) for path, (size, _) in totals.items()
+            if path != self.root and path.count(os.sep) - base <= depth
+        ]
+        if self.usage_options.sort == "size":
+            listed.sort(key=lambda item: (-item[1], item[0]))
+        else:
+            listed.sort()
+        if self.usage_options.top is not None:
+            listed = listed[:self.usage_options.top]
+        listed.append((self.root, totals.get(self.root, (0, 0))[0]))
+        return [f"{format_size(size):>8}  {path}" for path, size in listed]
@@ -0,0 +1,356 @@
+"""
+This module provides the builtin engine behind the 'dupes' command.
+
+The files of the tree, found by the parallel walker of 'find', are narrowed
+down to the duplicates in three stages, each reading more of fewer files:
+
+    1. size:  the files are grouped by size. A file of a size no other file
+              has cannot have a copy, it is never opened.
+    2. edges: the files left are grouped by a hash of their first and last
+              'BLOCK_SIZE' bytes, which tells apart most files of the same
+              size (exports of the same table, logs of the same length)
+              without reading them. A file of at most two blocks is hashed
+              whole, this is its full hash.
+    3. full:  the files still sharing a size and a hash of their edges are
+              hashed whole.
+
+The hashes are computed by a pool of worker processes over memory-mapped
+files, so the files are never copied into Python objects and the hashing
+runs on every core. Small files are grouped into one task; a stage with
+less than 'INLINE_BYTES' to read is hashed in-process, it would not pay
+for starting the workers. Hard links to the same file are not copies,
+only one of them is considered; symlinks and empty files are skipped.
+
+The output is a script for the shell: every group of copies is a comment
+naming the copy kept, the oldest, followed by a 'delete' command for the
+others, largest waste first. Redirected to a file it can be reviewed, then
+run with '--script'. A copy whose name holds a wildcard would be expanded
+by 'delete', it is only listed in the comment.
+
+Supported options:
+    dupes <directory> [--ext .csv,.txt] [--min-size N[k|M|G]]
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass
+from threading import Event
+from typing import Dict, Iterator, List, TextIO, Tuple
+import hashlib
+import mmap
+import os
+import re
+import shlex
+import stat
+import sys
+
+from SyntaxShift.content_search import process_pool
+from SyntaxShift.disk_usage import format_size
+from SyntaxShift.file_finder import SIZE_UNITS, FileFinder, FindOptions
+from SyntaxShift.pattern_expander import is_pattern
+from validator.static.constant_types import VALID_EXTENSIONS
+from validator.static.exceptions import InspectionError
+
+
+# the bytes hashed at each end of a file by the second stage, a page
+BLOCK_SIZE = 4096
+# files are grouped into tasks of up to this many bytes to read, or files
+TASK_BYTES = 64 * 1024 * 1024
+TASK_FILES = 256
+# a stage reading less than this is hashed in-process
+INLINE_BYTES = 32 * 1024 * 1024
+DIGEST_SIZE = 20
+
+SIZE_PATTERN = re.compile(r"(\d+)([kmg]?)", re.IGNORECASE)
+
+# a candidate file: its path and its size
+Candidate = Tuple[str, int]
+
+
+@dataclass
+class DupesOptions:
+    """
+    The options accepted by the 'dupes' command.
+
+    Attributes:
+        extensions (tuple[str, ...]): The extensions of the files compared,
+            'VALID_EXTENSIONS' by default.
+        min_size (int): Only files of at least this many bytes, empty files are never reported.
+    """
+    extensions: tuple[str, ...] = tuple(VALID_EXTENSIONS)
+    min_size: int = 1
+
+    @classmethod
+    def from_arguments(cls, arguments: List[str]) -> "DupesOptions":
+        """
+        Builds the options from the words following the directory.
+
+        Raises:
+            InspectionError: If an option is unknown, is missing its value or has an invalid value.
+        """
+        options = cls()
+        words = iter(arguments)
+
+        for word in words:
+            if word not in ("--ext", "--min-size"):
+                raise InspectionError(
+                    f"Invalid option '{word}' for dupes, type help dupes to see valid options"
+                )
+
+            value = next(words, None)
+            if value is None:
+                raise InspectionError(f"Option '{word}' for dupes is missing a value")
+
+            if word == "--ext":
+                extensions = tuple(extension for extension in value.split(",") if extension)
+                invalid = [
+                    extension for extension in extensions if extension not in VALID_EXTENSIONS
+                ]
+                if invalid or not extensions:
+                    raise InspectionError(f"Invalid extension filter '{value}' for dupes")
+                options.extensions = extensions
+            else:
+                match = SIZE_PATTERN.fullmatch(value)
+                if match is None:
+                    raise InspectionError(
+                        f"Invalid value '{value}' for dupes --min-size, "
+                        "expected N with an optional unit of k, M or G"
+                    )
+                options.min_size = max(1, int(match.group(1)) * SIZE_UNITS[match.group(2).lower()])
+
+        return options
+
+
+def hash_file(path: str, size: int, edges: bool) -> bytes | None:
+    """
+    Returns the hash of the first and last blocks of the file, or of the
+    whole file when 'edges' is False or it is no larger than two blocks.
+    None when the file cannot be read or its size changed since the walk.
+    """
+    try:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size != size:
+                return None
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                digest = hashlib.blake2b(digest_size=DIGEST_SIZE)
+                if edges and size > 2 * BLOCK_SIZE:
+                    digest.update(mapped[:BLOCK_SIZE])
+                    digest.update(mapped[-BLOCK_SIZE:])
+                else:
+                    if hasattr(mmap, "MADV_SEQUENTIAL"):
+                        mapped.madvise(mmap.MADV_SEQUENTIAL)
+                    digest.update(mapped)
+                return digest.digest()
+    except (OSError, ValueError):
+        # ValueError: the file was emptied since its size was read
+        return None
+
+
+def hash_files(files: List[Candidate], edges: bool) -> List[bytes | None]:
+    """
+    The task run by the workers: hashes every file of the task.
+    """
+    return [hash_file(path, size, edges) for path, size in files]
+
+
+def bytes_read(size: int, edges: bool) -> int:
+    """
+    Returns the bytes of a file its hash reads, its first and last blocks for 'edges'.
+    """
+    return min(size, 2 * BLOCK_SIZE) if edges else size
+
+
+@dataclass
+class DupesSummary:
+    """
+    The totals of a 'dupes', printed once it is done.
+    """
+    groups: int = 0
+    copies: int = 0
+    reclaimable: int = 0
+    files: int = 0
+    edges_read: int = 0
+    fully_read: int = 0
+    unreadable: int = 0
+    stopped: bool = False
+
+    def __str__(self) -> str:
+        summary = (
+            f"{self.groups} group(s) of duplicates, {self.copies} copies to delete, "
+            f"{format_size(self.reclaimable)} reclaimable; {self.files} file(s) compared, "
+            f"{self.files - self.edges_read} by size only, {self.fully_read} read in full"
+        )
+        if self.unreadable:
+            summary += f", {self.unreadable} could not be read"
+        return summary
+
+
+class DuplicateFinder:
+    """
+    Finds the files of a tree with the same contents, hashed by a pool of
+    'jobs' worker processes, and writes them as 'delete' commands.
+
+    Attributes:
+        root (str): The directory searched, the paths written start with it.
+        options (DupesOptions): The options of the command.
+        jobs (int): The number of worker processes.
+    """
+
+    def __init__(self, root: str, options: DupesOptions | None = None, jobs: int = 1):
+        self.root = root
+        self.options = options or DupesOptions()
+        self.jobs = jobs if jobs > 1 else os.cpu_count() or 1
+        self.summary = DupesSummary()
+        # the mtime of the candidates, the oldest copy of a group is kept
+        self._mtimes: Dict[str, float] = {}
+        self._pool = None
+
+    def run(self, output: TextIO | None = None, stop: Event | None = None) -> DupesSummary:
+        """
+        Compares the files of the tree and writes every group of copies to
+        the output (the terminal by default), unless 'stop' is set first.
+        """
+        output = output or sys.stdout
+        stop = stop or Event()
+        try:
+            groups = self.by_size(stop)
+            if not stop.is_set():
+                groups = self.by_hash(groups, True, stop)
+            if not stop.is_set():
+                # the files of two blocks or less were hashed whole already
+                small = [group for group in groups if group[0][1] <= 2 * BLOCK_SIZE]
+                large = [group for group in groups if group[0][1] > 2 * BLOCK_SIZE]
+                groups = small + self.by_hash(large, False, stop)
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown(cancel_futures=True)
+
+        self.summary.stopped = stop.is_set()
+        if not self.summary.stopped:
+            self.write(output, groups)
+        return self.summary
+
+    def by_size(self, stop: Event) -> List[List[Candidate]]:
+        """
+        Returns the files of the tree grouped by size, without the sizes of a single file.
+        """
+        sizes: Dict[int, List[Candidate]] = defaultdict(list)
+        inodes = set()
+        finder = FileFinder(self.root, FindOptions(extensions=self.options.extensions))
+        for batch in finder.batches(stop):
+            for path in batch:
+                try:
+                    info = os.lstat(path)
+                except OSError:
+                    self.summary.unreadable += 1
+                    continue
+                # a name with a line break cannot be written as one command
+                if (not stat.S_ISREG(info.st_mode) or info.st_size < self.options.min_size
+                        or "\n" in path):
+                    continue
+                if (info.st_dev, info.st_ino) in inodes:
+                    # another link to a file already seen
+                    continue
+                inodes.add((info.st_dev, info.st_ino))
+                sizes[info.st_size].append((path, info.st_size))
+                self._mtimes[path] = info.st_mtime
+                self.summary.files += 1
+        return [group for group in sizes.values() if len(group) > 1]
+
+    def by_hash(self, groups: List[List[Candidate]], edges: bool,
+                stop: Event) -> List[List[Candidate]]:
+        """
+        Splits the groups by the hash of their edges or of their whole
+        contents, without the hashes of a single file.
+        """
+        files = [candidate for group in groups for candidate in group]
+        digests: Dict[str, bytes | None] = {}
+        for task, hashes in self.hashed(files, edges, stop):
+            digests.update((path, digest) for (path, _), digest in zip(task, hashes))
+
+        if edges:
+            self.summary.edges_read += len(files)
+            self.summary.fully_read += sum(1 for _, size in files if size <= 2 * BLOCK_SIZE)
+        else:
+            self.summary.fully_read += len(files)
+
+        split: List[List[Candidate]] = []
+        for group in groups:
+            by_digest: Dict[bytes, List[Candidate]] = defaultdict(list)
+            for path, size in group:
+                digest = digests.get(path)
+                if digest is None:
+                    self.summary.unreadable += 1
+                    continue
+                by_digest[digest].append((path, size))
+            split.extend(same for same in by_digest.values() if len(same) > 1)
+        return split
+
+    def hashed(self, files: List[Candidate], edges: bool, stop: Event
+               ) -> Iterator[Tuple[List[Candidate], List[bytes | None]]]:
+        """
+        Yields every task of the files with their hashes, until 'stop' is set.
+        """
+        tasks = list(self.tasks(files, edges))
+        if sum(bytes_read(size, edges) for _, size in files) <= INLINE_BYTES:
+            for task in tasks:
+                if stop.is_set():
+                    return
+                yield task, hash_files(task, edges)
+            return
+
+        if self._pool is None:
+            self._pool = process_pool(self.jobs)
+        futures = [self._pool.submit(hash_files, task, edges) for task in tasks]
+        for task, future in zip(tasks, futures):
+            if stop.is_set():
+                return
+            yield task, future.result()
+
+    @staticmethod
+    def tasks(files: List[Candidate], edges: bool) -> Iterator[List[Candidate]]:
+        """
+        Groups the files into tasks, each closed at 'TASK_BYTES' bytes to read
+        or 'TASK_FILES' files.
+        """
+        task: List[Candidate] = []
+        task_bytes = 0
+        for path, size in files:
+            task.append((path, size))
+            task_bytes += bytes_read(size, edges)
+            if task_bytes >= TASK_BYTES or len(task) >= TASK_FILES:
+                yield task
+                task, task_bytes = [], 0
+        if task:
+            yield task
+
+    def write(self, output: TextIO, groups: List[List[Candidate]]) -> None:
+        """
+        Writes a comment and a 'delete' command per group, the groups wasting the most space first.
+        """
+        groups.sort(
+            key=lambda group: (-group[0][1] * (len(group) - 1), min(path for path, _ in group))
+        )
+        lines = []
+        for group in groups:
+            size = group[0][1]
+            keep, *copies = sorted(
+                (path for path, _ in group), key=lambda path: (self._mtimes[path], path)
+            )
+            deleted = [path for path in copies if not is_pattern(path)]
+            kept = [path for path in copies if is_pattern(path)]
+
+            self.summary.groups += 1
+            self.summary.copies += len(deleted)
+            self.summary.reclaimable += size * len(deleted)
+            lines.append(
+                f"# {len(group)} copies of {format_size(size)}, keeping the oldest: {keep}"
+            )
+            if kept:
+                lines.append(
+                    f"# not deleted, 'delete' would expand the wildcards: {' '.join(kept)}"
+                )
+            if deleted:
+                lines.append(shlex.join(["delete", *deleted]))
+        if lines:
+            output.write("\n".join(lines) + "\n")
+            output.flush()
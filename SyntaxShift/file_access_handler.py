@@ -1,8 +1,54 @@
+from dataclasses import dataclass
 from os import getlogin
+from typing import ClassVar, List, Tuple
+import stat
 
 from validator.static.constant_types import FilePermission
 from validator.static.constant_types import FILE_PERMISSIONS, Platform
 from validator.static.exceptions import FileAccessError, InvalidCommand
+from validator.stat_snapshot import current_snapshot
+from SyntaxShift.pattern_expander import expand_patterns, is_pattern
+
+
+@dataclass(frozen=True)
+class PermissionRequest:
+    """
+    A validated 'modify' of the owner permissions of a single file, ready to be
+    executed by one of the execution backends in 'SyntaxShift.operation_executor'.
+
+    Attributes:
+        filename (str): The file whose permissions change.
+        action (str): 'add' or 'remove'.
+        permissions (Tuple[str, ...]): The permissions, from 'r', 'w' and 'x'.
+    """
+    filename: str
+    action: str
+    permissions: Tuple[str, ...]
+
+    operation: ClassVar[FilePermission] = FilePermission.MODIFY
+    new_filename: ClassVar[None] = None
+
+    USER_BITS: ClassVar[dict] = {"r": stat.S_IRUSR, "w": stat.S_IWUSR, "x": stat.S_IXUSR}
+
+    def apply(self, mode: int) -> int:
+        """
+        Returns:
+            int: The permission bits of the file once the request is applied to 'mode'.
+        """
+        bits = 0
+        for permission in self.permissions:
+            bits |= PermissionRequest.USER_BITS[permission]
+        mode = stat.S_IMODE(mode)
+        return mode | bits if self.action == FileAccessHandler.ADD else mode & ~bits
+
+    def to_command(self, operating_system: Platform) -> List[str]:
+        """
+        Returns:
+            List[str]: The platform command of the request, for the spawning backend.
+        """
+        command = [FilePermission.MODIFY, self.filename, self.action, *self.permissions]
+        return FileAccessHandler(command, operating_system).check_file_access()
+
 
 class FileAccessHandler:
 
@@ -29,6 +75,33 @@ class FileAccessHandler:
         self.operating_system = operating_system
 
 
+    def platform_command(self) -> list[str]:
+        """
+        Returns the platform command of the operation, for pipelines and redirection.
+        """
+        return self.check_file_access()
+
+    def check_permission_requests(self) -> Tuple[List[PermissionRequest], List[str]]:
+        """
+        Builds one permission request per file for 'modify', the path may be a
+        wildcard pattern such as '*.sh', in which case every match is modified.
+
+        Returns:
+            Tuple[List[PermissionRequest], List[str]]: The requests and the failures.
+        """
+        path, action = self.command[1], self.command[2]
+        permissions = tuple(dict.fromkeys(self.command[3:]))
+
+        if not is_pattern(path):
+            if not current_snapshot().exists(path):
+                return [], [f"Specified path does not exists, {path}"]
+            return [PermissionRequest(path, action, permissions)], []
+
+        matches = expand_patterns([path])[path]
+        if not matches:
+            return [], [f"No files match '{path}'."]
+        return [PermissionRequest(match, action, permissions) for match in matches], []
+
     def check_file_access(self):
 
         operation = FilePermission(self.command[0])
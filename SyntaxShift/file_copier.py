@@ -0,0 +1,240 @@
+"""
+This module provides the builtin engine behind the 'copy' command.
+
+The data is copied by the kernel, it never passes through a Python buffer:
+'os.copy_file_range' is used first, which on file systems supporting it
+may even share the blocks instead of copying them, and 'os.sendfile' when
+the kernel or the file system does not support it (older kernels, copies
+across file systems). Platforms that have neither fall back to a buffered
+copy.
+
+Files of at least 'PARALLEL_THRESHOLD' bytes are split into ranges of
+'RANGE_SIZE' bytes copied concurrently by up to 'MAX_RANGE_WORKERS'
+threads, the system calls release the GIL so the ranges really overlap.
+
+The destination is created with the permission bits of the source, like
+'cp'. With 'preserve_metadata' its timestamps, flags and extended
+attributes are copied as well ('shutil.copystat').
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, NamedTuple, Tuple
+import errno
+import os
+import shutil
+import stat
+import sys
+
+
+# files at least this large are copied as several ranges in parallel
+PARALLEL_THRESHOLD = 64 * 1024 * 1024
+RANGE_SIZE = 16 * 1024 * 1024
+MAX_RANGE_WORKERS = min(8, os.cpu_count() or 1)
+
+# bytes asked of the kernel per system call, bounded so a range is never one huge call
+CALL_SIZE = 1024 * 1024 * 1024
+
+# errors meaning copy_file_range cannot be used for this pair of files, not that the copy failed
+UNSUPPORTED_ERRNOS = frozenset(
+    {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP}
+)
+
+# sendfile only writes to a regular file on Linux
+HAS_COPY_FILE_RANGE = hasattr(os, "copy_file_range")
+HAS_SENDFILE = hasattr(os, "sendfile") and sys.platform.startswith("linux")
+
+# size of the buffer of the fallback copy
+BUFFER_SIZE = 1024 * 1024
+
+CREATE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+READ_FLAGS = os.O_RDONLY | getattr(os, "O_BINARY", 0)
+
+
+def split_ranges(size: int, range_size: int = RANGE_SIZE) -> List[Tuple[int, int]]:
+    """
+    Returns:
+        List[Tuple[int, int]]: The (offset, length) of every range of a file of 'size' bytes.
+    """
+    return [(offset, min(range_size, size - offset)) for offset in range(0, size, range_size)]
+
+
+def copy_file_range(source_fd: int, destination_fd: int, offset: int, length: int) -> int:
+    """
+    Copies a range with 'copy_file_range', the offsets of the descriptors are not used.
+
+    Returns:
+        int: The number of bytes copied, less than 'length' when the source is shorter.
+    """
+    copied = 0
+    while copied < length:
+        position = offset + copied
+        sent = os.copy_file_range(
+            source_fd, destination_fd, min(CALL_SIZE, length - copied), position, position
+        )
+        if sent == 0:
+            break
+        copied += sent
+    return copied
+
+
+def sendfile_range(source_fd: int, destination_fd: int, offset: int, length: int) -> int:
+    """
+    Copies a range with 'sendfile'. sendfile writes at the file offset of the
+    destination, so every call gets its own descriptor of the destination.
+
+    Returns:
+        int: The number of bytes copied, less than 'length' when the source is shorter.
+    """
+    copied = 0
+    own_fd = os.open(f"/proc/self/fd/{destination_fd}", os.O_WRONLY)
+    try:
+        os.lseek(own_fd, offset, os.SEEK_SET)
+        while copied < length:
+            sent = os.sendfile(own_fd, source_fd, offset + copied, min(CALL_SIZE, length - copied))
+            if sent == 0:
+                break
+            copied += sent
+    finally:
+        os.close(own_fd)
+    return copied
+
+
+def buffered_range(source_fd: int, destination_fd: int, offset: int, length: int) -> int:
+    """
+    Copies a range through a buffer, for platforms without a zero-copy system call.
+    It moves the offsets of both descriptors, so ranges are copied one after the other.
+
+    Returns:
+        int: The number of bytes copied, less than 'length' when the source is shorter.
+    """
+    copied = 0
+    os.lseek(source_fd, offset, os.SEEK_SET)
+    os.lseek(destination_fd, offset, os.SEEK_SET)
+    while copied < length:
+        data = memoryview(os.read(source_fd, min(BUFFER_SIZE, length - copied)))
+        if not data:
+            break
+        written = 0
+        while written < len(data):
+            written += os.write(destination_fd, data[written:])
+        copied += len(data)
+    return copied
+
+
+class ProbedRange(NamedTuple):
+    """
+    The range copy function found by 'FileCopier.probe' and the bytes it copied.
+    """
+    copy_range: Callable[[int, int, int, int], int]
+    copied: int
+
+
+class FileCopier:
+    """
+    Copies a single file.
+
+    Attributes:
+        source (str): The file to copy.
+        destination (str): The file to create, it must not exist.
+        preserve_metadata (bool): Also copy the timestamps, flags and extended attributes.
+        method (str): The system call the data was copied with, set by 'copy'.
+    """
+
+    def __init__(self, source: str, destination: str, preserve_metadata: bool = False):
+        self.source = source
+        self.destination = destination
+        self.preserve_metadata = preserve_metadata
+        self.method = ""
+
+    def copy(self) -> int:
+        """
+        Copies the file, a partially written destination is removed on failure.
+
+        Returns:
+            int: The number of bytes copied.
+
+        Raises:
+            OSError: If the file could not be copied.
+        """
+        source_fd = os.open(self.source, READ_FLAGS)
+        try:
+            source_stat = os.fstat(source_fd)
+            if not stat.S_ISREG(source_stat.st_mode):
+                raise IsADirectoryError(errno.EISDIR, "Not a regular file", self.source)
+
+            mode = stat.S_IMODE(source_stat.st_mode)
+            destination_fd = os.open(self.destination, CREATE_FLAGS, mode)
+            try:
+                copied = self.copy_data(source_fd, destination_fd, source_stat.st_size)
+            except BaseException:
+                os.close(destination_fd)
+                os.remove(self.destination)
+                raise
+            os.close(destination_fd)
+        finally:
+            os.close(source_fd)
+
+        if self.preserve_metadata:
+            shutil.copystat(self.source, self.destination, follow_symlinks=False)
+        return copied
+
+    def copy_data(self, source_fd: int, destination_fd: int, size: int) -> int:
+        """
+        Copies the first range to find a usable system call, then the other
+        ranges, in parallel for a large file.
+        """
+        if size == 0:
+            return 0
+
+        ranges = split_ranges(size)
+        copy, copied = self.probe(source_fd, destination_fd, *ranges[0])
+        if copied < ranges[0][1] or len(ranges) == 1:
+            # done, or the source was truncated while copying
+            return copied
+
+        rest = ranges[1:]
+        if size < PARALLEL_THRESHOLD or MAX_RANGE_WORKERS == 1 or copy is buffered_range:
+            return copied + sum(
+                copy(source_fd, destination_fd, offset, length) for offset, length in rest
+            )
+
+        with ThreadPoolExecutor(max_workers=MAX_RANGE_WORKERS) as pool:
+            results = pool.map(lambda part: copy(source_fd, destination_fd, *part), rest)
+            return copied + sum(results)
+
+    def probe(self, source_fd: int, destination_fd: int, offset: int, length: int) -> ProbedRange:
+        """
+        Copies a range with the first system call the platform and the files support.
+        """
+        if HAS_COPY_FILE_RANGE:
+            try:
+                self.method = "copy_file_range"
+                copied = copy_file_range(source_fd, destination_fd, offset, length)
+                return ProbedRange(copy_file_range, copied)
+            except OSError as error:
+                if error.errno not in UNSUPPORTED_ERRNOS:
+                    raise
+        if HAS_SENDFILE:
+            try:
+                self.method = "sendfile"
+                copied = sendfile_range(source_fd, destination_fd, offset, length)
+                return ProbedRange(sendfile_range, copied)
+            except OSError as error:
+                if error.errno not in UNSUPPORTED_ERRNOS:
+                    raise
+        self.method = "buffered"
+        copied = buffered_range(source_fd, destination_fd, offset, length)
+        return ProbedRange(buffered_range, copied)
+
+
+def copy_file(source: str, destination: str, preserve_metadata: bool = False) -> int:
+    """
+    Copies 'source' to the new file 'destination'.
+
+    Returns:
+        int: The number of bytes copied.
+
+    Raises:
+        OSError: If the file could not be copied.
+    """
+    return FileCopier(source, destination, preserve_metadata).copy()
@@ -0,0 +1,321 @@
+"""
+This module provides the builtin engine behind the 'find' command.
+
+The tree is walked by a pool of worker threads instead of a single
+'os.walk': each worker reads a directory with 'os.scandir', prints nothing
+itself and hands the subdirectories it finds to the other workers through
+a bounded queue. 'os.scandir' and 'stat' release the GIL, so the reads of
+separate directories overlap and a cold tree, or one on a network file
+system, is read at the speed of the disk rather than one directory after
+the other. When the queue is full a worker keeps walking the subdirectory
+itself, so the queue never grows past 'QUEUE_SIZE' directories and no
+worker ever waits for room in it.
+
+Matches are sent to the thread that called 'run' as soon as a directory
+has been read, through a second bounded queue, and written out from there:
+the output starts with the first match and a slow reader slows the walk
+down instead of piling the matches up in memory.
+
+Only files are reported, symlinks included; symlinks to directories are
+never followed. Entries are only stat'ed when a size or time filter needs it.
+
+Supported options:
+    find <root> [--name GLOB] [--ext .txt,.csv] [--size +N|-N] [--mtime +N|-N]
+"""
+
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from queue import Full, Queue
+from threading import Event, Lock, Thread
+from time import time
+from typing import Iterator, List, TextIO
+import os
+import re
+import sys
+
+from validator.static.constant_types import VALID_EXTENSIONS
+from validator.static.exceptions import InspectionError
+
+
+SIZE_UNITS = {"": 1, "k": 1024, "m": 1024 ** 2, "g": 1024 ** 3}
+TIME_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "": 86400}
+
+# a filter value: '+' for more than, '-' for less than, a number and an optional unit
+FILTER_PATTERN = re.compile(r"([+-])(\d+)([a-z]?)", re.IGNORECASE)
+
+
+@dataclass
+class FindOptions:
+    """
+    The filters of the 'find' command, a file is reported when it passes all of them.
+
+    Attributes:
+        name (str | None): A glob the file name must match, case-sensitively.
+        extensions (tuple[str, ...]): Only files ending with one of these extensions.
+        larger_than (int | None): Only files of more than this many bytes.
+        smaller_than (int | None): Only files of less than this many bytes.
+        newer_than (float | None): Only files modified after this time.
+        older_than (float | None): Only files modified before this time.
+    """
+    name: str | None = None
+    extensions: tuple[str, ...] = ()
+    larger_than: int | None = None
+    smaller_than: int | None = None
+    newer_than: float | None = None
+    older_than: float | None = None
+
+    @classmethod
+    def from_arguments(cls, arguments: List[str], now: float | None = None) -> "FindOptions":
+        """
+        Builds the options from the words following the root. A size is a
+        number of bytes or of k, M or G bytes, an age a number of days or of
+        s, m, h or d: '--size +10M' finds the files larger than 10 MiB,
+        '--mtime -2h' those modified within the last two hours.
+
+        Raises:
+            InspectionError: If an option is unknown, is missing its value or has an invalid value.
+        """
+        options = cls()
+        now = time() if now is None else now
+        words = iter(arguments)
+
+        for word in words:
+            if word not in ("--name", "--ext", "--size", "--mtime"):
+                raise InspectionError(
+                    f"Invalid option '{word}' for find, type help find to see valid options"
+                )
+
+            value = next(words, None)
+            if value is None:
+                raise InspectionError(f"Option '{word}' for find is missing a value")
+
+            if word == "--name":
+                options.name = value
+
+            elif word == "--ext":
+                extensions = tuple(extension for extension in value.split(",") if extension)
+                invalid = [
+                    extension for extension in extensions if extension not in VALID_EXTENSIONS
+                ]
+                if invalid or not extensions:
+                    raise InspectionError(f"Invalid extension filter '{value}' for find")
+                options.extensions = extensions
+
+            else:
+                units = SIZE_UNITS if word == "--size" else TIME_UNITS
+                match = FILTER_PATTERN.fullmatch(value)
+                if match is None or match.group(3).lower() not in units:
+                    valid_units = ", ".join(unit for unit in units if unit)
+                    raise InspectionError(
+                        f"Invalid value '{value}' for find {word}, "
+                        f"expected +N or -N with a unit of {valid_units}"
+                    )
+                sign, number, unit = match.groups()
+                amount = int(number) * units[unit.lower()]
+                if word == "--size" and sign == "+":
+                    options.larger_than = amount
+                elif word == "--size":
+                    options.smaller_than = amount
+                elif sign == "+":
+                    # modified more than N ago
+                    options.older_than = now - amount
+                else:
+                    options.newer_than = now - amount
+
+        return options
+
+    @property
+    def needs_stat(self) -> bool:
+        """
+        Whether a filter needs the size or the modification time of the files.
+        """
+        return any(value is not None for value in (
+            self.larger_than, self.smaller_than, self.newer_than, self.older_than
+        ))
+
+    def matches_name(self, name: str) -> bool:
+        """
+        Whether the name passes the '--name' and '--ext' filters.
+        """
+        if self.extensions and not name.endswith(self.extensions):
+            return False
+        return self.name is None or fnmatchcase(name, self.name)
+
+    def matches_stat(self, info: os.stat_result) -> bool:
+        """
+        Whether the file passes the '--size' and '--mtime' filters.
+        """
+        return not (
+            (self.larger_than is not None and info.st_size <= self.larger_than)
+            or (self.smaller_than is not None and info.st_size >= self.smaller_than)
+            or (self.newer_than is not None and info.st_mtime <= self.newer_than)
+            or (self.older_than is not None and info.st_mtime >= self.older_than)
+        )
+
+
+@dataclass
+class FindSummary:
+    """
+    The totals of a 'find', printed once the walk is done.
+    """
+    matches: int = 0
+    directories: int = 0
+    unreadable: int = 0
+    stopped: bool = False
+
+    def __str__(self) -> str:
+        summary = f"{self.matches} file(s) found in {self.directories} directories"
+        if self.unreadable:
+            summary += f", {self.unreadable} could not be read"
+        return summary
+
+
+class FileFinder:
+    """
+    Walks a tree with 'jobs' worker threads and writes the path of every
+    file passing the filters.
+
+    Attributes:
+        root (str): The directory the walk starts from, the paths written start with it.
+        options (FindOptions): The filters.
+        jobs (int): The number of worker threads.
+    """
+
+    # directories waiting for a worker
+    QUEUE_SIZE = 4096
+    # batches of matches waiting to be written
+    RESULT_QUEUE_SIZE = 256
+    # workers used when the shell runs with the default '--jobs 1'
+    DEFAULT_JOBS = min(32, (os.cpu_count() or 1) * 4)
+
+    def __init__(self, root: str, options: FindOptions | None = None, jobs: int = 1):
+        self.root = root
+        self.options = options or FindOptions()
+        self.jobs = jobs if jobs > 1 else FileFinder.DEFAULT_JOBS
+        self.summary = FindSummary()
+        self._directories: Queue = Queue(maxsize=FileFinder.QUEUE_SIZE)
+        self._results: Queue = Queue(maxsize=FileFinder.RESULT_QUEUE_SIZE)
+        # the directories found and not read yet, the walk is over at zero
+        self._pending = 0
+        self._lock = Lock()
+        self._stop = Event()
+
+    def run(self, output: TextIO | None = None, stop: Event | None = None) -> FindSummary:
+        """
+        Walks the tree, writing the matches to the output (the terminal by
+        default) as they are found, until the walk is done or 'stop' is set.
+        """
+        output = output or sys.stdout
+        for batch in self.batches(stop):
+            output.write("\n".join(batch) + "\n")
+            output.flush()
+        return self.summary
+
+    def batches(self, stop: Event | None = None) -> Iterator[List[str]]:
+        """
+        Walks the tree and yields the matches of every directory as soon as
+        it has been read, until the walk is done or 'stop' is set. The walk
+        is stopped as well when the caller stops iterating.
+        """
+        self._stop = stop or Event()
+        self._pending = 1
+        self._directories.put(self.root)
+
+        workers = [
+            Thread(target=self.work, name=f"find-{index}", daemon=True)
+            for index in range(self.jobs)
+        ]
+        for worker in workers:
+            worker.start()
+
+        running = len(workers)
+        try:
+            while running:
+                batch = self._results.get()
+                if batch is None:
+                    running -= 1
+                    continue
+                if self._stop.is_set():
+                    # drain the batches queued before the workers saw it
+                    continue
+                self.summary.matches += len(batch)
+                yield batch
+        finally:
+            if running:
+                self._stop.set()
+                while running:
+                    if self._results.get() is None:
+                        running -= 1
+            self.summary.stopped = self._stop.is_set()
+
+    def work(self) -> None:
+        """
+        Run by every worker: reads the directories of the queue, and those it
+        could not queue, until none is left anywhere.
+        """
+        try:
+            while (directory := self._directories.get()) is not None:
+                stack = [directory]
+                while stack:
+                    current = stack.pop()
+                    if not self._stop.is_set():
+                        self.scan(current, stack)
+                    self.done()
+        finally:
+            self._results.put(None)
+
+    def scan(self, directory: str, stack: List[str]) -> None:
+        """
+        Reads a directory, collecting its matches and queueing its subdirectories.
+        """
+        matches = []
+        # looked up once per directory, this loop runs for every entry of the tree
+        matches_name = self.options.matches_name
+        matches_stat = self.options.matches_stat if self.options.needs_stat else None
+        try:
+            with os.scandir(directory) as iterator:
+                for entry in iterator:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            self.found_directory(entry.path, stack)
+                            continue
+                        if not matches_name(entry.name):
+                            continue
+                        if matches_stat is not None:
+                            if not matches_stat(entry.stat(follow_symlinks=False)):
+                                continue
+                    except OSError:
+                        # removed since the directory was read
+                        continue
+                    matches.append(entry.path)
+        except OSError:
+            with self._lock:
+                self.summary.unreadable += 1
+            return
+
+        with self._lock:
+            self.summary.directories += 1
+        if matches:
+            self._results.put(matches)
+
+    def found_directory(self, path: str, stack: List[str]) -> None:
+        """
+        Queues a subdirectory, on the local stack of the worker when the queue is full.
+        """
+        with self._lock:
+            self._pending += 1
+        try:
+            self._directories.put_nowait(path)
+        except Full:
+            stack.append(path)
+
+    def done(self) -> None:
+        """
+        Marks a directory read, the last one stops every worker.
+        """
+        with self._lock:
+            self._pending -= 1
+            finished = self._pending == 0
+        if finished:
+            for _ in range(self.jobs):
+                self._directories.put(None)
@@ -1,14 +1,47 @@
+from dataclasses import dataclass
 from os import path
-import logging
+from typing import List, Tuple
 
 from validator.static.constant_types import FileOperation
 from validator.static.constant_types import Platform
+from validator.static.constant_types import COPY_PRESERVE_FLAGS
+from validator.static.constant_types import COPY_PRESERVE_OPTIONS
 from validator.static.constant_types import FILE_OPERATIONS
 from validator.static.constant_types import VALID_EXTENSIONS
 from validator.static.exceptions import FileOperationError
+from SyntaxShift.pattern_expander import expand_patterns, is_pattern
+from validator.stat_snapshot import current_snapshot
 
 
-logging.basicConfig(level=logging.INFO)
+@dataclass(frozen=True)
+class FileOperationRequest:
+    """
+    A validated file operation ready to be executed by one of the
+    execution backends in 'SyntaxShift.operation_executor'.
+
+    Attributes:
+        operation (FileOperation): The operation to perform.
+        filename (str): The file the operation acts on.
+        new_filename (str | None): The target name, only used by rename and copy.
+        preserve_metadata (bool): Copy the timestamps and permissions too, only used by copy.
+    """
+    operation: FileOperation
+    filename: str
+    new_filename: str | None = None
+    preserve_metadata: bool = False
+
+    def to_command(self, operating_system: Platform) -> List[str]:
+        """
+        Translates the request into the command line arguments of the
+        platform command, used by the subprocess backend and redirection.
+        """
+        command = FILE_OPERATIONS[self.operation][operating_system].copy()
+        if self.preserve_metadata:
+            command += COPY_PRESERVE_FLAGS[operating_system]
+        command.append(self.filename)
+        if self.new_filename:
+            command.append(self.new_filename)
+        return command
 
 
 class FileOperationHandler:
@@ -33,25 +66,147 @@ class FileOperationHandler:
         self.command = command
         self.operating_system = operating_system
 
+    @property
+    def preserve_metadata(self) -> bool:
+        """
+        Whether 'copy' was asked to preserve the timestamps and permissions of the files.
+        """
+        return any(option in COPY_PRESERVE_OPTIONS for option in self.command[1:])
+
+    @property
+    def arguments(self) -> List[str]:
+        """
+        The file arguments of the command, without its options.
+        """
+        return [argument for argument in self.command[1:] if argument not in COPY_PRESERVE_OPTIONS]
 
 
-    def check_file_operation(self, new_filename: str = None):
+    def platform_command(self) -> List[str]:
+        """
+        Returns the platform command of the operation, used when the command is
+        a stage of a pipeline or is redirected.
+        """
         operation = FileOperation(self.command[0])
-        self.validate_operation(operation, self.command[1])
+        requests, failures = self.check_file_operations()
+        if failures:
+            raise FileOperationError(failures[0])
+        if operation in (FileOperation.RENAME, FileOperation.COPY) and len(requests) != 1:
+            raise FileOperationError(
+                f"'{operation}' of several files is not supported in a pipeline or redirection."
+            )
+        if operation in (FileOperation.RENAME, FileOperation.COPY):
+            return requests[0].to_command(self.operating_system)
+
+        filenames = [request.filename for request in requests]
+        return FILE_OPERATIONS[operation][self.operating_system] + filenames
+
+    def check_file_operation(self, new_filename: str = None) -> FileOperationRequest:
+        """
+        Validates the operation against the file system and returns the
+        operation object describing it, instead of a platform command.
+        """
+        return self.build_request(FileOperation(self.command[0]), self.command[1], new_filename)
 
-        command = FILE_OPERATIONS[operation][self.operating_system] + [self.command[1]]
+    def check_file_operations(self) -> Tuple[List[FileOperationRequest], List[str]]:
+        """
+        Builds the requests of a bulk operation, one per file argument and one per
+        file matched by a wildcard argument, for example:
+            create a.txt b.txt
+            delete *.tmp old.txt
+            rename a.txt b.txt c.txt d.txt    (pairs of old and new names)
+            rename *.txt .csv                 (changes the extension of every match)
+            copy a.txt b.txt                  (copies a file to a new file)
+            copy *.txt notes.txt backup       (copies every file into a directory)
+
+        A file that fails validation is reported in the failures instead of stopping
+        the whole batch. Files matched by a wildcard are known to exist from the
+        directory scan and are not stat-ed again.
+
+        Returns:
+            Tuple[List[FileOperationRequest], List[str]]: The valid requests and the failures.
+        """
+        operation = FileOperation(self.command[0])
+        arguments = self.arguments
+        requests: List[FileOperationRequest] = []
+        failures: List[str] = []
+        seen = set()
+
+        def add(filename: str, new_filename: str | None = None, matched: bool = False):
+            if filename in seen:
+                return
+            seen.add(filename)
+            try:
+                if not matched:
+                    requests.append(self.build_request(operation, filename, new_filename))
+                elif operation == FileOperation.RENAME:
+                    requests.append(self.handle_rename(filename, new_filename))
+                elif operation == FileOperation.COPY:
+                    requests.append(self.handle_copy(filename, new_filename))
+                else:
+                    requests.append(FileOperationRequest(operation, filename))
+            except FileOperationError as error:
+                failures.append(str(error))
+
+        if operation == FileOperation.RENAME and len(arguments) == 2 and is_pattern(arguments[0]):
+            pattern, extension = arguments
+            matches = expand_patterns([pattern])[pattern]
+            if not matches:
+                failures.append(f"No files match '{pattern}'.")
+            for match in matches:
+                add(match, path.splitext(match)[0] + extension, matched=True)
+            return requests, failures
+
+        if operation == FileOperation.RENAME:
+            for filename, new_filename in zip(arguments[::2], arguments[1::2]):
+                add(filename, new_filename)
+            return requests, failures
+
+        destination = None
+        if operation == FileOperation.COPY:
+            *arguments, destination = arguments
+
+        def target(filename: str) -> str | None:
+            if destination is None or not current_snapshot().is_dir(destination):
+                return destination
+            return path.join(destination, path.basename(filename))
+
+        expanded = expand_patterns([argument for argument in arguments if is_pattern(argument)])
+        for argument in arguments:
+            if argument not in expanded:
+                add(argument, target(argument))
+                continue
+            if not expanded[argument]:
+                failures.append(f"No files match '{argument}'.")
+            for match in expanded[argument]:
+                add(match, target(match), matched=True)
+
+        return requests, failures
+
+    def build_request(self, operation: FileOperation, filename: str,
+                      new_filename: str | None = None) -> FileOperationRequest:
+        """
+        Validates a single file operation against the file system.
+
+        Raises:
+            FileOperationError: If the operation is not possible for the file.
+        """
+        self.validate_operation(operation, filename)
 
         if operation == FileOperation.RENAME:
             if not new_filename:
                 raise ValueError("New filename is required for rename operation.")
-            return self.handle_rename(command, new_filename)
-
-        return command
+            return self.handle_rename(filename, new_filename)
 
+        if operation == FileOperation.COPY:
+            return self.handle_copy(filename, new_filename)
 
+        return FileOperationRequest(operation, filename)
 
 
-    def handle_rename(self, command, new_filename: str):
+    def handle_rename(self, filename: str, new_filename: str) -> FileOperationRequest:
+        """
+        Builds the rename request, the new name must have a valid extension and not exist.
+        """
         file_extension = path.splitext(new_filename)[1]
 
         if not file_extension in VALID_EXTENSIONS:
@@ -60,14 +215,23 @@ class FileOperationHandler:
         if self.file_exists(new_filename):
             raise FileOperationError(f"File with name '{new_filename}' already exists.")
 
-        return command + [new_filename]
+        return FileOperationRequest(FileOperation.RENAME, filename, new_filename)
 
+    def handle_copy(self, filename: str, new_filename: str) -> FileOperationRequest:
+        """
+        Builds the copy request, refusing to overwrite an existing file.
+        """
+        if self.file_exists(new_filename):
+            raise FileOperationError(
+                f"Cannot copy '{filename}', '{new_filename}' already exists."
+            )
 
+        return FileOperationRequest(
+            FileOperation.COPY, filename, new_filename, self.preserve_metadata
+        )
 
 
     def validate_operation(self, operation, filename):
-        logging.info(f"Validating operation '{operation}' for file '{filename}'.")
-
         file_exists = self.file_exists(filename)
 
         if operation == FileOperation.DELETE and not file_exists:
@@ -79,6 +243,12 @@ class FileOperationHandler:
         if operation == FileOperation.RENAME and not file_exists:
             raise FileOperationError(f"Cannot rename '{filename}', file does not exist.")
 
+        if operation == FileOperation.COPY and not file_exists:
+            raise FileOperationError(f"Cannot copy '{filename}', file does not exist.")
+
+        if operation == FileOperation.COPY and current_snapshot().is_dir(filename):
+            raise FileOperationError(f"Cannot copy '{filename}', it is a directory.")
+
     @staticmethod
     def file_exists(filename: str) -> bool:
-        return path.exists(filename)
\ No newline at end of file
+        return current_snapshot().exists(filename)
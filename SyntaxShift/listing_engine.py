@@ -0,0 +1,195 @@
+"""
+This module provides the builtin engine behind the 'list' command.
+
+Instead of capturing the whole output of 'ls -al' / 'dir' as text, the
+engine walks the directory with 'os.scandir' and formats every entry as
+soon as it is read, so output starts immediately and memory stays flat
+regardless of how many entries the directory has. Entries are kept as
+compact named tuples rather than dictionaries.
+
+Supported options:
+    list <path> [--sort name|size|mtime] [--reverse] [--ext .txt,.csv]
+                [--limit N] [--offset N]
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import islice
+from operator import attrgetter
+from typing import Iterable, Iterator, List, NamedTuple, TextIO
+import heapq
+import os
+import stat
+import sys
+
+from validator.static.constant_types import VALID_EXTENSIONS
+from validator.static.exceptions import FileAccessError
+from validator.stat_snapshot import current_snapshot
+
+
+class ListingEntry(NamedTuple):
+    """
+    A single directory entry, holding only what the listing prints.
+    """
+    name: str
+    mode: int
+    size: int
+    mtime: float
+
+
+SORT_KEYS = {
+    "name": attrgetter("name"),
+    "size": attrgetter("size"),
+    "mtime": attrgetter("mtime"),
+}
+
+
+@dataclass
+class ListOptions:
+    """
+    The options accepted by the 'list' command.
+
+    Attributes:
+        sort (str | None): The field to sort on, one of 'SORT_KEYS', None keeps directory order.
+        reverse (bool): Reverse the sort order.
+        extensions (tuple[str, ...]): Only list files ending with one of these extensions.
+        limit (int | None): Maximum number of entries to list.
+        offset (int): Number of entries to skip before listing.
+    """
+    sort: str | None = None
+    reverse: bool = False
+    extensions: tuple[str, ...] = ()
+    limit: int | None = None
+    offset: int = 0
+
+    @classmethod
+    def from_arguments(cls, arguments: List[str]) -> "ListOptions":
+        """
+        Builds the options from the words following the listed path.
+
+        Raises:
+            FileAccessError: If an option is unknown, is missing its value or has an invalid value.
+        """
+        options = cls()
+        words = iter(arguments)
+
+        for word in words:
+            if word == "--reverse":
+                options.reverse = True
+                continue
+
+            if word not in ("--sort", "--ext", "--limit", "--offset"):
+                raise FileAccessError(
+                    f"Invalid option '{word}' for list, type help list to see valid options"
+                )
+
+            value = next(words, None)
+            if value is None:
+                raise FileAccessError(f"Option '{word}' for list is missing a value")
+
+            if word == "--sort":
+                if value not in SORT_KEYS:
+                    raise FileAccessError(
+                        f"Invalid sort '{value}'. Expected one of {list(SORT_KEYS)}"
+                    )
+                options.sort = value
+
+            elif word == "--ext":
+                extensions = tuple(extension for extension in value.split(",") if extension)
+                invalid = [
+                    extension for extension in extensions if extension not in VALID_EXTENSIONS
+                ]
+                if invalid or not extensions:
+                    raise FileAccessError(f"Invalid extension filter '{value}' for list")
+                options.extensions = extensions
+
+            else:
+                if not value.isdigit():
+                    raise FileAccessError(
+                        f"Option '{word}' for list expects a number, got '{value}'"
+                    )
+                setattr(options, word[2:], int(value))
+
+        return options
+
+
+class ListingEngine:
+    """
+    Streams the entries of a directory, applying the filter, sort and
+    pagination options of the 'list' command.
+
+    Sorting without a limit has to hold every entry before printing the
+    first one; when a limit is given only 'offset + limit' entries are kept.
+    """
+
+    def __init__(self, path: str, options: ListOptions | None = None):
+        self.path = path
+        self.options = options or ListOptions()
+
+    def entries(self) -> Iterator[ListingEntry]:
+        """
+        Yields the entries of the path, filtered by extension, in directory order.
+        """
+        path_stat = current_snapshot().lstat(self.path)
+        if path_stat is not None and not stat.S_ISDIR(path_stat.st_mode):
+            yield self.to_entry(os.path.basename(self.path), path_stat)
+            return
+
+        extensions = self.options.extensions
+        with os.scandir(self.path) as scanner:
+            for dir_entry in scanner:
+                if extensions and not dir_entry.name.endswith(extensions):
+                    continue
+                try:
+                    yield self.to_entry(dir_entry.name, dir_entry.stat(follow_symlinks=False))
+                except FileNotFoundError:
+                    # removed between the directory read and the stat
+                    continue
+
+    def select(self) -> Iterable[ListingEntry]:
+        """
+        Applies the sort and the limit/offset pagination to 'entries'.
+        """
+        options = self.options
+        entries = self.entries()
+        end = None if options.limit is None else options.offset + options.limit
+
+        if options.sort:
+            key = SORT_KEYS[options.sort]
+            if end is None:
+                entries = sorted(entries, key=key, reverse=options.reverse)
+            elif options.reverse:
+                entries = heapq.nlargest(end, entries, key=key)
+            else:
+                entries = heapq.nsmallest(end, entries, key=key)
+
+        return islice(entries, options.offset, end)
+
+    def stream(self, output: TextIO = sys.stdout) -> int:
+        """
+        Writes each selected entry to the output as soon as it is available.
+
+        Returns:
+            int: The number of entries written.
+        """
+        count = 0
+        for entry in self.select():
+            output.write(self.format_entry(entry))
+            count += 1
+        output.flush()
+        return count
+
+    @staticmethod
+    def to_entry(name: str, stat_result: os.stat_result) -> ListingEntry:
+        """
+        Builds the entry listed for a name from its 'stat' result.
+        """
+        return ListingEntry(name, stat_result.st_mode, stat_result.st_size, stat_result.st_mtime)
+
+    @staticmethod
+    def format_entry(entry: ListingEntry) -> str:
+        """
+        Formats an entry as a line of 'ls -l': mode, size, mtime and name.
+        """
+        modified = datetime.fromtimestamp(entry.mtime).strftime("%Y-%m-%d %H:%M")
+        return f"{stat.filemode(entry.mode)} {entry.size:>12} {modified} {entry.name}\n"
@@ -0,0 +1,301 @@
+"""
+This module contains the execution backends for file operations.
+
+The builtin backend performs create, delete, rename and copy directly with
+'os' calls inside the process, avoiding a fork/exec of 'touch', 'rm', 'mv'
+or 'cp' for every operation. The subprocess backend keeps the original behaviour
+of running the platform command and is available as a fallback.
+
+Both backends time every operation they run so their per-operation
+latency can be compared with 'latency_report'.
+
+Bulk operations may be fanned out over a pool of worker threads
+('--jobs N'), with a bounded number of operations in flight and the
+failures reported in the order of the files.
+"""
+
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import copy_context
+from dataclasses import dataclass, field
+from threading import Lock
+from time import perf_counter
+from typing import Dict, List
+import logging
+import os
+import subprocess
+
+from SyntaxShift.file_access_handler import PermissionRequest
+from SyntaxShift.file_copier import copy_file
+from SyntaxShift.file_operation_handler import FileOperationRequest
+from validator.static.constant_types import ExecutionMode, FileOperation, Platform
+from validator.static.exceptions import FileOperationError
+from validator.stat_snapshot import current_snapshot
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LatencyStats:
+    """
+    Running latency statistics, in seconds, for a single operation type.
+    """
+    count: int = 0
+    total: float = 0.0
+    minimum: float = float("inf")
+    maximum: float = 0.0
+
+    def record(self, elapsed: float) -> None:
+        """
+        Adds the duration of one operation, in seconds.
+        """
+        self.count += 1
+        self.total += elapsed
+        self.minimum = min(self.minimum, elapsed)
+        self.maximum = max(self.maximum, elapsed)
+
+    @property
+    def mean(self) -> float:
+        """
+        The mean duration of the operations, 0.0 before the first one.
+        """
+        return self.total / self.count if self.count else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"count={self.count} mean={self.mean * 1e6:.1f}us "
+            f"min={self.minimum * 1e6:.1f}us max={self.maximum * 1e6:.1f}us"
+        )
+
+
+@dataclass
+class BatchSummary:
+    """
+    The outcome of a bulk file operation.
+
+    Attributes:
+        operation (str): The operation of the batch.
+        succeeded (int): The number of files the operation succeeded on.
+        failures (List[str]): One message per file that failed, validation failures included.
+    """
+    operation: str
+    succeeded: int = 0
+    failures: List[str] = field(default_factory=list)
+
+    # number of failures listed in the summary before the rest are only counted
+    MAX_LISTED_FAILURES = 10
+
+    def __str__(self) -> str:
+        total = self.succeeded + len(self.failures)
+        if total == 1 and self.failures:
+            return self.failures[0]
+
+        lines = [
+            f"{self.operation}: {self.succeeded} of {total} files succeeded, "
+            f"{len(self.failures)} failed"
+        ]
+        lines += [f"  {failure}" for failure in self.failures[:BatchSummary.MAX_LISTED_FAILURES]]
+        if len(self.failures) > BatchSummary.MAX_LISTED_FAILURES:
+            lines.append(f"  ... and {len(self.failures) - BatchSummary.MAX_LISTED_FAILURES} more")
+        return "\n".join(lines)
+
+
+Request = FileOperationRequest | PermissionRequest
+
+
+class OperationExecutor:
+    """
+    Base class for the execution backends, it times every operation
+    passed to 'execute' and keeps the statistics per operation type.
+
+    Attributes:
+        operating_system (Platform): The operating system platform.
+        stats (Dict[str, LatencyStats]): Latency of each operation type.
+    """
+
+    MODE: ExecutionMode
+
+    # operations queued or running per worker thread, bounds the memory of a large batch
+    IN_FLIGHT_PER_WORKER = 4
+
+    def __init__(self, operating_system: Platform):
+        self.operating_system = operating_system
+        self.stats: Dict[str, LatencyStats] = {}
+        self._stats_lock = Lock()
+
+    def execute(self, request: Request) -> float:
+        """
+        Runs the operation and records how long it took.
+
+        Returns:
+            float: The elapsed time of the operation in seconds.
+
+        Raises:
+            FileOperationError: If the operation failed.
+        """
+        start = perf_counter()
+        try:
+            self.run(request)
+        finally:
+            current_snapshot().invalidate(request.filename, *filter(None, [request.new_filename]))
+        elapsed = perf_counter() - start
+
+        with self._stats_lock:
+            self.stats.setdefault(request.operation, LatencyStats()).record(elapsed)
+        logger.debug("%s %s '%s' took %.1fus", self.MODE, request.operation,
+                     request.filename, elapsed * 1e6)
+        return elapsed
+
+    def run(self, request: Request) -> None:
+        """
+        Performs a single request, implemented by each backend.
+        """
+        raise NotImplementedError
+
+    def execute_batch(self, operation: str, requests: List[Request],
+                      failures: List[str] | None = None, jobs: int = 1) -> BatchSummary:
+        """
+        Runs every request of a bulk operation, a failing request does not stop the
+        others, it is added to the failures of the summary.
+
+        With more than one job the requests are run by a pool of worker threads.
+        At most 'jobs * IN_FLIGHT_PER_WORKER' requests are submitted at a time and
+        results are collected oldest first, so failures keep the order of the requests.
+
+        Args:
+            operation (str): The operation of the batch.
+            requests (List[Request]): The validated requests.
+            failures (List[str] | None): Failures found while building the requests.
+            jobs (int): The number of worker threads.
+        """
+        summary = BatchSummary(operation, failures=list(failures or []))
+
+        def collect(result: Future | None, request: Request | None = None) -> None:
+            try:
+                if result is None:
+                    self.execute(request)
+                else:
+                    result.result()
+                summary.succeeded += 1
+            except FileOperationError as error:
+                summary.failures.append(str(error))
+
+        if jobs <= 1 or len(requests) <= 1:
+            for request in requests:
+                collect(None, request)
+            return summary
+
+        max_in_flight = jobs * OperationExecutor.IN_FLIGHT_PER_WORKER
+        in_flight: deque[Future] = deque()
+
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            for request in requests:
+                if len(in_flight) >= max_in_flight:
+                    collect(in_flight.popleft())
+                # every task gets a copy of the context so it shares the command's stat snapshot
+                in_flight.append(pool.submit(copy_context().run, self.execute, request))
+            while in_flight:
+                collect(in_flight.popleft())
+
+        return summary
+
+    def latency_report(self) -> str:
+        """
+        Returns:
+            str: A formatted line for each operation type that was executed.
+        """
+        return "\n".join(
+            f"[{self.MODE}] {operation}: {stats}" for operation, stats in self.stats.items()
+        )
+
+
+def spawn_request(request: Request, operating_system: Platform) -> None:
+    """
+    Runs the platform command of the request, shared by the subprocess backend
+    and the builtin one where no 'os' call can do the operation.
+    """
+    try:
+        subprocess.run(
+            args=request.to_command(operating_system),
+            check=True, capture_output=True, text=True
+        )
+    except subprocess.CalledProcessError as error:
+        raise FileOperationError(
+            f"Failed to {request.operation} '{request.filename}': {error.stderr.strip()}"
+        ) from error
+
+
+class BuiltinExecutor(OperationExecutor):
+    """
+    Executes file operations in-process with direct 'os' calls.
+    """
+
+    MODE = ExecutionMode.BUILTIN
+    CREATE_FLAGS = os.O_CREAT | os.O_EXCL | os.O_WRONLY
+
+    def run(self, request: Request) -> None:
+        if isinstance(request, PermissionRequest):
+            self.run_permission(request)
+            return
+
+        try:
+            if request.operation == FileOperation.CREATE:
+                os.close(os.open(request.filename, BuiltinExecutor.CREATE_FLAGS, 0o666))
+            elif request.operation == FileOperation.DELETE:
+                os.remove(request.filename)
+            elif request.operation == FileOperation.RENAME:
+                os.rename(request.filename, request.new_filename)
+            elif request.operation == FileOperation.COPY:
+                copy_file(request.filename, request.new_filename, request.preserve_metadata)
+        except OSError as error:
+            raise FileOperationError(
+                f"Failed to {request.operation} '{request.filename}': {error.strerror}"
+            ) from error
+
+
+    def run_permission(self, request: PermissionRequest) -> None:
+        """
+        Changes the owner permissions in-process with 'os.chmod', Windows spawns 'icacls'.
+        """
+        if self.operating_system == Platform.WINDOWS:
+            # owner permissions are ACLs on Windows, only 'icacls' can change them
+            spawn_request(request, self.operating_system)
+            return
+
+        try:
+            os.chmod(request.filename, request.apply(os.stat(request.filename).st_mode))
+        except OSError as error:
+            raise FileOperationError(
+                f"Failed to {request.operation} '{request.filename}': {error.strerror}"
+            ) from error
+
+
+class SubprocessExecutor(OperationExecutor):
+    """
+    Executes file operations by spawning the platform command from 'FILE_OPERATIONS'
+    or 'FILE_PERMISSIONS'.
+    """
+
+    MODE = ExecutionMode.SUBPROCESS
+
+    def run(self, request: Request) -> None:
+        spawn_request(request, self.operating_system)
+
+
+EXECUTORS = {
+    ExecutionMode.BUILTIN: BuiltinExecutor,
+    ExecutionMode.SUBPROCESS: SubprocessExecutor,
+}
+
+_executors: Dict[ExecutionMode, OperationExecutor] = {}
+
+
+def get_executor(mode: ExecutionMode, operating_system: Platform) -> OperationExecutor:
+    """
+    Returns the executor for the given mode, the instance is shared for the
+    whole session so its latency statistics accumulate across commands.
+    """
+    if mode not in _executors:
+        _executors[mode] = EXECUTORS[mode](operating_system)
+    return _executors[mode]
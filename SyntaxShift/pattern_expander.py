@@ -0,0 +1,71 @@
+"""
+This module expands the wildcard arguments of file operations, for example
+'delete *.tmp' or 'rename logs/*.txt .csv'.
+
+Wildcards ('*', '?' and '[...]') are supported in the file name part of an
+argument only. Patterns are grouped by directory and every directory is read
+once with 'os.scandir', matching each name against all the patterns of that
+directory, so no file is stat-ed to find out whether it matches. Like a
+shell, a wildcard does not match names starting with '.' unless the pattern
+itself starts with '.'.
+"""
+
+from fnmatch import translate
+from typing import Dict, List
+import os
+import re
+
+from validator.static.exceptions import FileOperationError
+
+
+WILDCARDS = frozenset("*?[")
+
+
+def is_pattern(argument: str) -> bool:
+    """
+    Whether the argument holds one of the 'WILDCARDS'.
+    """
+    return not WILDCARDS.isdisjoint(argument)
+
+
+def expand_patterns(patterns: List[str]) -> Dict[str, List[str]]:
+    """
+    Finds the regular files matching each pattern.
+
+    Returns:
+        Dict[str, List[str]]: The sorted matches of every pattern, keyed by pattern.
+
+    Raises:
+        FileOperationError: If a pattern has a wildcard in its directory part or
+            its directory cannot be read.
+    """
+    by_directory: Dict[str, List[tuple[str, re.Pattern, bool]]] = {}
+
+    for pattern in patterns:
+        directory, name_pattern = os.path.split(pattern)
+        if is_pattern(directory):
+            raise FileOperationError(f"Wildcards are only supported in file names: '{pattern}'")
+        by_directory.setdefault(directory, []).append(
+            (pattern, re.compile(translate(name_pattern)), name_pattern.startswith("."))
+        )
+
+    matches: Dict[str, List[str]] = {pattern: [] for pattern in patterns}
+
+    for directory, compiled in by_directory.items():
+        try:
+            with os.scandir(directory or os.curdir) as scanner:
+                for entry in scanner:
+                    if not entry.is_file(follow_symlinks=False):
+                        continue
+                    hidden = entry.name.startswith(".")
+                    for pattern, regex, matches_hidden in compiled:
+                        if (matches_hidden or not hidden) and regex.match(entry.name):
+                            matches[pattern].append(os.path.join(directory, entry.name))
+        except OSError as error:
+            raise FileOperationError(
+                f"Cannot read directory '{directory or os.curdir}': {error.strerror}"
+            ) from error
+
+    for found in matches.values():
+        found.sort()
+    return matches
@@ -1,13 +1,55 @@
 from typing import List
 
+from validator.command_registry import COMMANDS
+from validator.static.constant_types import Platform
+from validator.static.exceptions import InvalidCommand
+
 
 class PipeCommandHandler:
+    """
+    Splits a piped command into its stages and translates every stage
+    into the platform command run by the pipeline executor.
+    """
+
+    PIPE = "|"
 
-    def __init__(self, command):
+    def __init__(self, command: List[str]):
         self.command = command
 
-    def split_piped_commands(self) -> tuple[None | List[str], None | List[str]]:
-        for i, arg in enumerate(self.command):
-            if arg == "|":
-                return self.command[:i], self.command[i + 1 :]
-        return None, None
\ No newline at end of file
+    def split_piped_commands(self) -> List[List[str]]:
+        """
+        Splits the command on every pipe symbol.
+
+        Example:
+            ['list', '.', '|', 'modify', 'a.txt', 'add', 'r']
+                -> [['list', '.'], ['modify', 'a.txt', 'add', 'r']]
+
+        Returns:
+            List[List[str]]: One list of words per stage, empty between two adjacent pipes.
+        """
+        stages: List[List[str]] = [[]]
+        for arg in self.command:
+            if arg == PipeCommandHandler.PIPE:
+                stages.append([])
+            else:
+                stages[-1].append(arg)
+        return stages
+
+    def build_pipeline(self, operating_system: Platform) -> List[List[str]]:
+        """
+        Returns:
+            List[List[str]]: The platform command of each stage, in pipeline order.
+        """
+        stages = self.split_piped_commands()
+        return [self.stage_command(stage, operating_system) for stage in stages]
+
+    @staticmethod
+    def stage_command(stage: List[str], operating_system: Platform) -> List[str]:
+        """
+        Translates a stage with the handler registered for its command.
+        """
+        command_spec = COMMANDS.get(stage[0])
+        if command_spec is None or command_spec.handler is None:
+            raise InvalidCommand(f"Invalid piped command stage: {stage}")
+
+        return command_spec.handler(stage, operating_system).platform_command()
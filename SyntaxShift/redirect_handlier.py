@@ -6,9 +6,7 @@ from validator.static.constant_types import (
     DirectoryOperation
 )
 
-from SyntaxShift.directory_handler import DirectoryManagementHandler
-from SyntaxShift.file_access_handler import FileAccessHandler
-from SyntaxShift.file_operation_handler import FileOperationHandler
+from SyntaxShift.pipe_operation_handler import PipeCommandHandler
 
 from validator.static.exceptions import RedirectionError
 from validator.static.constant_types import FILE_OPERATIONS, FILE_PERMISSIONS, DIRECTORY_OPERATIONS, Platform
@@ -68,24 +66,7 @@ class RedirectHandler:
         index = self.commands.index(">")
         command = self.commands[:index]
 
-        if command_type in FileOperation:
-
-            rename = None
-            if command_type == "rename":
-                rename = input("Enter new filename: ")
-            operation = FileOperationHandler(command, self.operating_system)
-            return operation.check_file_operation(rename)
-
-        elif command_type in FilePermission:
-            print("FIle Permission")
-            operation = FileAccessHandler(command, self.operating_system)
-            return operation.check_file_access()
-
-        elif command_type in DirectoryOperation:
-            operation = DirectoryManagementHandler(command, self.operating_system)
-            return  operation.make_directory_command()
-
-        return None
+        return PipeCommandHandler.stage_command(command, self.operating_system)
 
     def redirect_into(self, command_type:str):
         """
@@ -0,0 +1,222 @@
+"""
+This module provides the builtin engine behind the 'remove' command.
+
+Instead of running 'rm -r' / 'rmdir' in a child process, the tree is
+removed in two phases:
+
+1. Every directory is read once with 'os.scandir' and all its files and
+   symlinks are unlinked. Directories are handed out to a pool of worker
+   threads as they are found, so separate directories are emptied in
+   parallel. Where the platform supports it, each directory is opened once
+   and its entries are unlinked relative to that descriptor, which saves
+   resolving the full path for every file and cannot follow a directory
+   that was swapped for a symlink.
+2. The now empty directories are removed deepest first, the directories of
+   one depth in parallel.
+
+Symlinks are never followed: a symlink to a directory is unlinked, not
+walked. Failures do not stop the removal, they are collected and the
+directories above a failed entry are left in place.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from itertools import groupby
+from threading import Lock
+from time import monotonic
+from typing import List, Set, TextIO, Tuple
+import os
+import stat
+
+
+# dirfd-relative deletes need both a descriptor based scandir and unlink
+SUPPORTS_DIR_FD = os.scandir in os.supports_fd and os.unlink in os.supports_dir_fd
+
+DIRECTORY_FLAGS = os.O_RDONLY | getattr(os, "O_DIRECTORY", 0) | getattr(os, "O_NOFOLLOW", 0)
+
+
+@dataclass
+class RemovalProgress:
+    """
+    The running totals of a tree removal, shared by the worker threads.
+
+    Attributes:
+        files (int): The number of files and symlinks removed.
+        directories (int): The number of directories removed.
+        failures (List[str]): One message per entry that could not be removed.
+        output (TextIO | None): Where progress is printed while the removal runs,
+            None to stay quiet.
+    """
+    files: int = 0
+    directories: int = 0
+    failures: List[str] = field(default_factory=list)
+    output: TextIO | None = None
+    _lock: Lock = field(default_factory=Lock, repr=False)
+    _last_report: float = field(default_factory=monotonic, repr=False)
+
+    # seconds between two progress lines
+    REPORT_INTERVAL = 0.25
+    # number of failures listed in the summary before the rest are only counted
+    MAX_LISTED_FAILURES = 10
+
+    def add(self, files: int = 0, directories: int = 0, failures: List[str] | None = None) -> None:
+        """
+        Adds to the totals, printing a progress line at most every 'REPORT_INTERVAL' seconds.
+        """
+        with self._lock:
+            self.files += files
+            self.directories += directories
+            self.failures.extend(failures or [])
+
+            since_report = monotonic() - self._last_report
+            if self.output is not None and since_report >= RemovalProgress.REPORT_INTERVAL:
+                self._last_report = monotonic()
+                self.output.write(f"\rremoving: {self.files} files, {self.directories} directories")
+                self.output.flush()
+
+    def __str__(self) -> str:
+        lines = [f"remove: {self.files} files and {self.directories} directories removed"]
+        if self.failures:
+            lines[0] += f", {len(self.failures)} failed"
+        lines += [f"  {failure}" for failure in self.failures[:RemovalProgress.MAX_LISTED_FAILURES]]
+        if len(self.failures) > RemovalProgress.MAX_LISTED_FAILURES:
+            hidden = len(self.failures) - RemovalProgress.MAX_LISTED_FAILURES
+            lines.append(f"  ... and {hidden} more")
+        return "\n".join(lines)
+
+
+class TreeRemover:
+    """
+    Removes a directory and everything below it.
+
+    Attributes:
+        root (str): The path to remove.
+        jobs (int): The number of worker threads.
+        progress (RemovalProgress): The totals of the removal.
+    """
+
+    def __init__(self, root: str, jobs: int = 1, output: TextIO | None = None):
+        self.root = os.path.normpath(root)
+        self.jobs = max(jobs, 1)
+        self.progress = RemovalProgress(output=output)
+        # directories that keep an entry which failed to be removed, with their ancestors
+        self._kept: Set[str] = set()
+        self._kept_lock = Lock()
+
+    def remove(self) -> RemovalProgress:
+        """
+        Removes the tree, a root that is not a directory (a file or a symlink) is just unlinked.
+
+        Returns:
+            RemovalProgress: The totals of the removal, failures included.
+        """
+        try:
+            root_stat = os.lstat(self.root)
+        except OSError as error:
+            self.fail(self.root, error)
+            return self.progress
+
+        if not stat.S_ISDIR(root_stat.st_mode):
+            self.remove_entries(os.path.dirname(self.root), [os.path.basename(self.root)], None)
+            return self.progress
+
+        directories: List[Tuple[int, str]] = [(0, self.root)]
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            pending: Set[Future] = {pool.submit(self.clear_directory, self.root, 0)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for depth, subdirectory in future.result():
+                        directories.append((depth, subdirectory))
+                        pending.add(pool.submit(self.clear_directory, subdirectory, depth))
+
+            directories.sort(key=lambda directory: directory[0], reverse=True)
+            for _, level in groupby(directories, key=lambda directory: directory[0]):
+                # all the directories of a depth are removed before the level above starts
+                list(pool.map(self.remove_empty_directory, [path for _, path in level]))
+
+        if self.progress.output is not None:
+            self.progress.output.write("\r\033[K")
+            self.progress.output.flush()
+        return self.progress
+
+    def clear_directory(self, path: str, depth: int) -> List[Tuple[int, str]]:
+        """
+        Unlinks the files and symlinks of a directory.
+
+        Returns:
+            List[Tuple[int, str]]: The depth and path of its subdirectories.
+        """
+        subdirectories: List[Tuple[int, str]] = []
+        names: List[str] = []
+        fd = None
+
+        try:
+            if SUPPORTS_DIR_FD:
+                fd = os.open(path, DIRECTORY_FLAGS)
+            with os.scandir(path if fd is None else fd) as scanner:
+                for entry in scanner:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirectories.append((depth + 1, os.path.join(path, entry.name)))
+                    else:
+                        names.append(entry.name)
+            self.remove_entries(path, names, fd)
+        except OSError as error:
+            self.fail(path, error)
+        finally:
+            if fd is not None:
+                os.close(fd)
+
+        return subdirectories
+
+    def remove_entries(self, directory: str, names: List[str], fd: int | None) -> None:
+        """
+        Unlinks the named entries of a directory, relative to its descriptor when one is given.
+        """
+        removed = 0
+        failures: List[str] = []
+
+        for name in names:
+            try:
+                if fd is None:
+                    os.unlink(os.path.join(directory, name))
+                else:
+                    os.unlink(name, dir_fd=fd)
+                removed += 1
+            except OSError as error:
+                failures.append(
+                    f"Failed to remove '{os.path.join(directory, name)}': {error.strerror}"
+                )
+
+        if failures:
+            self.keep(directory)
+        self.progress.add(files=removed, failures=failures)
+
+    def remove_empty_directory(self, path: str) -> None:
+        """
+        Removes a directory once its entries are gone, unless one below it was kept.
+        """
+        if path in self._kept:
+            # an entry below failed to be removed, the directory is not empty
+            self.keep(os.path.dirname(path))
+            return
+        try:
+            os.rmdir(path)
+            self.progress.add(directories=1)
+        except OSError as error:
+            self.fail(path, error)
+
+    def fail(self, path: str, error: OSError) -> None:
+        """
+        Records the failure of 'path' and keeps its parent directory.
+        """
+        self.keep(os.path.dirname(path))
+        self.progress.add(failures=[f"Failed to remove '{path}': {error.strerror}"])
+
+    def keep(self, directory: str) -> None:
+        """
+        Marks a directory as not empty, so it is left in place.
+        """
+        with self._kept_lock:
+            self._kept.add(directory)
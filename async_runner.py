@@ -0,0 +1,293 @@
+"""
+This module executes the commands of the interactive shell on the asyncio
+event loop of the REPL.
+
+Commands that run a platform command ('pwd', a '|' pipeline, and with the
+subprocess backend 'list', 'make' and 'remove') are started with
+'asyncio.create_subprocess_exec' and their output is streamed to the
+terminal line by line as it is produced, instead of being shown once the
+command has finished. Every other command is executed in-process by
+'dispatch' in a worker thread, so the event loop stays responsive.
+
+The running command is the foreground task: Ctrl-C cancels it, its child
+processes are terminated, and the shell goes back to the prompt. An
+in-process operation cannot be interrupted half way, it keeps running in
+its thread until it is done, except 'watch', 'find', 'search', 'usage'
+and 'dupes' which are told to stop. Commands started with '&' run
+concurrently as background jobs of the 'JobSupervisor'.
+
+Parsing and validation are unchanged, 'InputParser' runs before a command
+reaches the runner.
+"""
+
+from threading import Event
+from typing import Callable, List
+import argparse
+import asyncio
+import os
+import sys
+
+from audit_log import INTERRUPTED_STATUS
+from compute import ComputeOperations
+from job_supervisor import JobSupervisor, format_report
+from phase_metrics import PHASE_METRICS, Phase
+from validator.command_registry import PIPE_HANDLER, resolve
+from validator.job_control_validator import JobControlValidator
+from validator.static.constant_types import ConsoleColors, InspectionCommand, JobControl, Platform
+from validator.stat_snapshot import current_snapshot
+
+
+class AsyncCommandRunner:
+    """
+    Runs validated commands as the cancellable foreground task of the REPL.
+
+    Attributes:
+        os_platform (Platform): The operating system platform.
+        arguments (argparse.Namespace): The command line options of the shell.
+        supervisor (JobSupervisor): The supervisor of the background jobs.
+        dispatch (Callable[[List[str]], None]): Executes a parsed command in-process.
+        foreground (asyncio.Task | None): The command running in the foreground.
+    """
+
+    # a line longer than this is streamed in pieces
+    STREAM_LIMIT = 1024 * 1024
+    # seconds a cancelled command has to exit before it is killed
+    TERMINATE_TIMEOUT = 2.0
+
+    def __init__(self, os_platform: Platform, arguments: argparse.Namespace,
+                 supervisor: JobSupervisor, dispatch: Callable[[List[str]], None]):
+        self.os_platform = os_platform
+        self.arguments = arguments
+        self.supervisor = supervisor
+        self.dispatch = dispatch
+        self.foreground: asyncio.Task | None = None
+
+    async def run(self, parsed_input: List[str]) -> int:
+        """
+        Runs the command as the foreground task until it finishes or is interrupted.
+
+        Returns:
+            int: The exit status of the command, 'INTERRUPTED_STATUS' when it was interrupted.
+        """
+        self.foreground = asyncio.create_task(self.execute(parsed_input))
+        try:
+            return await self.foreground
+        except asyncio.CancelledError:
+            if asyncio.current_task().cancelling():
+                # the shell itself is being cancelled, not just the command
+                raise
+            print(f"\n{ConsoleColors.get('RED')}Interrupted: {' '.join(parsed_input)}"
+                  f"{ConsoleColors.get('RESET')}")
+            return INTERRUPTED_STATUS
+        finally:
+            self.foreground = None
+
+    def interrupt(self) -> bool:
+        """
+        Cancels the foreground command, called on Ctrl-C.
+
+        Returns:
+            bool: False when no command was running.
+        """
+        if self.foreground is None or self.foreground.done():
+            return False
+        self.foreground.cancel()
+        return True
+
+    async def execute(self, parsed_input: List[str]) -> int:
+        """
+        Returns:
+            int: The exit status of the spawned command, 0 for an in-process command
+                that did not raise.
+        """
+        if parsed_input[0] == JobControl.WAIT:
+            await self.wait_jobs(parsed_input)
+            return 0
+
+        if parsed_input[0] in InspectionCommand and ">" not in parsed_input:
+            await self.inspect(parsed_input)
+            return 0
+
+        if "|" in parsed_input:
+            with PHASE_METRICS.timer("pipeline", Phase.TRANSLATE):
+                commands = resolve(PIPE_HANDLER)(parsed_input).build_pipeline(self.os_platform)
+            status = await self.stream_pipeline(commands)
+            self.stat_report()
+            return status
+
+        if not any(symbol in parsed_input for symbol in ("<", ">")):
+            compute = ComputeOperations(
+                parsed_input, self.os_platform, self.arguments.backend,
+                self.arguments.echo_redirect, self.arguments.jobs
+            )
+            start = PHASE_METRICS.clock()
+            command = compute.spawned_command()
+            if command is not None:
+                PHASE_METRICS.record(compute.metrics_label, Phase.TRANSLATE, start)
+                status = await self.stream_command(command, compute.metrics_label)
+                self.stat_report()
+                return status
+
+        try:
+            await asyncio.to_thread(self.dispatch, parsed_input)
+            return 0
+        except asyncio.CancelledError:
+            print(f"\n{ConsoleColors.get('RED')}'{parsed_input[0]}' runs in-process and cannot be "
+                  f"interrupted, it finishes in the background{ConsoleColors.get('RESET')}")
+            raise
+
+    async def inspect(self, parsed_input: List[str]) -> None:
+        """
+        'watch', 'find', 'search', 'usage' or 'dupes' in a worker thread,
+        Ctrl-C tells it to stop: a watcher closes its watches within a second,
+        'find' and 'usage' stop walking, 'search' cancels the tasks not started
+        by its workers and 'dupes' stops before its next batch of hashes.
+        """
+        compute = ComputeOperations(
+            parsed_input, self.os_platform, self.arguments.backend, jobs=self.arguments.jobs
+        )
+        stop = Event()
+        try:
+            await asyncio.to_thread(compute.execute_inspection, stop)
+        except asyncio.CancelledError:
+            stop.set()
+            raise
+
+    async def stream_command(self, command: List[str], metrics_label: str = "command") -> int:
+        """
+        Runs a platform command, streaming its output to the terminal line by line.
+
+        Returns:
+            int: The exit status of the command.
+        """
+        with PHASE_METRICS.timer(metrics_label, Phase.SPAWN):
+            process = await asyncio.create_subprocess_exec(
+                *command, stdout=asyncio.subprocess.PIPE, limit=AsyncCommandRunner.STREAM_LIMIT
+            )
+        try:
+            with PHASE_METRICS.timer(metrics_label, Phase.WAIT):
+                await self.stream(process.stdout)
+                returncode = await process.wait()
+        except asyncio.CancelledError:
+            await self.terminate([process])
+            raise
+
+        if returncode != 0:
+            print(f"{ConsoleColors.get('RED')}Error executing command: {command} "
+                  f"exited with status {returncode}{ConsoleColors.get('RESET')}")
+        return returncode
+
+    async def stream_pipeline(self, commands: List[List[str]]) -> int:
+        """
+        Starts every stage of a pipeline, each connected to the next with an OS
+        pipe, and streams the output of the last stage line by line, printing
+        the exit status of the stages when any of them failed.
+
+        Returns:
+            int: The exit status of the first stage that failed, 0 when none did.
+        """
+        processes: List[asyncio.subprocess.Process] = []
+        stdin = None
+        start = PHASE_METRICS.clock()
+
+        try:
+            for index, command in enumerate(commands):
+                last = index == len(commands) - 1
+                read_end, write_end = (None, None) if last else os.pipe()
+                try:
+                    processes.append(await asyncio.create_subprocess_exec(
+                        *command, stdin=stdin,
+                        stdout=asyncio.subprocess.PIPE if last else write_end,
+                        limit=AsyncCommandRunner.STREAM_LIMIT,
+                    ))
+                finally:
+                    # only the children may hold the pipe ends, so every stage sees EOF
+                    self.close_fds(stdin, write_end)
+                    stdin = read_end
+            PHASE_METRICS.record("pipeline", Phase.SPAWN, start)
+
+            with PHASE_METRICS.timer("pipeline", Phase.WAIT):
+                await self.stream(processes[-1].stdout)
+                statuses = [await process.wait() for process in processes]
+        except (asyncio.CancelledError, OSError):
+            self.close_fds(stdin)
+            await self.terminate(processes)
+            raise
+
+        failures = ComputeOperations.pipeline_statuses(statuses)
+        if any(failures):
+            for command, status in zip(commands, statuses):
+                print(f"{ConsoleColors.get('RED')}[{status}] {' '.join(command)}"
+                      f"{ConsoleColors.get('RESET')}")
+        return next((status for status in failures if status), 0)
+
+    @staticmethod
+    def close_fds(*fds: int | None) -> None:
+        """
+        Closes the pipe ends left open once a pipeline has been started.
+        """
+        for fd in fds:
+            if fd is not None:
+                os.close(fd)
+
+    @staticmethod
+    async def stream(reader: asyncio.StreamReader) -> None:
+        """
+        Writes every line read from the child to the terminal as soon as it arrives.
+        """
+        print(ConsoleColors.get("MAGENTA"), end="")
+        try:
+            while True:
+                try:
+                    line = await reader.readuntil(b"\n")
+                except asyncio.IncompleteReadError as error:
+                    line = error.partial
+                except asyncio.LimitOverrunError as error:
+                    line = await reader.read(error.consumed)
+                if not line:
+                    break
+                sys.stdout.write(line.decode(errors="replace"))
+                sys.stdout.flush()
+        finally:
+            print(ConsoleColors.get("RESET"), end="", flush=True)
+
+    @staticmethod
+    async def terminate(processes: List[asyncio.subprocess.Process]) -> None:
+        """
+        Terminates the processes that are still running, killing those that
+        do not exit within 'TERMINATE_TIMEOUT' seconds.
+        """
+        running = [process for process in processes if process.returncode is None]
+        for process in running:
+            try:
+                process.terminate()
+            except ProcessLookupError:
+                pass
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(process.wait() for process in running)),
+                AsyncCommandRunner.TERMINATE_TIMEOUT,
+            )
+        except asyncio.TimeoutError:
+            for process in running:
+                if process.returncode is None:
+                    process.kill()
+
+    async def wait_jobs(self, parsed_input: List[str]) -> None:
+        """
+        'wait [id]' on the event loop, Ctrl-C stops waiting and the jobs are
+        reported at a later prompt instead.
+        """
+        job_id = JobControlValidator.job_id(parsed_input[1]) if len(parsed_input) > 1 else None
+        jobs = self.supervisor.select(job_id)
+        for job in jobs:
+            await asyncio.to_thread(job.reader.join)
+        for job in self.supervisor.forget(jobs):
+            print(format_report(job))
+
+    def stat_report(self) -> None:
+        """
+        Prints the stat snapshot counters when '--stat-report' is given.
+        """
+        if self.arguments.stat_report:
+            print(current_snapshot().report())
@@ -0,0 +1,254 @@
+"""
+This module provides the audit log of the shell, a JSON-lines record of
+every executed command: its name, arguments, working directory, exit
+status and duration.
+
+Recording a command never waits for the disk. The shell thread only builds
+an 'AuditEntry' and puts it on an unbounded queue, a background thread
+serializes the entries and appends them to the log file, writing every
+entry queued so far in one batch. Once the file would grow past
+'max_bytes' it is rotated: 'audit.log' becomes 'audit.log.1', which
+becomes 'audit.log.2' and so on, the oldest of 'backups' files being
+dropped.
+
+The log is off unless the shell is started with '--audit-log FILE'.
+Background jobs append to the same file from their own shell: the shells
+take turns through an exclusive 'flock' on 'FILE.lock', held around the
+size check, the rotation and the writes of a batch, and a shell whose
+file was rotated by another one reopens it. Where 'flock' is missing
+(Windows) the shells are not serialized.
+"""
+
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from queue import Empty, SimpleQueue
+from threading import Thread
+from time import perf_counter, time
+from typing import Iterator, List, TextIO
+import json
+import os
+import sys
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+# exit status recorded for a command interrupted with Ctrl-C, as in the usual shells
+INTERRUPTED_STATUS = 130
+
+
+@dataclass
+class AuditEntry:
+    """
+    A command recorded in the audit log.
+
+    Attributes:
+        command (str): The command name, 'pipeline' for piped commands.
+        arguments (List[str]): The words of the command after its name.
+        cwd (str): The working directory the command started in.
+        started (float): The wall clock time the command started at.
+        status (int): The exit status, 0 on success.
+        duration (float): How long the command ran in seconds.
+        error (str | None): The error the command failed with.
+    """
+    command: str
+    arguments: List[str]
+    cwd: str
+    started: float = field(default_factory=time)
+    status: int = 0
+    duration: float = 0.0
+    error: str | None = None
+
+    def to_json(self) -> str:
+        """
+        Returns:
+            str: The entry as one JSON line, without the newline.
+        """
+        entry = {
+            "time": datetime.fromtimestamp(self.started, timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "pid": os.getpid(),
+            "command": self.command,
+            "args": self.arguments,
+            "cwd": self.cwd,
+            "status": self.status,
+            "duration": round(self.duration, 6),
+        }
+        if self.error is not None:
+            entry["error"] = self.error
+        return json.dumps(entry)
+
+
+class AuditLog:
+    """
+    Appends the executed commands to a size-rotated JSON-lines file from a background thread.
+
+    Attributes:
+        path (str | None): The log file, None when the audit log is disabled.
+        max_bytes (int): The size the log file is rotated at.
+        backups (int): The number of rotated files kept.
+        dropped (int): The number of entries that could not be written.
+    """
+
+    DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+    DEFAULT_BACKUPS = 5
+
+    def __init__(self, path: str | None = None, max_bytes: int = DEFAULT_MAX_BYTES,
+                 backups: int = DEFAULT_BACKUPS):
+        self.path = os.path.abspath(path) if path else None
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.dropped = 0
+        self._queue: SimpleQueue = SimpleQueue()
+        self._writer: Thread | None = None
+        if self.path is not None:
+            self._writer = Thread(target=self.write_entries, name="audit-log", daemon=True)
+            self._writer.start()
+
+    @property
+    def enabled(self) -> bool:
+        """
+        Whether commands are recorded, a path was given.
+        """
+        return self._writer is not None
+
+    @contextmanager
+    def command(self, parsed_input: List[str]) -> Iterator[AuditEntry]:
+        """
+        Records the command run in the block, with the status 1 and the error
+        when it raises. The block may set the status of the entry it is given.
+        """
+        entry = AuditEntry(
+            "pipeline" if "|" in parsed_input else parsed_input[0],
+            parsed_input if "|" in parsed_input else parsed_input[1:],
+            os.getcwd(),
+        )
+        start = perf_counter()
+        try:
+            yield entry
+        except KeyboardInterrupt:
+            entry.status = INTERRUPTED_STATUS
+            raise
+        except BaseException as error:
+            entry.status = 1
+            entry.error = str(error)
+            raise
+        finally:
+            entry.duration = perf_counter() - start
+            self.record(entry)
+
+    def record(self, entry: AuditEntry) -> None:
+        """
+        Queues the entry for the writer thread, it never blocks.
+        """
+        if self._writer is not None:
+            self._queue.put_nowait(entry)
+
+    def close(self) -> None:
+        """
+        Writes the entries still queued and stops the writer thread.
+        """
+        if self._writer is None:
+            return
+        self._queue.put_nowait(None)
+        self._writer.join()
+        self._writer = None
+
+    def write_entries(self) -> None:
+        """
+        Run by the writer thread: writes every queued entry until 'close'.
+        """
+        log_file = None
+        running = True
+        while running:
+            batch = [self._queue.get()]
+            try:
+                while True:
+                    batch.append(self._queue.get_nowait())
+            except Empty:
+                pass
+            if None in batch:
+                running = False
+                batch = batch[:batch.index(None)]
+
+            try:
+                log_file = self.write_batch(log_file, batch)
+            except OSError as error:
+                self.dropped += len(batch)
+                print(f"audit log: could not write to {self.path}: {error}", file=sys.stderr)
+                if log_file is not None:
+                    log_file.close()
+                    log_file = None
+
+        if log_file is not None:
+            log_file.close()
+
+    def write_batch(self, log_file: TextIO | None, batch: List[AuditEntry]) -> TextIO:
+        """
+        Appends the entries to the log file, rotating it when it is full, under
+        the lock shared with the other shells writing to it.
+
+        Returns:
+            TextIO: The open log file, a new one after a rotation.
+        """
+        lines = [entry.to_json() + "\n" for entry in batch]
+        with self.locked():
+            if log_file is not None and self.rotated_away(log_file):
+                log_file.close()
+                log_file = None
+            if log_file is None:
+                # kept open across batches, closed by the writer thread when it stops
+                log_file = open(self.path, "a", encoding="utf-8")  # pylint: disable=consider-using-with
+
+            # the size on disk, another shell may have appended since the last batch
+            size = os.fstat(log_file.fileno()).st_size
+            for line in lines:
+                if size and size + len(line) > self.max_bytes:
+                    log_file.close()
+                    self.rotate()
+                    log_file = open(self.path, "a", encoding="utf-8")  # pylint: disable=consider-using-with
+                    size = 0
+                log_file.write(line)
+                size += len(line)
+            log_file.flush()
+        return log_file
+
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        """
+        Holds an exclusive lock on 'path.lock' for the block, released when the lock file is closed.
+        """
+        if fcntl is None:
+            yield
+            return
+        with open(f"{self.path}.lock", "a", encoding="utf-8") as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            yield
+
+    def rotated_away(self, log_file: TextIO) -> bool:
+        """
+        Whether the open log file is no longer at 'path', rotated by another shell.
+        """
+        try:
+            current = os.stat(self.path)
+        except FileNotFoundError:
+            return True
+        opened = os.fstat(log_file.fileno())
+        return (current.st_dev, current.st_ino) != (opened.st_dev, opened.st_ino)
+
+    def rotate(self) -> None:
+        """
+        Shifts 'path.N' to 'path.N+1' for every kept backup, then moves the log file to 'path.1'.
+        """
+        if self.backups <= 0:
+            os.remove(self.path)
+            return
+        for index in range(self.backups - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        os.replace(self.path, f"{self.path}.1")
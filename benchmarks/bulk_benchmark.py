@@ -0,0 +1,100 @@
+"""
+Benchmark for bulk file operations on a pool of worker threads ('--jobs N').
+
+For every worker count it creates '--files' files spread over a tree of
+directories, changes their permissions, renames them and deletes them,
+all through 'BuiltinExecutor.execute_batch', and prints the throughput of
+each operation. Point '--root' at the file system under test (NFS, SSD
+array, ...), it defaults to a temporary directory.
+
+Usage:
+    python benchmarks/bulk_benchmark.py --files 100000 --jobs 1 4 16 64
+"""
+
+from time import perf_counter
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from SyntaxShift.file_access_handler import PermissionRequest
+from SyntaxShift.file_operation_handler import FileOperationRequest
+from SyntaxShift.operation_executor import BuiltinExecutor
+from main import get_platform
+from validator.static.constant_types import FileOperation, FilePermission
+
+
+FILES_PER_DIRECTORY = 1000
+
+
+def build_tree(root: str, files: int) -> list[str]:
+    """
+    Creates the directories of the tree and returns the file paths to operate on.
+    """
+    paths = []
+    for index in range(files):
+        directory = os.path.join(root, f"d{index // FILES_PER_DIRECTORY:05d}")
+        if index % FILES_PER_DIRECTORY == 0:
+            os.makedirs(directory, exist_ok=True)
+        paths.append(os.path.join(directory, f"f{index:07d}.txt"))
+    return paths
+
+
+def run(executor: BuiltinExecutor, operation: str, requests: list, jobs: int) -> float:
+    """
+    Executes one batch and returns its throughput in operations per second.
+    """
+    start = perf_counter()
+    summary = executor.execute_batch(operation, requests, jobs=jobs)
+    elapsed = perf_counter() - start
+    if summary.failures:
+        raise RuntimeError(str(summary))
+    return len(requests) / elapsed
+
+
+def main():
+    """
+    Runs every operation over a fresh tree for each number of jobs.
+    """
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--files", type=int, default=100_000)
+    parser.add_argument("--jobs", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument(
+        "--root", help="directory to build the tree in, a temporary directory by default"
+    )
+    arguments = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="bulk-benchmark-", dir=arguments.root)
+    executor = BuiltinExecutor(get_platform())
+
+    print(f"{arguments.files} files under {root}")
+    print(f"{'jobs':>6}{'create/s':>12}{'modify/s':>12}{'rename/s':>12}{'delete/s':>12}")
+    try:
+        for jobs in arguments.jobs:
+            paths = build_tree(os.path.join(root, f"jobs{jobs}"), arguments.files)
+            renamed = [path[:-len(".txt")] + ".csv" for path in paths]
+
+            rates = [
+                run(executor, FileOperation.CREATE,
+                    [FileOperationRequest(FileOperation.CREATE, path) for path in paths], jobs),
+                run(executor, FilePermission.MODIFY,
+                    [PermissionRequest(path, "add", ("x",)) for path in paths], jobs),
+                run(executor, FileOperation.RENAME,
+                    [FileOperationRequest(FileOperation.RENAME, path, new)
+                     for path, new in zip(paths, renamed)], jobs),
+                run(executor, FileOperation.DELETE,
+                    [FileOperationRequest(FileOperation.DELETE, path) for path in renamed], jobs),
+            ]
+            print(f"{jobs:>6}" + "".join(f"{rate:>12.0f}" for rate in rates))
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark for the 'copy' command against 'shutil.copyfile'.
+
+It writes a '--size-mb' megabytes file then copies it '--repeat' times with:
+    shutil:     'shutil.copyfile'.
+    sequential: 'FileCopier' with the ranges copied one after the other.
+    parallel:   'FileCopier' with the ranges of a large file copied concurrently.
+
+The best throughput of every strategy is printed, together with the system
+call 'FileCopier' used. Point '--root' at the file system under test, it
+defaults to a temporary directory.
+
+Usage:
+    python benchmarks/copy_benchmark.py --size-mb 4096
+"""
+
+from time import perf_counter
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from SyntaxShift import file_copier
+from SyntaxShift.file_copier import FileCopier
+
+
+STRATEGIES = ["shutil", "sequential", "parallel"]
+
+
+def write_source(file_path: str, size_mb: int) -> None:
+    """
+    Writes 'size_mb' MiB of random data to the source file.
+    """
+    chunk = os.urandom(1024 * 1024)
+    with open(file_path, "wb") as source:
+        for _ in range(size_mb):
+            source.write(chunk)
+
+
+def run_strategy(strategy: str, source: str, destination: str) -> tuple[float, str]:
+    """
+    Returns:
+        tuple[float, str]: The elapsed seconds and the copy method used.
+    """
+    workers = file_copier.MAX_RANGE_WORKERS
+    if strategy == "sequential":
+        file_copier.MAX_RANGE_WORKERS = 1
+
+    start = perf_counter()
+    try:
+        if strategy == "shutil":
+            shutil.copyfile(source, destination)
+            method = "shutil"
+        else:
+            copier = FileCopier(source, destination)
+            copier.copy()
+            method = copier.method
+    finally:
+        file_copier.MAX_RANGE_WORKERS = workers
+    return perf_counter() - start, method
+
+
+def main():
+    """
+    Copies the source with each strategy and prints the throughput of each.
+    """
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--size-mb", type=int, default=1024)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--root", help="directory to copy in, a temporary directory by default")
+    arguments = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="copy-benchmark-", dir=arguments.root)
+    source = os.path.join(root, "source.dat")
+    destination = os.path.join(root, "destination.dat")
+
+    try:
+        write_source(source, arguments.size_mb)
+        print(f"{arguments.size_mb} MB under {root}, {file_copier.MAX_RANGE_WORKERS} range workers")
+        print(f"{'strategy':<12}{'method':<18}{'best MB/s':>12}")
+
+        for strategy in STRATEGIES:
+            best, method = float("inf"), ""
+            for _ in range(arguments.repeat):
+                elapsed, method = run_strategy(strategy, source, destination)
+                best = min(best, elapsed)
+                os.remove(destination)
+            print(f"{strategy:<12}{method:<18}{arguments.size_mb / best:>12.0f}")
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
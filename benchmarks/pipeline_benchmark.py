@@ -0,0 +1,69 @@
+"""
+Benchmark for '|' pipelines with large data.
+
+It pushes '--size-mb' megabytes through '--stages' stages of 'cat' into
+'wc -c', once with 'ComputeOperations.execute_piped_command' and once with
+the same pipeline run by '/bin/sh', and prints the throughput of both.
+
+Usage:
+    python benchmarks/pipeline_benchmark.py --size-mb 1024 --stages 4
+"""
+
+from time import perf_counter
+import argparse
+import os
+import shlex
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compute import ComputeOperations  # pylint: disable=wrong-import-position
+
+
+def generator_command(size_mb: int) -> list[str]:
+    """
+    Returns a command writing 'size_mb' megabytes of text to stdout.
+    """
+    script = (
+        "import sys\n"
+        "chunk = b'x' * 1048575 + b'\\n'\n"
+        f"for _ in range({size_mb}):\n"
+        "    sys.stdout.buffer.write(chunk)\n"
+    )
+    return [sys.executable, "-c", script]
+
+
+def main():
+    """
+    Runs the pipeline with the engine of the shell, then with 'sh', and prints both throughputs.
+    """
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--size-mb", type=int, default=512)
+    parser.add_argument(
+        "--stages", type=int, default=3, help="number of 'cat' stages in the middle"
+    )
+    arguments = parser.parse_args()
+
+    middle = [["cat"]] * arguments.stages
+    commands = [generator_command(arguments.size_mb)] + middle + [["wc", "-c"]]
+
+    start = perf_counter()
+    statuses = ComputeOperations.execute_piped_command(commands)
+    engine = perf_counter() - start
+
+    start = perf_counter()
+    pipeline = " | ".join(shlex.join(command) for command in commands)
+    subprocess.run(["sh", "-c", pipeline], check=True)
+    shell = perf_counter() - start
+
+    print(f"stage statuses: {statuses}")
+    print(f"{'runner':<10}{'seconds':>10}{'MB/s':>10}")
+    print(f"{'engine':<10}{engine:>10.3f}{arguments.size_mb / engine:>10.1f}")
+    print(f"{'sh':<10}{shell:>10.3f}{arguments.size_mb / shell:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark for '>' output redirection with large outputs.
+
+It compares three strategies on a command that writes '--size-mb' megabytes:
+    capture: the previous behaviour, the whole output is captured in memory then written.
+    direct:  the child is handed the file descriptor ('ComputeOperations.write_command_output').
+    tee:     the output is copied through the fixed size buffer to the file and the terminal.
+
+Every strategy runs in a fresh interpreter so its peak memory can be measured.
+
+Usage:
+    python benchmarks/redirect_benchmark.py --size-mb 1024
+"""
+
+from time import perf_counter
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compute import ComputeOperations  # pylint: disable=wrong-import-position
+
+
+STRATEGIES = ["capture", "direct", "tee"]
+
+
+def generator_command(size_mb: int) -> list[str]:
+    """
+    Returns a command writing 'size_mb' megabytes of text to stdout.
+    """
+    script = (
+        "import sys\n"
+        "chunk = b'x' * 1048575 + b'\\n'\n"
+        f"for _ in range({size_mb}):\n"
+        "    sys.stdout.buffer.write(chunk)\n"
+    )
+    return [sys.executable, "-c", script]
+
+
+def run_strategy(strategy: str, size_mb: int, file_path: str) -> dict:
+    """
+    Redirects the output of the generator to the file with one strategy.
+
+    Returns:
+        dict: The throughput and the peak memory of the run.
+    """
+    command = generator_command(size_mb)
+    start = perf_counter()
+
+    with open(file_path, "wb") as output:
+        if strategy == "capture":
+            result = subprocess.run(command, capture_output=True, check=True)
+            output.write(result.stdout)
+        elif strategy == "direct":
+            ComputeOperations.write_command_output(command, output)
+        else:
+            with open(os.devnull, "w", encoding="utf-8") as terminal:
+                sys.stdout = terminal
+                try:
+                    ComputeOperations.write_command_output(command, output, echo=True)
+                finally:
+                    sys.stdout = sys.__stdout__
+
+    elapsed = perf_counter() - start
+    return {
+        "strategy": strategy,
+        "size_mb": size_mb,
+        "seconds": round(elapsed, 3),
+        "mb_per_second": round(size_mb / elapsed, 1),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def main():
+    """
+    Runs every strategy in its own interpreter and prints a table of the results.
+    """
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--size-mb", type=int, default=256)
+    parser.add_argument("--strategy", choices=STRATEGIES, help=argparse.SUPPRESS)
+    arguments = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, "output.txt")
+
+        if arguments.strategy:
+            print(json.dumps(run_strategy(arguments.strategy, arguments.size_mb, file_path)))
+            return
+
+        print(f"{'strategy':<10}{'seconds':>10}{'MB/s':>10}{'peak RSS MB':>14}")
+        for strategy in STRATEGIES:
+            completed = subprocess.run(
+                [
+                    sys.executable, __file__,
+                    "--strategy", strategy, "--size-mb", str(arguments.size_mb),
+                ],
+                capture_output=True, text=True, check=True
+            )
+            result = json.loads(completed.stdout)
+            print(
+                f"{strategy:<10}{result['seconds']:>10}"
+                f"{result['mb_per_second']:>10}{result['peak_rss_mb']:>14}"
+            )
+
+
+if __name__ == "__main__":
+    main()
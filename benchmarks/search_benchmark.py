@@ -0,0 +1,134 @@
+"""
+Benchmark of 'search' against a single-threaded Python scan.
+
+It writes '--files' log files of '--size-mb' megabytes in total, a few
+of them large enough to be cut into several ranges, with one line in
+'--match-every' matching the pattern. The baseline reads every file line
+by line and runs the compiled bytes regex on each line, as a Python
+script would. 'ContentSearch' is then run with every worker count of
+'--jobs', each result is checked against the baseline and the throughput
+of each is printed. The first search also starts the forkserver, it is
+run once before the timings.
+
+Usage:
+    python benchmarks/search_benchmark.py --size-mb 1024 --files 2000 --jobs 1 2 4 8
+"""
+
+from time import perf_counter
+import argparse
+import io
+import os
+import re
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from SyntaxShift.content_search import ContentSearch, SearchOptions
+
+
+PATTERN = r"connection (refused|reset) by [0-9.]+"
+LINE = b"2024-05-01 12:00:03.123 INFO request handled in 12 ms by worker %d for /api/v1/items\n"
+MATCH = b"2024-05-01 12:00:04.456 ERROR connection refused by 10.0.0.%d\n"
+
+
+def build_logs(root: str, files: int, size: int, match_every: int) -> None:
+    """
+    Writes the files, the first tenth of them holding half of the bytes.
+    """
+    large = max(1, files // 10)
+    for index in range(files):
+        share = size // 2 // large if index < large else size // 2 // max(1, files - large)
+        directory = os.path.join(root, f"d{index // 100:03d}")
+        os.makedirs(directory, exist_ok=True)
+        lines = []
+        written = 0
+        number = 0
+        while written < share:
+            number += 1
+            line = MATCH % (number % 256) if number % match_every == 0 else LINE % (number % 64)
+            lines.append(line)
+            written += len(line)
+        with open(os.path.join(directory, f"service{index:05d}.log"), "wb") as f:
+            f.write(b"".join(lines))
+
+
+def python_scan(root: str) -> list[str]:
+    """
+    The single-threaded baseline: every file read line by line.
+    """
+    regex = re.compile(PATTERN.encode())
+    found = []
+    for directory, _, names in os.walk(root):
+        for name in names:
+            path = os.path.join(directory, name)
+            with open(path, "rb") as f:
+                for number, line in enumerate(f, 1):
+                    if regex.search(line):
+                        text = line.rstrip(b"\n").decode(errors="replace")
+                        found.append(f"{path}:{number}:{text}")
+    return found
+
+
+def search(root: str, jobs: int) -> list[str]:
+    """
+    Returns:
+        list[str]: The lines written by the 'search' command with 'jobs' workers.
+    """
+    output = io.StringIO()
+    ContentSearch(PATTERN, root, SearchOptions(), jobs).run(output)
+    return output.getvalue().splitlines()
+
+
+def main():
+    """
+    Times a line by line Python scan, then the search with each number of jobs.
+    """
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--size-mb", type=int, default=512)
+    parser.add_argument("--files", type=int, default=1000)
+    parser.add_argument("--match-every", type=int, default=1000, help="one matching line in N")
+    parser.add_argument(
+        "--jobs", type=int, nargs="+", default=sorted({1, 2, 4, os.cpu_count() or 1})
+    )
+    parser.add_argument(
+        "--root", help="directory to write the logs in, a temporary directory by default"
+    )
+    arguments = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="search-benchmark-", dir=arguments.root)
+    size = arguments.size_mb * 1024 * 1024
+    try:
+        build_logs(root, arguments.files, size, arguments.match_every)
+        print(f"{arguments.files} files, {arguments.size_mb} MB under {root}")
+
+        start = perf_counter()
+        expected = sorted(python_scan(root))
+        baseline = perf_counter() - start
+        print(f"{'scan':>16}{'seconds':>10}{'MB/s':>10}{'speedup':>10}")
+        print(f"{'python, 1 thread':>16}{baseline:>10.2f}"
+              f"{arguments.size_mb / baseline:>10.0f}{1:>10.1f}")
+
+        # starts the forkserver
+        search(root, 1)
+        for jobs in arguments.jobs:
+            start = perf_counter()
+            found = search(root, jobs)
+            elapsed = perf_counter() - start
+            if sorted(found) != expected:
+                raise RuntimeError(
+                    f"search with {jobs} workers found {len(found)} lines, "
+                    f"expected {len(expected)}"
+                )
+            print(f"{f'search, {jobs} jobs':>16}{elapsed:>10.2f}"
+                  f"{arguments.size_mb / elapsed:>10.0f}{baseline / elapsed:>10.1f}")
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
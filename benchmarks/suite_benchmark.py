@@ -0,0 +1,345 @@
+"""
+Benchmark suite of the parser, the validators and end-to-end execution.
+
+It runs offline, against fixtures it creates in a temporary directory:
+    parser:     'InputParser.retrieved_parsed_input' throughput, in commands per
+                second, on mixes of commands typed interactively, bulk commands
+                with wildcards and several files, and pipelines and redirections.
+    validators: the median and p95 latency of every validator class, each
+                command validated with a fresh stat snapshot as in the shell.
+    execute:    'ComputeOperations.execute_operation' on a directory of 1k, 100k
+                (and with '--sizes', 1M) files: a sorted listing, a 'find' with
+                a size filter, a bulk permission change, a bulk rename and the
+                removal of the tree.
+
+The results are written as JSON with '--output'. '--baseline' compares them to
+a previous results file and flags every result more than '--threshold' worse,
+the exit status is then 1. Keep a baseline per machine, the numbers of two
+machines are not comparable.
+
+Usage:
+    python benchmarks/suite_benchmark.py --output baseline.json
+    python benchmarks/suite_benchmark.py --baseline baseline.json --threshold 0.1
+    python benchmarks/suite_benchmark.py --only execute --sizes 1000 100000 1000000
+"""
+
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from statistics import median
+from time import perf_counter, perf_counter_ns
+from typing import Dict, Iterator, List
+import argparse
+import json
+import logging
+import os
+import platform
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from compute import ComputeOperations
+from input_parser import InputParser
+from main import get_platform
+from validator.command_registry import COMMANDS
+from validator.piped_command import PipedCommandValidator
+from validator.redirect_validator import RedirectValidator
+from validator.stat_snapshot import begin_snapshot
+from validator.static.constant_types import ExecutionMode
+
+
+SUITES = ["parser", "validators", "execute"]
+
+# the commands are valid in the fixture built by 'build_fixture' and change nothing
+COMMAND_MIXES: Dict[str, List[str]] = {
+    "interactive": [
+        "pwd", "list .", "list docs --sort mtime", "help delete", "create notes.txt",
+        "delete a.txt", "rename a.txt z.txt", "change docs", "make build", "jobs",
+    ],
+    "bulk": [
+        "create n1.txt n2.txt n3.txt n4.txt", "delete *.csv", "delete a.txt b.txt c.txt",
+        "rename *.txt .csv", "rename a.txt x.txt b.txt y.txt", "copy *.txt docs",
+        "modify *.txt add r w", "list . --sort size --ext .txt --limit 10",
+    ],
+    "pipelines": [
+        "list . | modify a.txt add r", "delete *.txt | list .", "list . > out.txt",
+        "create report.txt | list docs", "list docs --sort size > sizes.txt",
+    ],
+}
+
+# sample commands of every validator class, pipes and redirections have their own validators
+VALIDATOR_SAMPLES: List[str] = [
+    command for mix in COMMAND_MIXES.values() for command in mix
+] + ["make a/b/c --parents", "remove docs", "help search file", "wait %1", "kill 1",
+       "stats export m.json", "watch docs --recursive",
+       "find docs --name 'doc1*' --ext .txt --size -1k",
+       "search 'error|warn' docs --ignore-case", "usage docs --top 5 --depth 2",
+       "dupes docs --ext .txt --min-size 1k"]
+
+FIXTURE_FILES = ["a.txt", "b.txt", "c.txt", "d.csv", "e.csv"]
+
+
+def build_fixture(root: str) -> None:
+    """
+    Creates the files and the 'docs' directory the validator samples refer to.
+    """
+    for name in FIXTURE_FILES:
+        with open(os.path.join(root, name), "w", encoding="utf-8"):
+            pass
+    os.makedirs(os.path.join(root, "docs"))
+    for index in range(20):
+        with open(os.path.join(root, "docs", f"doc{index:02d}.txt"), "w", encoding="utf-8"):
+            pass
+
+
+def build_flat_tree(directory: str, files: int) -> None:
+    """
+    Creates a directory holding 'files' empty files.
+    """
+    os.makedirs(directory)
+    for index in range(files):
+        path = os.path.join(directory, f"f{index:07d}.txt")
+        os.close(os.open(path, os.O_CREAT | os.O_WRONLY, 0o644))
+
+
+@contextmanager
+def working_directory(path: str) -> Iterator[None]:
+    """
+    Runs the block with 'path' as the working directory.
+    """
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+@contextmanager
+def silenced_stdout() -> Iterator[None]:
+    """
+    Sends the output of the commands to the null device at the descriptor level,
+    the listing engine writes to the original 'sys.stdout' object.
+    """
+    sys.stdout.flush()
+    saved = os.dup(1)
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    try:
+        yield
+    finally:
+        sys.stdout.flush()
+        os.dup2(saved, 1)
+        os.close(saved)
+        os.close(devnull)
+
+
+def result(value: float, unit: str, higher_is_better: bool) -> Dict:
+    """
+    Returns one result as it is written to the JSON file.
+    """
+    return {"value": value, "unit": unit, "higher_is_better": higher_is_better}
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """
+    Returns the sample below which 'fraction' of the samples fall.
+    """
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def bench_parser(rounds: int) -> Dict[str, Dict]:
+    """
+    Measures the throughput of 'InputParser' over every command mix.
+    """
+    results = {}
+    for mix, commands in COMMAND_MIXES.items():
+        # one warm-up round, it imports the validators and handlers
+        for command in commands:
+            InputParser(command).retrieved_parsed_input()
+
+        start = perf_counter()
+        for _ in range(rounds):
+            for command in commands:
+                InputParser(command).retrieved_parsed_input()
+        elapsed = perf_counter() - start
+        results[f"parser.{mix}"] = result(rounds * len(commands) / elapsed, "commands/s", True)
+    return results
+
+
+def validator_of(parsed_inputs: List[str]):
+    """
+    Returns the validation the shell runs on a parsed command, and the name of its
+    validator class.
+    """
+    if "|" in parsed_inputs:
+        return PipedCommandValidator.__name__, PipedCommandValidator(parsed_inputs).validate
+    if ">" in parsed_inputs or "<" in parsed_inputs:
+        return RedirectValidator.__name__, RedirectValidator(parsed_inputs).validate
+    spec = COMMANDS.get(parsed_inputs[0])
+    return spec.validator.__name__, lambda: spec.validate(parsed_inputs)
+
+
+def bench_validators(rounds: int) -> Dict[str, Dict]:
+    """
+    Measures the median and p95 latency of each validator, each round on a fresh snapshot.
+    """
+    samples: Dict[str, List[float]] = {}
+    for command in VALIDATOR_SAMPLES:
+        parsed_inputs = InputParser(command).split_and_lowercase_user_input()
+        name, validate = validator_of(parsed_inputs)
+        latencies = samples.setdefault(name, [])
+        for _ in range(rounds):
+            begin_snapshot()
+            start = perf_counter_ns()
+            validate()
+            latencies.append((perf_counter_ns() - start) / 1000)
+
+    results = {}
+    for name, latencies in sorted(samples.items()):
+        results[f"validator.{name}.median"] = result(median(latencies), "us", False)
+        results[f"validator.{name}.p95"] = result(percentile(latencies, 0.95), "us", False)
+    return results
+
+
+def execute(command: str, arguments: argparse.Namespace) -> float:
+    """
+    Parses and validates the command, then returns the seconds 'execute_operation' took.
+    """
+    parsed_inputs = InputParser(command).retrieved_parsed_input()
+    compute = ComputeOperations(
+        parsed_inputs, get_platform(), arguments.backend, jobs=arguments.jobs
+    )
+    with silenced_stdout():
+        start = perf_counter()
+        compute.execute_operation()
+        return perf_counter() - start
+
+
+def bench_execute(sizes: List[int], arguments: argparse.Namespace, root: str) -> Dict[str, Dict]:
+    """
+    Measures the throughput of the file system commands over flat trees of each size.
+    """
+    results = {}
+    for size in sizes:
+        tree = os.path.join(root, f"tree{size}")
+        build_flat_tree(tree, size)
+        timings = {
+            "list": execute(f"list {tree} --sort size --limit 10", arguments),
+            "find": execute(f"find {tree} --ext .txt --size -1k", arguments),
+        }
+        with working_directory(tree):
+            timings["modify"] = execute("modify *.txt add x", arguments)
+            timings["rename"] = execute("rename *.txt .csv", arguments)
+        timings["remove"] = execute(f"remove {tree}", arguments)
+
+        for operation, elapsed in timings.items():
+            results[f"execute.{operation}.{size}"] = result(size / elapsed, "files/s", True)
+    return results
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float) -> List[str]:
+    """
+    Prints every result next to its baseline.
+
+    Returns:
+        List[str]: The names of the results more than 'threshold' worse than the baseline.
+    """
+    regressions = []
+    print(f"{'benchmark':<48}{'baseline':>14}{'current':>14}{'change':>10}")
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None or not previous["value"]:
+            print(f"{name:<48}{'-':>14}{current['value']:>14.2f}{'new':>10}")
+            continue
+
+        change = (current["value"] - previous["value"]) / previous["value"]
+        worse = -change if current["higher_is_better"] else change
+        flag = ""
+        if worse > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<48}{previous['value']:>14.2f}{current['value']:>14.2f}"
+              f"{change:>+10.1%}{flag}")
+    return regressions
+
+
+def main():
+    """
+    Runs the selected suites, then prints or compares the results.
+    """
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--only", nargs="+", choices=SUITES, default=SUITES)
+    parser.add_argument(
+        "--rounds", type=int, default=200, help="rounds of each command mix and validator sample"
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000])
+    parser.add_argument(
+        "--backend", type=ExecutionMode, choices=list(ExecutionMode), default=ExecutionMode.BUILTIN
+    )
+    parser.add_argument("--jobs", type=int, default=1)
+    parser.add_argument(
+        "--root", help="directory to build the fixtures in, a temporary directory by default"
+    )
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare the results to this JSON file")
+    parser.add_argument(
+        "--threshold", type=float, default=0.10, help="relative slowdown flagged as a regression"
+    )
+    arguments = parser.parse_args()
+
+    # the shell logs every validated file at INFO on stderr, which would dominate the timings
+    logging.disable(logging.INFO)
+
+    root = tempfile.mkdtemp(prefix="suite-benchmark-", dir=arguments.root)
+    results: Dict[str, Dict] = {}
+    try:
+        fixture = os.path.join(root, "fixture")
+        os.makedirs(fixture)
+        build_fixture(fixture)
+        with working_directory(fixture):
+            if "parser" in arguments.only:
+                results.update(bench_parser(arguments.rounds))
+            if "validators" in arguments.only:
+                results.update(bench_validators(arguments.rounds))
+        if "execute" in arguments.only:
+            results.update(bench_execute(arguments.sizes, arguments, root))
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    if arguments.output:
+        with open(arguments.output, "w", encoding="utf-8") as f:
+            json.dump({
+                "metadata": {
+                    "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "cpus": os.cpu_count(),
+                    "backend": str(arguments.backend),
+                    "jobs": arguments.jobs,
+                },
+                "results": results,
+            }, f, indent=2)
+
+    if not arguments.baseline:
+        print(f"{'benchmark':<48}{'value':>14}  unit")
+        for name, current in results.items():
+            print(f"{name:<48}{current['value']:>14.2f}  {current['unit']}")
+        return
+
+    with open(arguments.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    regressions = compare(results, baseline, arguments.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) above {arguments.threshold:.0%}: "
+              f"{', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""
+This module provides the persistent command history of the interactive shell.
+
+Every command typed at the prompt is appended to the history file, one
+command per line, the file is never rewritten so several shells can share
+it. The whole file is held in memory as a single string with a leading
+newline, indexed by the offset of the start of every line:
+
+    - a substring search is a reverse 'str.rfind' from the end of the string,
+      so it runs at C speed, returns the newest matches first and stops as
+      soon as enough commands are found, even over a million entries.
+    - a prefix search is a substring search of the prefix preceded by the
+      newline that starts every entry.
+    - the number of the entry of a match is found by bisecting the offsets.
+
+Loading the file does not delay the first prompt: it is read and indexed by
+a background thread, a search waits for it only if it is not done yet. Only
+the last 'READLINE_ENTRIES' commands, read from the end of the file, are
+given to readline before the first prompt for Up/Down and Ctrl-R. Where
+the readline module is not available (Windows) the prompt has no line
+editing, the 'history' builtin still works.
+"""
+
+from array import array
+from bisect import bisect_right
+from threading import Event, Thread
+from typing import List, Tuple
+import os
+
+
+# commands given to readline at startup, its own history is a linear list
+READLINE_ENTRIES = 1000
+# bytes read from the end of the file to find them
+TAIL_BYTES = 256 * 1024
+
+
+class CommandHistory:
+    """
+    The commands typed in every session, oldest first, numbered from 1.
+
+    Attributes:
+        path (str): The history file.
+        session (List[str]): The commands typed in this session.
+    """
+
+    def __init__(self, path: str):
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self.session: List[str] = []
+        self._text = "\n"
+        self._offsets = array("Q")
+        self._loaded = Event()
+        self._file = None
+        self._readline = None
+
+    def enable_line_editing(self) -> bool:
+        """
+        Makes 'input' use readline, seeded with the end of the history.
+
+        Returns:
+            bool: False when readline is not available on this platform.
+        """
+        try:
+            import readline  # pylint: disable=import-outside-toplevel
+        except ImportError:
+            return False
+
+        # the commands are added by 'append', without the repeats
+        readline.set_auto_history(False)
+        for command in self.tail():
+            readline.add_history(command)
+        self._readline = readline
+        return True
+
+    def start_loading(self) -> None:
+        """
+        Reads and indexes the history file in a background thread.
+        """
+        try:
+            # the commands appended from now on are in 'session', not read again from the file
+            size = os.path.getsize(self.path)
+        except OSError:
+            size = 0
+        Thread(target=self.load, args=(size,), name="history-loader", daemon=True).start()
+
+    def load(self, size: int) -> None:
+        """
+        Run by the loader thread: reads the first 'size' bytes of the file and
+        indexes the offset of every line.
+        """
+        try:
+            with open(self.path, "rb") as f:
+                text = f.read(size).decode("utf-8", errors="replace")
+            if text and not text.endswith("\n"):
+                # a line cut short by a crash, keep it as a complete entry
+                text += "\n"
+            text = "\n" + text
+
+            offsets = array("Q")
+            position = 0
+            while position != len(text) - 1:
+                offsets.append(position + 1)
+                position = text.find("\n", position + 1)
+            self._text, self._offsets = text, offsets
+        except FileNotFoundError:
+            pass
+        finally:
+            self._loaded.set()
+
+    def wait(self) -> None:
+        """
+        Blocks until the history file has been loaded.
+        """
+        self._loaded.wait()
+
+    def tail(self, count: int = READLINE_ENTRIES) -> List[str]:
+        """
+        Returns the last 'count' commands of the file, read from its end
+        without loading the whole file.
+        """
+        try:
+            with open(self.path, "rb") as f:
+                size = f.seek(0, os.SEEK_END)
+                f.seek(max(0, size - TAIL_BYTES))
+                data = f.read().decode("utf-8", errors="replace")
+        except FileNotFoundError:
+            return []
+
+        lines = data.splitlines()
+        if len(data.encode("utf-8")) < size and lines:
+            # the first line read is most likely the end of a longer one
+            lines = lines[1:]
+        return lines[-count:]
+
+    def append(self, command: str) -> bool:
+        """
+        Records a command typed at the prompt, unless it repeats the previous one.
+
+        Returns:
+            bool: Whether the command was recorded.
+        """
+        command = command.replace("\n", " ").strip()
+        if not command or (self.session and self.session[-1] == command):
+            return False
+
+        self.session.append(command)
+        if self._readline is not None:
+            self._readline.add_history(command)
+        try:
+            if self._file is None:
+                # kept open for the session, closed by 'close'
+                self._file = open(self.path, "a", encoding="utf-8")  # pylint: disable=consider-using-with
+            self._file.write(command + "\n")
+            self._file.flush()
+        except OSError:
+            # the history is a convenience, never fail the command for it
+            self._file = None
+        return True
+
+    def close(self) -> None:
+        """
+        Closes the history file, the session commands are already written.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __len__(self) -> int:
+        self.wait()
+        return len(self._offsets) + len(self.session)
+
+    def entry(self, offset: int) -> Tuple[int, str]:
+        """
+        Returns the number and the command of the entry of the file starting at
+        or containing 'offset'.
+        """
+        index = bisect_right(self._offsets, offset) - 1
+        start = self._offsets[index]
+        return index + 1, self._text[start:self._text.index("\n", start)]
+
+    def last(self, count: int) -> List[Tuple[int, str]]:
+        """
+        Returns the last 'count' entries, oldest first.
+        """
+        self.wait()
+        stored = len(self._offsets)
+        entries = [(stored + index + 1, command) for index, command in enumerate(self.session)]
+        entries = entries[-count:]
+        missing = count - len(entries)
+        if missing > 0:
+            entries = [self.entry(self._offsets[index])
+                       for index in range(max(0, stored - missing), stored)] + entries
+        return entries
+
+    def search(self, text: str, limit: int = 20, prefix: bool = False) -> List[Tuple[int, str]]:
+        """
+        Returns the newest entries containing 'text', or starting with it when
+        'prefix' is set, newest first. A command found several times is only
+        returned once, with its latest number.
+        """
+        self.wait()
+        found: List[Tuple[int, str]] = []
+        seen = set()
+
+        stored = len(self._offsets)
+        for index in range(len(self.session) - 1, -1, -1):
+            command = self.session[index]
+            matched = command.startswith(text) if prefix else text in command
+            if matched and command not in seen:
+                seen.add(command)
+                found.append((stored + index + 1, command))
+                if len(found) >= limit:
+                    return found
+
+        # a prefix match starts at the newline ending the previous entry
+        needle = "\n" + text if prefix else text
+        end = len(self._text)
+        while (position := self._text.rfind(needle, 0, end)) != -1:
+            number, command = self.entry(position + 1 if prefix else position)
+            if command not in seen:
+                seen.add(command)
+                found.append((number, command))
+                if len(found) >= limit:
+                    break
+            # go on with the entries before this one
+            end = position + len(needle) - 1 if prefix else self._offsets[number - 1] - 1
+        return found
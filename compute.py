@@ -9,26 +9,45 @@ the program also check if operation requested is 'delete or rename'
 operation, if:
 delete then it checks if the file exists first before deleting any file,
 rename: it also checks if the file already exists before doing rename operation
+
+The handlers are looked up in the command registry and imported the first
+time their command runs, so starting the shell does not import them all.
 """
 
-from time import sleep
-from typing import List
+from datetime import datetime
+from functools import cached_property
+from threading import Event
+from typing import TYPE_CHECKING, BinaryIO, List, TextIO
+import signal
 import subprocess
+import sys
 import os
 
-from SyntaxShift.redirect_handlier import RedirectHandler
-from SyntaxShift.file_access_handler import FileAccessHandler
-
-# from SyntaxShift.pipe_operation_handler import PipeCommandHandler
-from SyntaxShift.file_operation_handler import FileOperationHandler
-from SyntaxShift.directory_handler import DirectoryManagementHandler
+from validator.command_registry import COMMANDS, PIPE_HANDLER, REDIRECT_HANDLER, resolve
 from validator.static.constant_types import (
+    ExecutionMode,
     Platform,
     DirectoryOperation,
     FileOperation,
     FilePermission,
+    InspectionCommand,
     ConsoleColors,
+    WATCH_POLL_OPTIONS,
+    WATCH_RECURSIVE_OPTIONS,
 )
+from validator.static.exceptions import FileOperationError, InspectionError
+from phase_metrics import PHASE_METRICS, Phase, command_type
+
+if TYPE_CHECKING:
+    from SyntaxShift.content_search import ContentSearch
+    from SyntaxShift.directory_handler import DirectoryManagementHandler
+    from SyntaxShift.disk_usage import DiskUsage
+    from SyntaxShift.duplicate_finder import DuplicateFinder
+    from SyntaxShift.file_finder import FileFinder
+    from SyntaxShift.file_operation_handler import FileOperationHandler
+    from SyntaxShift.operation_executor import OperationExecutor
+
+    InspectionEngine = FileFinder | ContentSearch | DiskUsage | DuplicateFinder
 
 
 class ComputeOperations:
@@ -41,9 +60,34 @@ class ComputeOperations:
 
     """
 
-    def __init__(self, command_args: List[str], operating_system: Platform) -> None:
+    # size of the fixed buffer used to tee redirected output to the terminal
+    REDIRECT_BUFFER_SIZE = 64 * 1024
+
+    def __init__(self, command_args: List[str], operating_system: Platform,
+                 execution_mode: ExecutionMode = ExecutionMode.BUILTIN,
+                 echo_redirect: bool = False, jobs: int = 1) -> None:
         self.command_args = command_args
         self.platform = operating_system
+        self.execution_mode = execution_mode
+        self.echo_redirect = echo_redirect
+        self.jobs = jobs
+        # the label the phase metrics of the command are recorded under
+        self.metrics_label = command_type(command_args)
+
+    @cached_property
+    def executor(self) -> "OperationExecutor":
+        """
+        The backend running file and permission operations, imported on first use.
+        """
+        from SyntaxShift.operation_executor import get_executor  # pylint: disable=import-outside-toplevel
+
+        return get_executor(self.execution_mode, self.platform)
+
+    def handler(self):
+        """
+        Returns the handler translating the command, from the command registry.
+        """
+        return COMMANDS.get(self.command_args[0]).handler(self.command_args, self.platform)
 
     @staticmethod
     def open_file_or_folder(operating_system: Platform, path_name: str):
@@ -62,7 +106,7 @@ class ComputeOperations:
 
     def execute_operation(self) -> None:
         if "|" in self.command_args:
-            pass
+            self.execute_pipeline()
 
         # elif "<" in self.command_args:
         #     self.redirect_input()
@@ -74,86 +118,422 @@ class ComputeOperations:
 
     def execute_single_command(self):
         command = self.command_args[0]
-        operation = None
-        if command in DirectoryOperation:
-            if command == "change":
-                # Change directory in the parent process
-                os.chdir(self.command_args[1])
-            directory_hadlier = DirectoryManagementHandler(
-                self.command_args, self.platform
+        if command == DirectoryOperation.CHANGE:
+            # Change directory in the parent process, a child 'cd' would not affect the shell
+            os.chdir(self.command_args[1])
+            return
+
+        start = PHASE_METRICS.clock()
+        operation = self.spawned_command()
+        if operation is None:
+            # builtin operations time the translation of their requests themselves
+            self.execute_builtin_command()
+            return
+        PHASE_METRICS.record(self.metrics_label, Phase.TRANSLATE, start)
+
+        completed = self.execute_command(operation, self.metrics_label)
+        if command == "pwd" or command == "list":
+            print(
+                f"\n{ConsoleColors.get('MAGENTA')}{completed}{ConsoleColors.get('RESET')}"
             )
-            operation = directory_hadlier.make_directory_command()
-            print(operation)
+
+    def spawned_command(self) -> List[str] | None:
+        """
+        Returns the platform command a single command is executed with, or None
+        when it is executed in-process: file operations, permissions, 'change'
+        (a child 'cd' would not change the directory of the shell) and, with
+        the builtin backend, list, make and remove.
+        """
+        command = self.command_args[0]
+        builtin = self.execution_mode == ExecutionMode.BUILTIN
+
+        if command == DirectoryOperation.CHANGE:
+            return None
+        if command == DirectoryOperation.CURRENT or (command in DirectoryOperation and not builtin):
+            return self.handler().make_directory_command()
+        if command == FilePermission.LIST and not builtin:
+            return self.handler().check_file_access()
+        return None
+
+    def execute_builtin_command(self):
+        """
+        Executes the command in-process instead of spawning its platform command.
+        """
+        command = self.command_args[0]
+
+        if command in DirectoryOperation:
+            with PHASE_METRICS.timer(self.metrics_label, Phase.EXECUTE):
+                self.execute_directory_operation(self.handler())
 
         elif command in FileOperation:
-            file_operation = FileOperationHandler(self.command_args, self.platform)
-            if command == "rename":
-                new_filename = input("Enter new filename: ")
-                operation = file_operation.check_file_operation(new_filename)
+            self.execute_file_operations(self.handler())
+
+        elif command == FilePermission.LIST:
+            with PHASE_METRICS.timer(self.metrics_label, Phase.EXECUTE):
+                self.list_directory()
+
+        elif command == FilePermission.MODIFY:
+            with PHASE_METRICS.timer(self.metrics_label, Phase.TRANSLATE):
+                requests = self.handler().check_permission_requests()
+            self.run_batch(command, *requests)
+
+        elif command in InspectionCommand:
+            self.execute_inspection()
+
+    def execute_directory_operation(self, directory_handler: "DirectoryManagementHandler"):
+        """
+        Makes or removes a directory in-process. A tree is removed by 'jobs'
+        worker threads, with its progress shown on the terminal while it runs.
+        """
+        if self.command_args[0] == DirectoryOperation.MAKE:
+            directory_handler.make_directory()
+            return
+
+        progress = directory_handler.remove_directory(
+            self.jobs, sys.stderr if sys.stderr.isatty() else None
+        )
+        if progress.files or progress.directories > 1:
+            print(progress)
+
+    def execute_file_operations(self, file_operation: "FileOperationHandler"):
+        """
+        Runs a file operation on every file given or matched by a wildcard, in-process.
+        Failures do not stop the batch, they are all reported in one summary.
+
+        Raises:
+            FileOperationError: With the summary of the batch when any file failed.
+        """
+        with PHASE_METRICS.timer(self.metrics_label, Phase.TRANSLATE):
+            requests = file_operation.check_file_operations()
+        self.run_batch(self.command_args[0], *requests)
+
+    def run_batch(self, operation: str, requests: list, failures: List[str]):
+        """
+        Runs the requests of a bulk operation on 'jobs' worker threads.
+
+        Raises:
+            FileOperationError: With the summary of the batch when any file failed.
+        """
+        with PHASE_METRICS.timer(self.metrics_label, Phase.EXECUTE):
+            summary = self.executor.execute_batch(operation, requests, failures, self.jobs)
+
+        if summary.failures:
+            raise FileOperationError(str(summary))
+        if summary.succeeded > 1:
+            print(summary)
+
+    def list_directory(self, output: TextIO | None = None):
+        """
+        Streams the listing of the path with the builtin listing engine
+        instead of capturing the output of 'ls -al' / 'dir'.
+        When no output is given the listing is printed to the terminal.
+        """
+        from SyntaxShift.listing_engine import ListingEngine, ListOptions  # pylint: disable=import-outside-toplevel
+
+        options = ListOptions.from_arguments(self.command_args[2:])
+        engine = ListingEngine(self.command_args[1], options)
+
+        if output is not None:
+            engine.stream(output)
+            return
+
+        print(ConsoleColors.get('MAGENTA'), end="")
+        try:
+            engine.stream()
+        finally:
+            print(ConsoleColors.get('RESET'), end="")
+
+    def execute_inspection(self, stop: Event | None = None, output: TextIO | None = None):
+        """
+        Runs 'watch', 'find', 'search', 'usage' or 'dupes' until it is done or 'stop' is set.
+        The results of the commands other than 'watch' are written to the output when one is given.
+        """
+        if self.command_args[0] == InspectionCommand.WATCH:
+            self.watch_directory(stop)
+        elif self.command_args[0] == InspectionCommand.FIND:
+            self.find_files(stop, output)
+        elif self.command_args[0] == InspectionCommand.SEARCH:
+            self.search_files(stop, output)
+        elif self.command_args[0] == InspectionCommand.USAGE:
+            self.disk_usage(stop, output)
+        else:
+            self.find_duplicates(stop, output)
+
+    def run_engine(self, engine: "InspectionEngine", stop: Event | None, output: TextIO | None,
+                   color: str = "MAGENTA") -> None:
+        """
+        Runs the engine of an inspection command, timed as its execution. Its
+        results are written to the output, or to the terminal in the color,
+        and its summary is printed unless it was stopped.
+        """
+        with PHASE_METRICS.timer(self.metrics_label, Phase.EXECUTE):
+            if output is not None:
+                summary = engine.run(output, stop)
             else:
-                operation = file_operation.check_file_operation()
+                print(ConsoleColors.get(color), end="")
+                try:
+                    summary = engine.run(sys.stdout, stop)
+                finally:
+                    print(ConsoleColors.get('RESET'), end="")
+        if not summary.stopped:
+            # the shell reports the interruption itself
+            print(summary)
 
-        elif command in FilePermission:
-            file_permission = FileAccessHandler(self.command_args, self.platform)
-            operation = file_permission.check_file_access()
+    def find_files(self, stop: Event | None = None, output: TextIO | None = None):
+        """
+        Streams the files of the tree passing the filters of 'find', read by
+        'jobs' worker threads, or by 'FileFinder.DEFAULT_JOBS' with the default of 1.
+        """
+        from SyntaxShift.file_finder import FileFinder, FindOptions  # pylint: disable=import-outside-toplevel
 
-        completed = self.execute_command(operation)
-        if command == "pwd" or command == "list":
-            print(
-                f"\n{ConsoleColors.get('MAGENTA')}{completed}{ConsoleColors.get('RESET')}"
+        finder = FileFinder(
+            self.command_args[1], FindOptions.from_arguments(self.command_args[2:]), self.jobs
+        )
+        self.run_engine(finder, stop, output)
+
+    def search_files(self, stop: Event | None = None, output: TextIO | None = None):
+        """
+        Streams the lines matching the pattern of 'search', found by 'jobs'
+        worker processes, or by one per CPU with the default of 1.
+        """
+        from SyntaxShift.content_search import ContentSearch, SearchOptions  # pylint: disable=import-outside-toplevel
+
+        search = ContentSearch(
+            self.command_args[1], self.command_args[2],
+            SearchOptions.from_arguments(self.command_args[3:]), self.jobs,
+        )
+        self.run_engine(search, stop, output)
+
+    def disk_usage(self, stop: Event | None = None, output: TextIO | None = None):
+        """
+        Prints the space taken by the subdirectories of 'usage', read by
+        'jobs' worker threads, or by 'FileFinder.DEFAULT_JOBS' with the default of 1.
+        The directories unchanged since the last run are not read again.
+        """
+        from SyntaxShift.disk_usage import DiskUsage, UsageOptions  # pylint: disable=import-outside-toplevel
+
+        usage = DiskUsage(
+            self.command_args[1], UsageOptions.from_arguments(self.command_args[2:]), self.jobs
+        )
+        self.run_engine(usage, stop, output)
+
+    def find_duplicates(self, stop: Event | None = None, output: TextIO | None = None):
+        """
+        Prints the groups of files of 'dupes' with the same contents as 'delete'
+        commands, hashed by 'jobs' worker processes, or by one per CPU with the default of 1.
+        """
+        from SyntaxShift.duplicate_finder import DuplicateFinder, DupesOptions  # pylint: disable=import-outside-toplevel
+
+        finder = DuplicateFinder(
+            self.command_args[1], DupesOptions.from_arguments(self.command_args[2:]), self.jobs
+        )
+        self.run_engine(finder, stop, output)
+
+    def watch_directory(self, stop: Event | None = None):
+        """
+        Prints the changes of the watched directory as they happen, until
+        'stop' is set or, without it, until the command is interrupted.
+        It is not timed by the phase metrics, it runs for as long as the user wants.
+        """
+        from SyntaxShift.directory_watcher import ChangeKind, open_watcher  # pylint: disable=import-outside-toplevel
+
+        colors = {
+            ChangeKind.CREATED: "CYAN",
+            ChangeKind.DELETED: "RED",
+            ChangeKind.MODIFIED: "MAGENTA",
+            ChangeKind.RENAMED: "BLUE",
+            ChangeKind.OVERFLOW: "RED",
+        }
+        options = self.command_args[2:]
+        try:
+            watcher = open_watcher(
+                self.command_args[1],
+                any(option in WATCH_RECURSIVE_OPTIONS for option in options),
+                any(option in WATCH_POLL_OPTIONS for option in options),
             )
+        except OSError as error:
+            raise InspectionError(f"Cannot watch {self.command_args[1]}: {error}") from error
+
+        with watcher:
+            print(f"Watching {watcher.root} with {watcher.backend}"
+                  f"{', subdirectories included' if watcher.recursive else ''}, Ctrl-C to stop",
+                  flush=True)
+            for events in watcher.batches(stop):
+                stamp = datetime.now().strftime("%H:%M:%S")
+                for event in events:
+                    print(f"{ConsoleColors.get(colors[event.kind])}{stamp} {event}"
+                          f"{ConsoleColors.get('RESET')}")
+                sys.stdout.flush()
 
-    # self.execute_piped_command(first_cmd, second_cmd)
+    def execute_pipeline(self):
+        """
+        Translates every stage of a piped command and runs them as one pipeline,
+        printing the exit status of the stages when any of them failed.
+        """
+        with PHASE_METRICS.timer(self.metrics_label, Phase.TRANSLATE):
+            commands = resolve(PIPE_HANDLER)(self.command_args).build_pipeline(self.platform)
+        statuses = self.execute_piped_command(commands)
+
+        if any(self.pipeline_statuses(statuses)):
+            for command, status in zip(commands, statuses):
+                print(
+                    f"{ConsoleColors.get('RED')}[{status}] {' '.join(command)}"
+                    f"{ConsoleColors.get('RESET')}"
+                )
 
     @staticmethod
-    def execute_piped_command(
-        first_command: List[str], second_command: List[str]
-    ) -> None:
-        with subprocess.Popen(first_command, stdout=subprocess.PIPE) as first_process:
-            with subprocess.Popen(
-                second_command, stdin=first_process.stdout, stdout=subprocess.PIPE
-            ) as piped_process:
-                if first_process.stdout:
-                    first_process.stdout.close()
-                output, _ = piped_process.communicate()
-                print(output.decode("utf-8"))
+    def pipeline_statuses(statuses: List[int]) -> List[int]:
+        """
+        Returns the exit status of every stage, a stage before the last one
+        killed by SIGPIPE counted as a success: as in a shell, it was still
+        writing when the stages after it were done reading.
+        """
+        sigpipe = getattr(signal, "SIGPIPE", None)
+        upstream = len(statuses) - 1
+        return [
+            0 if sigpipe is not None and status == -sigpipe and index < upstream else status
+            for index, status in enumerate(statuses)
+        ]
 
     @staticmethod
-    def execute_command(command: List[str]) -> str | None:
+    def execute_piped_command(commands: List[List[str]]) -> List[int]:
+        """
+        Starts every stage at once, connecting the stdout of each stage to the
+        stdin of the next with an OS pipe. The last stage writes straight to the
+        terminal so output shows as it is produced and is never buffered here.
+
+        Returns:
+            List[int]: The exit status of each stage, in pipeline order.
+        """
+        processes: List[subprocess.Popen] = []
+        previous_stdout = None
+        start = PHASE_METRICS.clock()
+
         try:
-            result = subprocess.run(
-                args=command, check=True, capture_output=True, text=True
-            )
+            for index, command in enumerate(commands):
+                last = index == len(commands) - 1
+                # the stages outlive the loop, they are waited for below
+                process = subprocess.Popen(  # pylint: disable=consider-using-with
+                    command, stdin=previous_stdout, stdout=None if last else subprocess.PIPE
+                )
+                if previous_stdout is not None:
+                    # only the next stage may hold the read end, so it sees EOF and SIGPIPE
+                    previous_stdout.close()
+                previous_stdout = process.stdout
+                processes.append(process)
+        except OSError:
+            if previous_stdout is not None:
+                previous_stdout.close()
+            for process in processes:
+                process.kill()
+                process.wait()
+            raise
+        PHASE_METRICS.record("pipeline", Phase.SPAWN, start)
+
+        with PHASE_METRICS.timer("pipeline", Phase.WAIT):
+            return [process.wait() for process in processes]
 
-            return result.stdout
+    @staticmethod
+    def execute_command(command: List[str], metrics_label: str = "command") -> str | None:
+        """
+        Runs the command and returns its output, the start of the child and
+        the wait for it are timed as separate phases.
+        """
+        with PHASE_METRICS.timer(metrics_label, Phase.SPAWN):
+            # the child outlives the spawn timer, 'communicate' below closes its pipes
+            process = subprocess.Popen(  # pylint: disable=consider-using-with
+                command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+            )
+        with PHASE_METRICS.timer(metrics_label, Phase.WAIT):
+            stdout, stderr = process.communicate()
 
-        except subprocess.CalledProcessError as e:
-            print(f"Error executing command: {e}")
-            print(f"Command output: {e.stdout}")
-            print(f"Command error output: {e.stderr}")
+        if process.returncode != 0:
+            error = subprocess.CalledProcessError(process.returncode, command)
+            print(f"Error executing command: {error}")
+            print(f"Command output: {stdout}")
+            print(f"Command error output: {stderr}")
             return None
+        return stdout
 
     def redirect_output(self):
         """
         Redirect command output to a file.
 
+        The output is never held in memory: builtin commands write straight
+        into the file and spawned commands are handed the file descriptor as
+        their stdout. When 'echo_redirect' is set the output is also teed to
+        the terminal through a buffer of 'REDIRECT_BUFFER_SIZE' bytes.
+
         Example:
-            redirect_output(['ls'], 'output.txt')
+            list . > output.txt
         """
 
-        redirect_commands = RedirectHandler(self.command_args, self.platform, ">")
-        command: List[str] = redirect_commands.check_redirect_operation()
-
         fix_index = self.command_args.index(">")
         file_path = self.command_args[fix_index + 1]
+        command_args = self.command_args[:fix_index]
+
+        builtin = self.execution_mode == ExecutionMode.BUILTIN
+        in_process = (*FileOperation, FilePermission.LIST)
+        if command_args[0] in InspectionCommand or (builtin and command_args[0] in in_process):
+            self.redirect_builtin_output(command_args, file_path)
+            return
+
+        with PHASE_METRICS.timer(self.metrics_label, Phase.TRANSLATE):
+            redirect_commands = resolve(REDIRECT_HANDLER)(self.command_args, self.platform, ">")
+            command: List[str] = redirect_commands.check_redirect_operation()
 
-        with open(file_path, "w") as f:
-            result = subprocess.run(command, capture_output=True, text=True)
+        with open(file_path, "wb") as f, PHASE_METRICS.timer(self.metrics_label, Phase.EXECUTE):
+            returncode = self.write_command_output(command, f, self.echo_redirect)
+
+        if returncode != 0:
+            print(f"Error executing command: {command} exited with status {returncode}")
+
+    def redirect_builtin_output(self, command_args: List[str], file_path: str):
+        """
+        Runs a builtin command with its output written to the file.
+        File operations print nothing, so the file is only truncated.
+        """
+        builtin = ComputeOperations(
+            command_args, self.platform, self.execution_mode, jobs=self.jobs
+        )
+
+        with open(file_path, "w", encoding="utf-8") as f:
+            if command_args[0] in InspectionCommand:
+                output = TeeWriter(f, sys.stdout) if self.echo_redirect else f
+                builtin.execute_inspection(output=output)
+                return
+            if command_args[0] != FilePermission.LIST:
+                builtin.execute_single_command()
+                return
+            with PHASE_METRICS.timer(builtin.metrics_label, Phase.EXECUTE):
+                builtin.list_directory(TeeWriter(f, sys.stdout) if self.echo_redirect else f)
+
+    @staticmethod
+    def write_command_output(command: List[str], output: BinaryIO, echo: bool = False) -> int:
+        """
+        Runs the command with its stdout going to the output file.
 
-            if result and result.returncode == 0:
-                f.write(result.stdout)
-                print(result.stdout)
-        sleep(5)
+        Without echo the child writes to the file descriptor directly and the
+        data never passes through this process, with echo it is copied to
+        both the file and the terminal one fixed size chunk at a time.
+
+        Returns:
+            int: The exit status of the command.
+        """
+        if not echo:
+            return subprocess.run(command, stdout=output, check=False).returncode
+
+        buffer = bytearray(ComputeOperations.REDIRECT_BUFFER_SIZE)
+        view = memoryview(buffer)
+        sys.stdout.flush()
+        terminal = sys.stdout.buffer
+
+        with subprocess.Popen(command, stdout=subprocess.PIPE, bufsize=0) as process:
+            while read := process.stdout.readinto(buffer):
+                output.write(view[:read])
+                terminal.write(view[:read])
+            terminal.flush()
+        return process.returncode
 
     def redirect_input(self):
         """
@@ -162,7 +542,7 @@ class ComputeOperations:
             redirect_input(['cat'], 'input.txt')
         """
 
-        redirect_commands = RedirectHandler(self.command_args, self.platform, "<")
+        redirect_commands = resolve(REDIRECT_HANDLER)(self.command_args, self.platform, "<")
         command = redirect_commands.check_redirect_operation()
 
         file_path = ""
@@ -176,3 +556,28 @@ class ComputeOperations:
             subprocess.run(
                 command + [f.read()], stdin=f, capture_output=True, text=True
             )
+
+
+class TeeWriter:
+    """
+    A minimal text stream that forwards every write to several streams,
+    used to echo the output of builtin commands while redirecting it.
+    """
+
+    def __init__(self, *streams: TextIO):
+        self.streams = streams
+
+    def write(self, text: str) -> int:
+        """
+        Writes the text to every stream.
+        """
+        for stream in self.streams:
+            stream.write(text)
+        return len(text)
+
+    def flush(self) -> None:
+        """
+        Flushes every stream.
+        """
+        for stream in self.streams:
+            stream.flush()
@@ -1,6 +1,20 @@
-from dataclasses import dataclass, field
-from typing import Dict
+"""
+This module holds the help system: the dataclasses the help details are
+serialized into and the process-wide help store.
+
+The store is loaded lazily on the first help request, kept for the rest of
+the session and only reloaded when the modification time of the json file
+changes. While loading, an inverted index from every word of the 'general'
+and 'info' entries to the commands they describe is built, which backs the
+'help search <terms>' command.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Set
 import json
+import os
+import re
+
 
 @dataclass
 class General:
@@ -13,12 +27,23 @@ class General:
     create: str
     delete: str
     rename: str
+    copy: str
     modify: str
     list:str
     change: str
     make: str
     remove: str
     pwd: str
+    jobs: str
+    wait: str
+    kill: str
+    stats: str
+    history: str
+    watch: str
+    find: str
+    search: str
+    usage: str
+    dupes: str
 
     def help_command(self, command: str) -> str:
         """
@@ -48,12 +73,23 @@ class Info:
     create: str
     delete: str
     rename: str
+    copy: str
     modify: str
     list: str
     change: str
     make: str
     remove: str
     pwd: str
+    jobs: str
+    wait: str
+    kill: str
+    stats: str
+    history: str
+    watch: str
+    find: str
+    search: str
+    usage: str
+    dupes: str
 
     def __str__(self) -> str:
         """
@@ -92,35 +128,47 @@ class Help:
 
 
 
+
+
+HELP_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "help.json")
+
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+
 class LoadHelp:
     """
         This class is used to load the details from the json file which contain all the
         details of the supported operation,
         and when the 'get_help' function is called it calls the 'load_help_data' function
         which gets the details from the json file then
-        it serializes that information into the 'Help' class and returns it
+        it serializes that information into the 'Help' class and caches it
+        together with the search index, until the file is modified,
         unless and error occurs then the raises a 'ValueError' in which is graciously
         caught then a formatted output is printed to the console in #FF0000|RED.
     """
-    def __init__(self,  filepath: str = "./help.json") -> None:
+    def __init__(self,  filepath: str = HELP_FILE) -> None:
         self._filepath = filepath
         self._help_data: Help | None = None
+        self._mtime: int | None = None
+        self._index: Dict[str, Set[str]] = {}
 
 
     def load_help_data(self) -> Dict:
-        with open(self._filepath, "r") as f:
+        with open(self._filepath, "r", encoding="utf-8") as f:
             return json.load(f)
 
     def get_help(self) -> Help | None:
-        help_data = {}
-        if not self._help_data:
+        mtime = os.stat(self._filepath).st_mtime_ns
+        if self._help_data is None or mtime != self._mtime:
             try:
                 data = self.load_help_data()
-                help_data = Help(**data)
-            except ValueError as e:
+                self._help_data = Help(**data)
+            except (ValueError, TypeError) as e:
                 print(f"\033[91mError loading help data: {e}\033[0m")
                 return None
-        return help_data
+            self._mtime = mtime
+            self._index = self.build_index(self._help_data)
+        return self._help_data
 
 
     def get_help_info(self, command = None):
@@ -129,3 +177,48 @@ class LoadHelp:
             return help_data.general.help_command(command)
         return help_data.info
 
+    @staticmethod
+    def build_index(help_data: Help) -> Dict[str, Set[str]]:
+        """
+            Builds the inverted index of the help details, mapping every word
+            found in the general or info entry of a command (and the command name)
+            to the set of commands whose entries contain it.
+        """
+        index: Dict[str, Set[str]] = {}
+        general = vars(help_data.general)
+
+        for command, info in vars(help_data.info).items():
+            text = f"{command} {general.get(command, '')} {info}".lower()
+            for word in WORD_PATTERN.findall(text):
+                index.setdefault(word, set()).add(command)
+        return index
+
+    def search(self, terms: List[str]) -> Dict[str, str]:
+        """
+            Full-text search over the help details, a command matches when its
+            entries contain every one of the terms.
+
+            :param terms: words to search for, compared case-insensitively.
+            :return: the info entry of every matching command, keyed by command.
+        """
+        help_data = self.get_help()
+        words = WORD_PATTERN.findall(" ".join(terms).lower())
+        if help_data is None or not words:
+            return {}
+
+        matches = set.intersection(*(self._index.get(word, set()) for word in words))
+        info = vars(help_data.info)
+        return {command: info[command] for command in info if command in matches}
+
+
+_help_store: LoadHelp | None = None
+
+
+def get_help_store() -> LoadHelp:
+    """
+        Returns the help store shared by the whole process, creating it on first use.
+    """
+    global _help_store  # pylint: disable=global-statement
+    if _help_store is None:
+        _help_store = LoadHelp()
+    return _help_store
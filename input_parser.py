@@ -14,6 +14,9 @@
 
     If all operations are valid, the module returns the parsed list of words. Otherwise,
     it raises an `InvalidCommand` exception.
+
+    A trailing '&' asks for the command to run as a background job, it is removed
+    before validation and recorded in 'background'.
 """
 
 
@@ -21,21 +24,23 @@
 import shlex
 from typing import List
 
-from validator.redirect_validator import RedirectValidator
-
-from validator.directory_management_validator import DirectoryManagementValidator
-from validator.file_operation_validator import FileOperationValidator
-from validator.file_access_validator import FileAccessValidator
-from validator.piped_command import PipedCommandValidator
+from validator.command_registry import COMMANDS, PIPE_VALIDATOR, REDIRECT_VALIDATOR, resolve
 from validator.static.exceptions import InvalidCommand
-from validator.help_validator import HelpValidator
-from validator.validator import Validator
+from validator.stat_snapshot import begin_snapshot
+from phase_metrics import PHASE_METRICS, Phase, command_type
 
 class InputParser:
+
+    BACKGROUND = "&"
+
     def __init__(self, user_input: str) -> None:
         self.user_input: str = user_input.strip()
-        self.valid = Validator()
+        self.background: bool = False
+        # every path the command touches is stat-ed once, shared by validation and execution
+        self.snapshot = begin_snapshot()
+        start = PHASE_METRICS.clock()
         self.parsed_inputs: List[str] = self.split_and_lowercase_user_input()
+        PHASE_METRICS.record(command_type(self.parsed_inputs), Phase.PARSE, start)
 
     def split_and_lowercase_user_input(self) -> List[str]:
         """
@@ -43,11 +48,18 @@ class InputParser:
             words and place each of them into a list[str], then after is runs
             through the list of words and check if it has valid commands which
             it then removes the command and adds the lowercase of that removed
-            command.
+            command, commands are looked up in the command registry.
             return: list of operations
         """
         input_list: List[str] = shlex.split(self.user_input)
-        return [command.lower() if command in self.valid.get_valid_operations() else command for command in input_list]
+        if input_list and input_list[-1].endswith(InputParser.BACKGROUND):
+            self.background = True
+            input_list[-1] = input_list[-1][:-len(InputParser.BACKGROUND)]
+            if not input_list[-1]:
+                input_list.pop()
+        return [
+            command.lower() if command.lower() in COMMANDS else command for command in input_list
+        ]
 
 
     def retrieved_parsed_input(self):
@@ -59,12 +71,38 @@ class InputParser:
             :return: list of operations
             :raise: InvalidCommand
         """
-        if self.is_parsed_input_valid():
+        with PHASE_METRICS.timer(command_type(self.parsed_inputs), Phase.VALIDATE):
+            valid = self.is_parsed_input_valid()
+        if valid:
             return self.parsed_inputs
 
         raise InvalidCommand(f"Invalid..! Command: '{self.user_input}' is not valid")
 
 
+    def retrieved_syntax(self) -> List[str]:
+        """
+            Checks only what does not depend on the file system: every command
+            of the input is registered and, outside pipes and redirections, given
+            a valid number of arguments. Scripts check this for every line before
+            running, and validate each line fully when it runs, once the lines
+            before it have changed the tree.
+            :return: list of operations
+            :raise: InvalidCommand
+        """
+        if not self.parsed_inputs:
+            raise InvalidCommand(f"Invalid..! Command: '{self.user_input}' is not valid")
+
+        # the first word and every word following a '|' name a command
+        words = self.parsed_inputs
+        names = words[:1] + [word for previous, word in zip(words, words[1:]) if previous == "|"]
+        if any(name not in COMMANDS for name in names):
+            raise InvalidCommand(f"Invalid..! Command: '{self.user_input}' is not valid")
+
+        if not any(symbol in self.parsed_inputs for symbol in ['|', '<', '>']):
+            COMMANDS.get(self.parsed_inputs[0]).check_arity(self.parsed_inputs)
+        return self.parsed_inputs
+
+
     def is_parsed_input_valid(self) -> bool:
         """
             Validates the parsed input from the user to ensure it
@@ -74,47 +112,25 @@ class InputParser:
             1. Confirms that the parsed input is not empty.
             2. Validates that the first word in the parsed
             input matches a valid operation.
-            3. If the operation is "help", checks if the input
-             requests general help or help for a specific valid command.
-            4. Ensures that other operations have the correct number of arguments.
-            5. For piped commands, it verifies that the right-hand
-            side of the pipe contains valid operations.
+            3. For piped commands, it verifies that every stage
+            of the pipe contains valid operations.
+            4. For redirected commands, it validates the command and the redirect file.
+            5. Otherwise it checks the number of arguments and dispatches to the
+            validator registered for the operation in the command registry.
             :return: True if the parsed input is valid, otherwise False.
         """
         if not self.parsed_inputs:
             return False
 
-        operation = self.parsed_inputs[0]
-        if operation not in self.valid.get_valid_operations():
+        command_spec = COMMANDS.get(self.parsed_inputs[0])
+        if command_spec is None:
             return False
 
-        elif "|" in self.parsed_inputs:
-            piped_commands = PipedCommandValidator(self.parsed_inputs)
-            return piped_commands.valid_piped_operations()
-
-
-        elif any(symbol in self.parsed_inputs for symbol in ['<', '>']):
-            return RedirectValidator(self.parsed_inputs).validate()
-
-        elif operation in ["modify", "list"]:
-            file_access_valid = FileAccessValidator(self.parsed_inputs)
-            return file_access_valid.validate()
-
-        elif operation == "help":
-            help_valid: HelpValidator = HelpValidator(self.parsed_inputs)
-            return help_valid.valid_help_input()
-
-        elif operation in ["create", "delete", "rename"]:
-                file_operation_valid = FileOperationValidator(self.parsed_inputs[1:])
-                return file_operation_valid.is_operation_valid()
-
-<<<<<<< HEAD
-        elif operation in ["change", "remove", "make", "pwd"]:
-            directory_valid = DirectoryManagementValidator(self.parsed_inputs)
-            return  directory_valid.validate()
-=======
-        return len(self.parsed_inputs) == 2 and self.parsed_inputs[1] in FileOperation
->>>>>>> origin/main
+        if "|" in self.parsed_inputs:
+            piped_commands = resolve(PIPE_VALIDATOR)(self.parsed_inputs)
+            return piped_commands.validate()
 
+        if any(symbol in self.parsed_inputs for symbol in ['<', '>']):
+            return resolve(REDIRECT_VALIDATOR)(self.parsed_inputs).validate()
 
-        return False
\ No newline at end of file
+        return command_spec.validate(self.parsed_inputs)
@@ -0,0 +1,283 @@
+"""
+This module runs commands as background jobs, started with a trailing '&'.
+
+Every job is a child shell running the single command ('main.py --command'),
+so a job never blocks the prompt, can be killed at any time, and its
+builtin operations run with their own working directory and state. The
+stdout and stderr of the child are read by a thread into a buffer of
+'OUTPUT_LIMIT' bytes that keeps the end of the output, so a job writing
+gigabytes only ever holds the last part in memory.
+
+The 'JobSupervisor' keeps the jobs of the session. Finished jobs are
+reported with their output the next time the prompt is shown, or by
+'wait'. The 'jobs', 'wait [id]' and 'kill id' builtins act on it.
+"""
+
+from dataclasses import dataclass, field
+from threading import Lock, Thread
+from time import monotonic
+from typing import Dict, List
+import os
+import signal
+import subprocess
+import sys
+
+from validator.static.constant_types import ConsoleColors, DirectoryOperation, JobControl
+from validator.static.exceptions import JobControlError
+
+
+MAIN_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+
+# commands that only make sense in the shell itself, not in a child shell
+FOREGROUND_ONLY = frozenset({DirectoryOperation.CHANGE, *JobControl, "stats", "history"})
+
+
+class OutputBuffer:
+    """
+    Holds the last 'limit' bytes written to it.
+
+    Attributes:
+        limit (int): The maximum number of bytes kept.
+        dropped (int): The number of bytes discarded from the start of the output.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.dropped = 0
+        self._data = bytearray()
+
+    def write(self, chunk: bytes) -> None:
+        """
+        Appends a chunk, dropping the start of the output past 'limit' bytes.
+        """
+        self._data += chunk
+        excess = len(self._data) - self.limit
+        if excess > 0:
+            del self._data[:excess]
+            self.dropped += excess
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def text(self) -> str:
+        """
+        Returns:
+            str: The kept output, with a note of how much was dropped.
+        """
+        text = self._data.decode(errors="replace")
+        if self.dropped:
+            text = f"... {self.dropped} bytes of earlier output dropped ...\n{text}"
+        return text
+
+
+@dataclass
+class Job:
+    """
+    A command running in the background.
+
+    Attributes:
+        job_id (int): The number of the job, shown in brackets.
+        command (str): The command line of the job, without the '&'.
+        process (subprocess.Popen): The child shell running the command.
+        output (OutputBuffer): The end of the combined stdout and stderr of the command.
+        started (float): The monotonic time the job started.
+        elapsed (float | None): How long the job ran, None while it runs.
+        killed (bool): Whether the job was stopped with 'kill'.
+        reader (Thread | None): The thread collecting the output of the job.
+    """
+    job_id: int
+    command: str
+    process: subprocess.Popen
+    output: OutputBuffer
+    started: float = field(default_factory=monotonic)
+    elapsed: float | None = None
+    killed: bool = False
+    reader: Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        """
+        Whether the job has not finished yet.
+        """
+        return self.elapsed is None
+
+    @property
+    def status(self) -> str:
+        """
+        The state shown by 'jobs': Running, Killed, Exit <code> or Done.
+        """
+        if self.running:
+            return "Running"
+        if self.killed:
+            return "Killed"
+        if self.process.returncode:
+            return f"Exit {self.process.returncode}"
+        return "Done"
+
+    def __str__(self) -> str:
+        elapsed = monotonic() - self.started if self.elapsed is None else self.elapsed
+        return f"[{self.job_id}] {self.status:<8} {elapsed:7.1f}s  {self.command}"
+
+
+class JobSupervisor:
+    """
+    Starts background jobs and keeps track of them until they are reported.
+
+    Attributes:
+        child_arguments (List[str]): The command line options the child shells are started with.
+        jobs (Dict[int, Job]): The jobs that are running or finished but not reported yet.
+    """
+
+    # bytes of output kept for every job
+    OUTPUT_LIMIT = 256 * 1024
+    READ_SIZE = 64 * 1024
+
+    def __init__(self, child_arguments: List[str] | None = None):
+        self.child_arguments = child_arguments or []
+        self.jobs: Dict[int, Job] = {}
+        self._next_id = 1
+        self._lock = Lock()
+
+    def start(self, parsed_input: List[str], command: str) -> Job:
+        """
+        Starts an already validated command as a background job.
+
+        Raises:
+            JobControlError: If the command cannot run in the background.
+        """
+        if parsed_input[0] in FOREGROUND_ONLY:
+            raise JobControlError(f"'{parsed_input[0]}' cannot run in the background")
+
+        # in its own session the job ignores the Ctrl-C of the prompt and can be killed with
+        # its children, the process outlives this call and is waited for by the reader thread
+        process = subprocess.Popen(  # pylint: disable=consider-using-with
+            [sys.executable, MAIN_SCRIPT, *self.child_arguments, "--command", command],
+            stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            start_new_session=os.name != "nt",
+        )
+        with self._lock:
+            job = Job(self._next_id, command, process, OutputBuffer(JobSupervisor.OUTPUT_LIMIT))
+            self._next_id += 1
+            self.jobs[job.job_id] = job
+
+        job.reader = Thread(target=self.collect, args=(job,), name=f"job-{job.job_id}", daemon=True)
+        job.reader.start()
+        return job
+
+    def collect(self, job: Job) -> None:
+        """
+        Reads the output of the job until it exits, run by the reader thread of every job.
+        """
+        with job.process.stdout:
+            while chunk := job.process.stdout.read1(JobSupervisor.READ_SIZE):
+                job.output.write(chunk)
+        job.process.wait()
+        job.elapsed = monotonic() - job.started
+
+    def get(self, job_id: int) -> Job:
+        """
+        Raises:
+            JobControlError: If there is no such job.
+        """
+        job = self.jobs.get(job_id)
+        if job is None:
+            raise JobControlError(f"No such job: {job_id}")
+        return job
+
+    def list_jobs(self) -> str:
+        """
+        Returns:
+            str: One line per job, for 'jobs'.
+        """
+        with self._lock:
+            return "\n".join(str(job) for job in self.jobs.values()) or "No jobs"
+
+    def select(self, job_id: int | None = None) -> List[Job]:
+        """
+        Returns:
+            List[Job]: The job with the id, or every job when no id is given.
+
+        Raises:
+            JobControlError: If there is no such job.
+        """
+        with self._lock:
+            return [self.get(job_id)] if job_id is not None else list(self.jobs.values())
+
+    def wait(self, job_id: int | None = None) -> List[Job]:
+        """
+        Blocks until the job, or every job when no id is given, has finished.
+
+        Returns:
+            List[Job]: The finished jobs, removed from the supervisor.
+        """
+        jobs = self.select(job_id)
+        for job in jobs:
+            job.reader.join()
+        return self.forget(jobs)
+
+    def kill(self, job_id: int) -> Job:
+        """
+        Stops a running job, the job is reported as killed once its shell has exited.
+
+        Raises:
+            JobControlError: If there is no such job or it has already finished.
+        """
+        job = self.get(job_id)
+        if not job.running:
+            raise JobControlError(f"Job {job_id} has already finished")
+
+        job.killed = True
+        if os.name == "nt":
+            job.process.terminate()
+            return job
+        try:
+            os.killpg(job.process.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+        return job
+
+    def finished(self) -> List[Job]:
+        """
+        Returns:
+            List[Job]: The jobs that finished since the last call, removed from the supervisor.
+        """
+        with self._lock:
+            done = [job for job in self.jobs.values() if not job.running]
+        return self.forget(done)
+
+    def forget(self, jobs: List[Job]) -> List[Job]:
+        """
+        Removes reported jobs from the supervisor and returns them.
+        """
+        with self._lock:
+            for job in jobs:
+                self.jobs.pop(job.job_id, None)
+        return jobs
+
+    def running(self) -> List[Job]:
+        """
+        Returns:
+            List[Job]: The jobs that have not finished yet.
+        """
+        with self._lock:
+            return [job for job in self.jobs.values() if job.running]
+
+    def shutdown(self) -> None:
+        """
+        Kills the jobs still running when the shell exits.
+        """
+        for job in self.running():
+            self.kill(job.job_id)
+        for job in self.jobs.values():
+            job.reader.join()
+
+
+def format_report(job: Job) -> str:
+    """
+    Returns:
+        str: The completion notice of the job followed by its output.
+    """
+    color = ConsoleColors.get("CYAN") if job.status == "Done" else ConsoleColors.get("RED")
+    notice = f"{color}{job}{ConsoleColors.get('RESET')}"
+    output = job.output.text().rstrip("\n")
+    return f"{notice}\n{output}" if output else notice
@@ -3,31 +3,63 @@ This module provides a command-line interface for executing various file and sys
 based on the user's platform (Windows, Linux, or macOS). It supports commands for clearing the\n
 screen, displaying help information, and performing file operations like creation and deletion.\n
 The main function continuously prompts for user input and processes commands until the user
-chooses to exit.
+chooses to exit, the prompt runs on an asyncio event loop so Ctrl-C cancels the running command
+instead of the shell.
+
+Only what the first prompt needs is imported at startup. The handlers and
+validators of the commands are imported the first time they are used,
+through the command registry, and asyncio only when the interactive shell
+starts, so '--command' and '--script' runs never load it.
 """
 
+from time import perf_counter
+
+# the imports below are timed for '--startup-report'
+STARTED = perf_counter()
+
+# pylint: disable=wrong-import-position
 from sys import platform
+from typing import TYPE_CHECKING
+import argparse
 import logging
 import os
-
-from validator.static.exceptions import CustomBaseException
+import shlex
+import sys
+
+from validator.static.exceptions import (
+    CustomBaseException,
+    HistoryError,
+    JobControlError,
+    MetricsError,
+)
 from validator.static.constant_types import ConsoleColors
+from validator.static.constant_types import ExecutionMode
+from validator.static.constant_types import JobControl
 from validator.static.constant_types import Platform
+from validator.static.constant_types import StatsAction
+from validator.job_control_validator import JobControlValidator
+from validator.history_validator import HistoryValidator
+from audit_log import INTERRUPTED_STATUS, AuditLog
+from command_history import CommandHistory
 from compute import ComputeOperations
-from help_loader import LoadHelp
+from help_loader import get_help_store
 from input_parser import InputParser
+from job_supervisor import JobSupervisor, format_report
+from phase_metrics import PHASE_METRICS
+from script_runner import ScriptRunner
+from tab_completion import Completer
+from validator.stat_snapshot import current_snapshot
 
+if TYPE_CHECKING:
+    from async_runner import AsyncCommandRunner
 
-logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)  # Adjust as needed
+IMPORTED = perf_counter()
 
-# Console handler
-console_handler = logging.StreamHandler()
-console_formatter = logging.Formatter(
-    "%(lineno)d - %(module)s - %(asctime)s - %(levelname)s - %(message)s"
-)
-console_handler.setFormatter(console_formatter)
-logger.addHandler(console_handler)
+# commands shown by 'history' without a count
+HISTORY_COUNT = 20
+
+# unexpected errors only, the executed commands are recorded by the audit log
+logger = logging.getLogger(__name__)
 
 
 def get_platform() -> Platform:
@@ -57,19 +89,23 @@ def clear_screen():
         os.system("clear")
 
 
-def handle_help(parsed_input: str):
+def handle_help(parsed_input: list[str]):
     """
     This function is used to handle the help command
     when the user request any help information
     whether it is general help
     or specific help
-    for a command.
+    for a command, or a search of the help details: 'help search <terms>'.
     :param parsed_input: List of parsed words from user input.
     """
-    load_help = LoadHelp()
+    load_help = get_help_store()
     help_data = ""
 
-    if len(parsed_input) > 1:
+    if len(parsed_input) > 2 and parsed_input[1] == "search":
+        matches = load_help.search(parsed_input[2:])
+        help_data = "\n".join(f"{command}: {info}" for command, info in matches.items())
+        help_data = help_data or f"No help entries match: {' '.join(parsed_input[2:])}"
+    elif len(parsed_input) > 1:
         help_data = load_help.get_help_info(parsed_input[1])
     else:
         help_data = load_help.get_help_info()
@@ -80,29 +116,382 @@ def handle_help(parsed_input: str):
 def handle_file_permissions(operating_system: Platform, parsed_input: list[str]): ...
 
 
-cwd = os.getcwd()
+def handle_job_control(parsed_input: list[str], supervisor: JobSupervisor | None):
+    """
+    This function is used to handle the job control builtins:
+    'jobs' lists the background jobs, 'wait [id]' waits for one or every job
+    and prints its output, 'kill id' stops a running job.
+    :param parsed_input: List of parsed words from user input.
+    :param supervisor: The supervisor of the background jobs, None outside the interactive shell.
+    """
+    if supervisor is None:
+        raise JobControlError(f"'{parsed_input[0]}' is only available in the interactive shell")
 
+    job_id = JobControlValidator.job_id(parsed_input[1]) if len(parsed_input) > 1 else None
 
-def main():
+    if parsed_input[0] == JobControl.JOBS:
+        print(supervisor.list_jobs())
+    elif parsed_input[0] == JobControl.WAIT:
+        for job in supervisor.wait(job_id):
+            print(format_report(job))
+    else:
+        supervisor.kill(job_id)
+
+
+def handle_stats(parsed_input: list[str]):
     """
-    Main Function where program starts
-    gets the user input and does the computation if the user input is valid
-    else prints out a clear Exception message telling the user why their
-    input invalid and then starts back from scratch.
+    This function is used to handle the 'stats' builtin: without an action it
+    prints the latency of every phase of each command type, 'export <path>'
+    writes the metrics to a file (JSON for a '.json' path, a Prometheus
+    textfile otherwise), 'reset' clears them and 'on' / 'off' start or stop
+    collecting them.
+    :param parsed_input: List of parsed words from user input.
+    """
+    action = parsed_input[1] if len(parsed_input) > 1 else None
+
+    if action is None:
+        print(f"{ConsoleColors.get('CYAN')}{PHASE_METRICS.report()}{ConsoleColors.get('RESET')}")
+    elif action == StatsAction.EXPORT:
+        try:
+            PHASE_METRICS.export(parsed_input[2])
+        except OSError as error:
+            raise MetricsError(f"Could not export the metrics: {error}") from error
+        print(f"Phase metrics written to {parsed_input[2]}")
+    elif action == StatsAction.RESET:
+        PHASE_METRICS.reset()
+    else:
+        PHASE_METRICS.enabled = action == StatsAction.ON
+
+
+def handle_history(parsed_input: list[str], history: CommandHistory | None):
+    """
+    This function is used to handle the 'history' builtin: without an argument
+    it prints the last commands, 'history <count>' the last count commands,
+    'history search <text>' the newest commands containing the text and
+    'history prefix <text>' the newest commands starting with it.
+    :param parsed_input: List of parsed words from user input.
+    :param history: The history of the commands, None outside the interactive shell.
+    """
+    if history is None:
+        raise HistoryError(
+            "'history' is only available in the interactive shell, with the history enabled"
+        )
+
+    if len(parsed_input) > 2:
+        text = " ".join(parsed_input[2:])
+        entries = history.search(text, prefix=parsed_input[1] == HistoryValidator.PREFIX)
+        if not entries:
+            print(f"No command in the history matches: {text}")
+    else:
+        entries = history.last(int(parsed_input[1]) if len(parsed_input) > 1 else HISTORY_COUNT)
+
+    for number, command in entries:
+        print(f"{number:>7}  {command}")
+
+
+def export_metrics(arguments: argparse.Namespace):
+    """
+    Rewrites the file given with '--metrics-file', so a collector always sees
+    the metrics of every command run so far.
+    """
+    if not arguments.metrics_file:
+        return
+    try:
+        PHASE_METRICS.export(arguments.metrics_file)
+    except OSError as error:
+        logger.error("Could not export the metrics: %s", error)
+
+
+def parse_arguments() -> argparse.Namespace:
+    """
+    Parses the command line options the shell is started with.
+    """
+    parser = argparse.ArgumentParser(description="C-Shell CLI Tool")
+    parser.add_argument(
+        "--backend",
+        type=ExecutionMode,
+        choices=list(ExecutionMode),
+        default=ExecutionMode.BUILTIN,
+        help="execute file operations in-process (builtin) or by spawning the platform command",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="number of worker threads used by bulk file and permission operations, 'remove', "
+             "'find' and 'usage', and of worker processes used by 'search' and 'dupes'",
+    )
+    parser.add_argument(
+        "--echo-redirect",
+        action="store_true",
+        help="also echo the output of '>' redirections to the terminal",
+    )
+    parser.add_argument(
+        "--latency-report",
+        action="store_true",
+        help="print the per-operation latency of the execution backend on exit",
+    )
+    parser.add_argument(
+        "--stat-report",
+        action="store_true",
+        help="print how many lstat calls each command made through its stat snapshot",
+    )
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="time the parse, validate, translate and execute phases of every command, "
+             "shown by 'stats'",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        metavar="FILE",
+        help="implies --metrics, write the metrics to FILE after every command "
+             "(JSON for a .json file, a Prometheus textfile otherwise)",
+    )
+    parser.add_argument(
+        "--audit-log",
+        metavar="FILE",
+        help="record every executed command as a JSON line in FILE, written by a background thread",
+    )
+    parser.add_argument(
+        "--audit-max-bytes",
+        type=int,
+        default=AuditLog.DEFAULT_MAX_BYTES,
+        metavar="N",
+        help="rotate the audit log once it reaches N bytes",
+    )
+    parser.add_argument(
+        "--audit-backups",
+        type=int,
+        default=AuditLog.DEFAULT_BACKUPS,
+        metavar="N",
+        help="number of rotated audit logs kept",
+    )
+    parser.add_argument(
+        "--history-file",
+        metavar="FILE",
+        default=os.path.join("~", ".cshell_history"),
+        help="file the commands typed at the prompt are appended to, "
+             "searched by 'history' and Ctrl-R",
+    )
+    parser.add_argument(
+        "--no-history",
+        action="store_true",
+        help="do not read or record the command history",
+    )
+    parser.add_argument(
+        "--startup-report",
+        action="store_true",
+        help="print on stderr how long the imports and the startup until the first prompt took",
+    )
+    parser.add_argument(
+        "--script",
+        metavar="FILE",
+        help="validate then run the commands in FILE non-interactively, '-' reads them from stdin",
+    )
+    parser.add_argument(
+        "--command",
+        metavar="COMMAND",
+        help="validate then run a single command and exit, used to run background jobs",
+    )
+    return parser.parse_args()
+
+
+def child_arguments(arguments: argparse.Namespace) -> list[str]:
+    """
+    Returns the options the child shells of background jobs are started with.
+    """
+    options = ["--backend", str(arguments.backend), "--jobs", str(arguments.jobs)]
+    if arguments.echo_redirect:
+        options.append("--echo-redirect")
+    if arguments.audit_log:
+        options += [
+            "--audit-log", os.path.abspath(arguments.audit_log),
+            "--audit-max-bytes", str(arguments.audit_max_bytes),
+            "--audit-backups", str(arguments.audit_backups),
+        ]
+    return options
+
+
+def execute_parsed_input(parsed_input: list[str], os_platform: Platform,
+                         arguments: argparse.Namespace, supervisor: JobSupervisor | None = None,
+                         history: CommandHistory | None = None):
+    """
+    Executes a command that has already been parsed and validated by 'InputParser'.
+    If the request is of type help then it is checked whether it is general or
+    specific help, job control builtins act on the supervisor of the background jobs,
+    'history' on the command history of the interactive shell,
+    else the compute class performs the operation like [create, delete, etc]
+    """
+    if parsed_input[0] == "help":
+        handle_help(parsed_input)
+    elif parsed_input[0] in JobControl:
+        handle_job_control(parsed_input, supervisor)
+    elif parsed_input[0] == "stats":
+        handle_stats(parsed_input)
+    elif parsed_input[0] == "history":
+        handle_history(parsed_input, history)
+    else:
+        compute = ComputeOperations(
+            parsed_input, os_platform, arguments.backend, arguments.echo_redirect, arguments.jobs
+        )
+        compute.execute_operation()
+
+    if arguments.stat_report:
+        print(current_snapshot().report())
+
+
+def print_latency_report(os_platform: Platform, arguments: argparse.Namespace):
     """
+    Prints the per-operation latency of the execution backend when '--latency-report' is given.
+    """
+    if not arguments.latency_report:
+        return
+    from SyntaxShift.operation_executor import get_executor  # pylint: disable=import-outside-toplevel
+
+    print(get_executor(arguments.backend, os_platform).latency_report())
+
+
+def print_startup_report(arguments: argparse.Namespace, ready: str):
+    """
+    Prints how long the imports took and how long the shell took to be ready
+    for its first command, both measured from the moment 'main.py' started
+    loading, when '--startup-report' is given.
+    """
+    if not arguments.startup_report:
+        return
+    elapsed = perf_counter() - STARTED
+    print(
+        f"startup: imports {(IMPORTED - STARTED) * 1000:.1f} ms, {ready} {elapsed * 1000:.1f} ms, "
+        f"{len(sys.modules)} modules loaded",
+        file=sys.stderr,
+    )
+
+
+def execute_audited(parsed_input: list[str], os_platform: Platform, arguments: argparse.Namespace,
+                    audit: AuditLog):
+    """
+    Executes a parsed command outside the interactive shell, recording it in the audit log.
+    """
+    with audit.command(parsed_input):
+        execute_parsed_input(parsed_input, os_platform, arguments)
+
+
+def run_script(os_platform: Platform, arguments: argparse.Namespace, audit: AuditLog) -> int:
+    """
+    Runs the commands of the script given with '--script' without any prompt.
+    :return: the exit status of the script.
+    """
+    runner = ScriptRunner(
+        lambda parsed_input: execute_audited(parsed_input, os_platform, arguments, audit)
+    )
+    print_startup_report(arguments, "ready")
+
+    if arguments.script == "-":
+        status = runner.execute(sys.stdin)
+    else:
+        with open(arguments.script, "r", encoding="utf-8") as script:
+            status = runner.execute(script)
+
+    print_latency_report(os_platform, arguments)
+    export_metrics(arguments)
+    return status
+
+
+def run_command(os_platform: Platform, arguments: argparse.Namespace, audit: AuditLog) -> int:
+    """
+    Runs the single command given with '--command', the way background jobs are run.
+    :return: the exit status of the command.
+    """
+    print_startup_report(arguments, "ready")
+    try:
+        parsed_input = InputParser(arguments.command).retrieved_parsed_input()
+        execute_audited(parsed_input, os_platform, arguments, audit)
+    except KeyboardInterrupt:
+        # how 'watch' is stopped
+        return INTERRUPTED_STATUS
+    except Exception as error:  # pylint: disable=broad-except
+        ScriptRunner.report_error(str(error))
+        return 1
+    finally:
+        print_latency_report(os_platform, arguments)
+        export_metrics(arguments)
+    return 0
+
+
+def report_finished_jobs(supervisor: JobSupervisor):
+    """
+    Prints the completion notice and the output of every background job
+    that finished since the last prompt.
+    """
+    for job in supervisor.finished():
+        print(format_report(job))
+
+
+def install_interrupt_handler(runner: "AsyncCommandRunner"):
+    """
+    Makes Ctrl-C cancel the command running in the foreground instead of
+    stopping the shell, at the prompt it only starts a new line.
+    """
+    import asyncio  # pylint: disable=import-outside-toplevel
+    import signal  # pylint: disable=import-outside-toplevel
+
+    loop = asyncio.get_running_loop()
+
+    def interrupt():
+        if not runner.interrupt():
+            print(f"\n{os.getcwd()}>> ", end="", flush=True)
+
+    try:
+        loop.add_signal_handler(signal.SIGINT, interrupt)
+    except NotImplementedError:
+        # Windows has no loop signal handlers, the handler runs between two steps of the loop
+        signal.signal(signal.SIGINT, lambda *_: loop.call_soon_threadsafe(interrupt))
+
+
+async def repl(os_platform: Platform, arguments: argparse.Namespace, supervisor: JobSupervisor,
+               audit: AuditLog, history: CommandHistory | None):
+    """
+    The interactive loop, run on an asyncio event loop. The prompt is read in
+    a worker thread and every command runs as a cancellable foreground task,
+    recorded in the audit log once it is done.
+    """
+    import asyncio  # pylint: disable=import-outside-toplevel
+    from async_runner import AsyncCommandRunner  # pylint: disable=import-outside-toplevel
+
+    loop = asyncio.get_running_loop()
+    runner = AsyncCommandRunner(
+        os_platform, arguments, supervisor,
+        lambda parsed_input: execute_parsed_input(
+            parsed_input, os_platform, arguments, supervisor, history
+        ),
+    )
+    install_interrupt_handler(runner)
+    Completer().install()
+    if history is not None:
+        history.enable_line_editing()
+        history.start_loading()
+    print_startup_report(arguments, "first prompt")
+
     # main
     while True:
-        os_platform = get_platform()
-
+        report_finished_jobs(supervisor)
         print(
             "\nEnter a command or ('e' to exit, 'c' to clear, 'help' for assistance):"
         )
-        command = input(f"{cwd}>> ").strip()
+        try:
+            command = (await loop.run_in_executor(None, input, f"{os.getcwd()}>> ")).strip()
+        except EOFError:
+            break
 
         # Break out of program if the user enters e
         if command.lower() == "e":
             break
 
+        if history is not None and command.lower() != "c":
+            history.append(command)
+
         # runs the clear screen command if user enters 'c'
         if command.lower() == "c":
             clear_screen()
@@ -114,26 +503,26 @@ def main():
             continue
 
         try:
-            # calling the `get_platform()` function to determine the operating
-            # system platform the program is running on
             # pass in the input by the user for it to be parsed into a list of individual text
             # the call retrieved_parsed_input which validates the parsed list
             # if valid return list else raise and exception
 
-            parsed_input = InputParser(command)
-            parsed_input = parsed_input.retrieved_parsed_input()
+            input_parser = InputParser(command)
+            words = input_parser.parsed_inputs
+            if len(words) == 2 and words[0] == "rename":
+                # only asked here, commands run without a terminal need the new name given
+                new_filename = await loop.run_in_executor(None, input, "Enter new filename: ")
+                words.append(new_filename.strip())
+            parsed_input = input_parser.retrieved_parsed_input()
 
-            # If the user input is valid then check if the request\n
-            # is of type help: 'if help is requested then check if\n
-            # it is general help or a specific help'\n
-            # if the input is not of help then call the compute class\n
-            # to perform various operations like [create, delete, etc]
+            if input_parser.background:
+                job = supervisor.start(parsed_input, shlex.join(parsed_input))
+                print(f"[{job.job_id}] {job.process.pid}")
+                continue
 
-            if parsed_input[0] == "help":
-                handle_help(parsed_input)
-            else:
-                compute = ComputeOperations(parsed_input, os_platform)
-                compute.execute_operation()
+            with audit.command(parsed_input) as entry:
+                entry.status = await runner.run(parsed_input)
+            export_metrics(arguments)
 
         except CustomBaseException as e:
             # clear the screen and print the exception in #red if and error is risen
@@ -147,5 +536,44 @@ def main():
             continue
 
 
+def main():
+    """
+    Main Function where program starts
+    gets the user input and does the computation if the user input is valid
+    else prints out a clear Exception message telling the user why their
+    input invalid and then starts back from scratch.
+    """
+    arguments = parse_arguments()
+    os_platform = get_platform()
+    PHASE_METRICS.enabled = arguments.metrics or bool(arguments.metrics_file)
+
+    audit = AuditLog(arguments.audit_log, arguments.audit_max_bytes, arguments.audit_backups)
+
+    if arguments.script or arguments.command:
+        try:
+            if arguments.script:
+                status = run_script(os_platform, arguments, audit)
+            else:
+                status = run_command(os_platform, arguments, audit)
+        finally:
+            audit.close()
+        sys.exit(status)
+
+    import asyncio  # pylint: disable=import-outside-toplevel
+
+    supervisor = JobSupervisor(child_arguments(arguments))
+    history = None if arguments.no_history else CommandHistory(arguments.history_file)
+    try:
+        asyncio.run(repl(os_platform, arguments, supervisor, audit, history))
+    finally:
+        supervisor.shutdown()
+        audit.close()
+        if history is not None:
+            history.close()
+        export_metrics(arguments)
+
+    print_latency_report(os_platform, arguments)
+
+
 if __name__ == "__main__":
     main()
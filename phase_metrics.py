@@ -0,0 +1,302 @@
+"""
+This module provides the per-phase latency metrics of the shell.
+
+Every command goes through the same phases: its input is parsed
+('shlex'), validated (the validator chain), translated (into the argv of a
+platform command or the requests of a builtin operation), then either
+executed in-process, or spawned and waited for. Each phase is timed and
+recorded in a histogram per command type, which the 'stats' builtin shows
+and which can be exported as a Prometheus textfile (for the node exporter
+textfile collector) or as JSON.
+
+Collection is off unless the shell is started with '--metrics' or
+'--metrics-file'. When it is off, timing a phase is reduced to a flag
+check: 'clock' returns 0.0 without reading the clock, 'record' returns at
+once and 'timer' returns a shared context manager that does nothing.
+"""
+
+from bisect import bisect_left
+from contextlib import AbstractContextManager
+from enum import StrEnum
+from threading import Lock
+from time import perf_counter
+from typing import Dict, List, Tuple
+import json
+import os
+
+from validator.command_registry import COMMANDS
+
+
+class Phase(StrEnum):
+    """
+        The phases a command goes through, in order.
+    """
+    PARSE = "parse"
+    VALIDATE = "validate"
+    TRANSLATE = "translate"
+    EXECUTE = "execute"
+    SPAWN = "spawn"
+    WAIT = "wait"
+
+
+# upper bounds of the histogram buckets in seconds, from 1us doubling up to ~16s
+BUCKET_BOUNDS: Tuple[float, ...] = tuple(1e-6 * 2 ** exponent for exponent in range(25))
+
+PROMETHEUS_METRIC = "cshell_command_phase_seconds"
+
+# the label of an input that is not a command, so typos do not add label values
+INVALID_COMMAND = "invalid"
+
+
+def command_type(parsed_inputs: List[str]) -> str:
+    """
+    Returns:
+        str: The label the metrics of a command are recorded under, 'pipeline' for
+        piped commands and 'invalid' for a first word that is not a command.
+    """
+    if not parsed_inputs:
+        return "empty"
+    if "|" in parsed_inputs:
+        return "pipeline"
+    return parsed_inputs[0] if parsed_inputs[0] in COMMANDS else INVALID_COMMAND
+
+
+def escape_label(value: str) -> str:
+    """
+    Escapes a label value of the Prometheus text format: backslash, double quote and line feed.
+    """
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Histogram:
+    """
+    A latency histogram with fixed, exponentially growing buckets.
+
+    Attributes:
+        counts (List[int]): The number of observations in each bucket, the last one is unbounded.
+        count (int): The number of observations.
+        total (float): The sum of the observations in seconds.
+    """
+
+    def __init__(self) -> None:
+        self.counts: List[int] = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """
+        Records one duration in its bucket.
+        """
+        self.counts[bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def quantile(self, q: float) -> float:
+        """
+        Returns:
+            float: The upper bound of the bucket holding the 'q' quantile, an estimate.
+        """
+        rank = q * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= rank and count:
+                return BUCKET_BOUNDS[index] if index < len(BUCKET_BOUNDS) else float("inf")
+        return 0.0
+
+    @property
+    def mean(self) -> float:
+        """
+        The mean duration, 0 when nothing was recorded.
+        """
+        return self.total / self.count if self.count else 0.0
+
+
+class _NullTimer(AbstractContextManager):
+    """
+    The timer handed out when collection is disabled, it does nothing.
+    """
+
+    def __exit__(self, *exc_info) -> None:
+        return None
+
+
+class _PhaseTimer(AbstractContextManager):
+    """
+    Times the block it wraps and records it for a command and phase.
+    """
+
+    __slots__ = ("metrics", "command", "phase", "start")
+
+    def __init__(self, metrics: "PhaseMetrics", command: str, phase: Phase):
+        self.metrics = metrics
+        self.command = command
+        self.phase = phase
+        self.start = 0.0
+
+    def __enter__(self) -> "_PhaseTimer":
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.metrics.observe(self.command, self.phase, perf_counter() - self.start)
+
+
+NULL_TIMER = _NullTimer()
+
+
+class PhaseMetrics:
+    """
+    The histograms of every (command type, phase) pair.
+
+    Attributes:
+        enabled (bool): Whether phases are timed.
+        histograms (Dict[Tuple[str, str], Histogram]): The histogram of each command type and phase.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.histograms: Dict[Tuple[str, str], Histogram] = {}
+        self._lock = Lock()
+
+    def clock(self) -> float:
+        """
+        Returns:
+            float: The start time of a phase to pass to 'record', 0.0 when disabled.
+        """
+        return perf_counter() if self.enabled else 0.0
+
+    def record(self, command: str, phase: Phase, start: float) -> None:
+        """
+        Records a phase that started at 'start', a time returned by 'clock'.
+        """
+        if self.enabled:
+            self.observe(command, phase, perf_counter() - start)
+
+    def timer(self, command: str, phase: Phase) -> AbstractContextManager:
+        """
+        Returns a context manager timing the block it wraps.
+        """
+        return _PhaseTimer(self, command, phase) if self.enabled else NULL_TIMER
+
+    def observe(self, command: str, phase: Phase, seconds: float) -> None:
+        """
+        Records the duration of a phase of a command type.
+        """
+        with self._lock:
+            key = (command, str(phase))
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    def reset(self) -> None:
+        """
+        Drops every histogram recorded so far.
+        """
+        with self._lock:
+            self.histograms.clear()
+
+    def sorted_histograms(self) -> List[Tuple[Tuple[str, str], Histogram]]:
+        """
+        Returns:
+            List[Tuple[Tuple[str, str], Histogram]]: The histograms by command type, then phase.
+        """
+        phases = list(Phase)
+        with self._lock:
+            return sorted(
+                self.histograms.items(), key=lambda item: (item[0][0], phases.index(item[0][1]))
+            )
+
+    def report(self) -> str:
+        """
+        Returns:
+            str: A table of the count, mean and estimated quantiles of every command type
+                and phase.
+        """
+        rows = self.sorted_histograms()
+        if not rows:
+            hint = "" if self.enabled else ", start the shell with --metrics"
+            return "No phase metrics recorded" + hint
+
+        lines = [
+            f"{'command':<12}{'phase':<11}{'count':>8}"
+            f"{'mean':>12}{'p50':>12}{'p90':>12}{'p99':>12}"
+        ]
+        for (command, phase), histogram in rows:
+            lines.append(
+                f"{command:<12}{phase:<11}{histogram.count:>8}"
+                + "".join(f"{format_seconds(value):>12}" for value in (
+                    histogram.mean, histogram.quantile(0.5),
+                    histogram.quantile(0.9), histogram.quantile(0.99),
+                ))
+            )
+        return "\n".join(lines)
+
+    def to_json(self) -> Dict:
+        """
+        Returns:
+            Dict: The bucket bounds and the raw counts of every histogram.
+        """
+        return {
+            "bucket_bounds": list(BUCKET_BOUNDS),
+            "histograms": [
+                {
+                    "command": command, "phase": phase, "count": histogram.count,
+                    "sum": histogram.total, "counts": histogram.counts,
+                }
+                for (command, phase), histogram in self.sorted_histograms()
+            ],
+        }
+
+    def to_prometheus(self) -> str:
+        """
+        Returns:
+            str: The histograms in the Prometheus text exposition format.
+        """
+        lines = [
+            f"# HELP {PROMETHEUS_METRIC} Latency of each phase of the shell commands.",
+            f"# TYPE {PROMETHEUS_METRIC} histogram",
+        ]
+        for (command, phase), histogram in self.sorted_histograms():
+            labels = f'command="{escape_label(command)}",phase="{escape_label(phase)}"'
+            cumulative = 0
+            for bound, count in zip((*BUCKET_BOUNDS, float("inf")), histogram.counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else f"{bound:.9g}"
+                lines.append(f'{PROMETHEUS_METRIC}_bucket{{{labels},le="{le}"}} {cumulative}')
+            lines.append(f"{PROMETHEUS_METRIC}_sum{{{labels}}} {histogram.total:.9g}")
+            lines.append(f"{PROMETHEUS_METRIC}_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, file_path: str) -> None:
+        """
+        Writes the metrics as JSON when the file ends with '.json', as a Prometheus
+        textfile otherwise. The file is replaced atomically, so a collector never
+        reads a partially written file.
+        """
+        if file_path.endswith(".json"):
+            content = json.dumps(self.to_json(), indent=2)
+        else:
+            content = self.to_prometheus()
+
+        temporary_path = f"{file_path}.{os.getpid()}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(temporary_path, file_path)
+
+
+def format_seconds(seconds: float) -> str:
+    """
+    Formats a duration in the unit that keeps it readable.
+    """
+    if seconds == float("inf"):
+        return "inf"
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f}us"
+    if seconds < 1:
+        return f"{seconds * 1e3:.2f}ms"
+    return f"{seconds:.2f}s"
+
+
+PHASE_METRICS = PhaseMetrics()
@@ -0,0 +1,145 @@
+"""
+This module runs the shell non-interactively over a script of commands,
+one command per line, read from a file or from stdin.
+
+The syntax of the whole script is checked first, in one pass through
+'InputParser': every command must be known and given a valid number of
+arguments, and every invalid line is reported with its line number.
+Nothing is executed unless the whole script passes. The commands are then
+executed back to back without prompts or screen clears, and the throughput
+is reported at the end.
+
+What depends on the file system (a path exists, is a directory) is checked
+when the line runs, by the validators of the command, so a line can use
+what the lines before it created: 'make d1' then 'change d1'. The first
+line failing these checks stops the script.
+
+Blank lines and lines starting with '#' are skipped, 'e' ends the script
+and 'c' is ignored. Background jobs ('&') are not supported.
+"""
+
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Callable, Iterable, List, TextIO
+import sys
+
+from input_parser import InputParser
+from validator.static.constant_types import ConsoleColors
+from validator.static.exceptions import CustomBaseException, JobControlError
+from validator.stat_snapshot import begin_snapshot
+
+
+@dataclass
+class ScriptLine:
+    """
+    A validated line of the script.
+
+    Attributes:
+        number (int): The line number in the script, starting at 1.
+        text (str): The line as written in the script.
+        parser (InputParser): The parser of the line, validates it fully when it runs.
+    """
+    number: int
+    text: str
+    parser: InputParser
+
+
+class ScriptRunner:
+    """
+    Validates and executes a script of shell commands.
+
+    Attributes:
+        dispatch (Callable[[List[str]], None]): Executes one parsed command.
+        commands (List[ScriptLine]): The valid commands of the script, in order.
+        errors (List[str]): One message per invalid line.
+    """
+
+    COMMENT = "#"
+    EXIT = "e"
+    CLEAR = "c"
+
+    def __init__(self, dispatch: Callable[[List[str]], None], output: TextIO = sys.stdout):
+        self.dispatch = dispatch
+        self.output = output
+        self.commands: List[ScriptLine] = []
+        self.errors: List[str] = []
+
+    def validate(self, lines: Iterable[str]) -> bool:
+        """
+        Parses every line of the script and checks its syntax, collecting all
+        the errors instead of stopping at the first one.
+
+        Returns:
+            bool: True if the syntax of every line of the script is valid.
+        """
+        for number, line in enumerate(lines, start=1):
+            text = line.strip()
+
+            if not text or text.startswith(ScriptRunner.COMMENT):
+                continue
+            if text.lower() == ScriptRunner.CLEAR:
+                continue
+            if text.lower() == ScriptRunner.EXIT:
+                break
+
+            try:
+                input_parser = InputParser(text)
+                input_parser.retrieved_syntax()
+                if input_parser.background:
+                    raise JobControlError(
+                        "Background jobs ('&') are only supported in the interactive shell"
+                    )
+                self.commands.append(ScriptLine(number, text, input_parser))
+            except (CustomBaseException, ValueError) as error:
+                self.errors.append(f"line {number}: {text}: {error}")
+
+        return not self.errors
+
+    def run(self) -> int:
+        """
+        Validates and executes the commands in order, stopping at the first
+        command that is invalid or fails.
+
+        Returns:
+            int: The exit status of the script, 0 on success and 1 on failure.
+        """
+        start = perf_counter()
+        executed = 0
+
+        for line in self.commands:
+            # validated against the tree as the commands before it left it
+            begin_snapshot()
+            try:
+                self.dispatch(line.parser.retrieved_parsed_input())
+            except Exception as error:  # pylint: disable=broad-except
+                self.report_error(f"line {line.number}: {line.text}: {error}")
+                return 1
+            executed += 1
+
+        elapsed = perf_counter() - start
+        rate = executed / elapsed if elapsed else 0.0
+        print(
+            f"Executed {executed} commands in {elapsed:.3f}s ({rate:.1f} commands/sec)",
+            file=self.output,
+        )
+        return 0
+
+    def execute(self, lines: Iterable[str]) -> int:
+        """
+        Checks the script and runs it only when the syntax of every line is valid.
+
+        Returns:
+            int: The exit status of the script, 0 on success and 1 on failure.
+        """
+        if not self.validate(lines):
+            for error in self.errors:
+                self.report_error(error)
+            return 1
+        return self.run()
+
+    @staticmethod
+    def report_error(message: str) -> None:
+        """
+        Prints the error in red on stderr.
+        """
+        print(f"{ConsoleColors.get('RED')}{message}{ConsoleColors.get('RESET')}", file=sys.stderr)
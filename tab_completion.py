@@ -0,0 +1,232 @@
+"""
+This module provides the Tab completion of the interactive shell.
+
+The first word of a line completes to the registered command names, the
+other words to paths:
+    - file operations (create, delete, rename, copy) and search complete to
+      the files with a valid extension, and to directories to descend into.
+    - change, make, remove, watch and find complete to directories only.
+    - list and modify complete to every entry.
+    - help completes to the command names.
+
+Completions come from 'DirectoryListingCache', which keeps the sorted entries
+of the last 'MAX_DIRECTORIES' directories completed in. A cached listing is
+reused as long as the modification time of its directory is unchanged, so
+pressing Tab again in a directory of 200k entries costs one 'stat' and a
+binary search instead of a rescan. Creating, removing or renaming an entry
+updates the modification time of the directory and the next Tab rescans it.
+"""
+
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import List, NamedTuple
+import os
+
+from validator.command_registry import COMMANDS
+from validator.static.constant_types import (
+    DirectoryOperation,
+    FileOperation,
+    InspectionCommand,
+    VALID_EXTENSIONS,
+)
+
+
+class DirectoryListing(NamedTuple):
+    """
+    The sorted names of a directory, the names of directories end with a separator.
+
+    Attributes:
+        mtime_ns (int): The modification time of the directory when it was listed.
+        entries (List[str]): Every entry.
+        directories (List[str]): The directories.
+        files (List[str]): The files with a valid extension, and the directories.
+    """
+    mtime_ns: int
+    entries: List[str]
+    directories: List[str]
+    files: List[str]
+
+
+class DirectoryListingCache:
+    """
+    The listings of the directories completed in, invalidated by their modification time.
+
+    Attributes:
+        scans (int): The number of directories listed, for the cache statistics.
+    """
+
+    MAX_DIRECTORIES = 64
+
+    def __init__(self) -> None:
+        self._listings: OrderedDict[str, DirectoryListing] = OrderedDict()
+        self.scans = 0
+
+    def get(self, directory: str) -> DirectoryListing | None:
+        """
+        Returns the listing of the directory, listed again only when it changed.
+        None when the directory cannot be read.
+        """
+        key = os.path.abspath(directory)
+        try:
+            mtime_ns = os.stat(key).st_mtime_ns
+        except OSError:
+            self._listings.pop(key, None)
+            return None
+
+        listing = self._listings.get(key)
+        if listing is not None and listing.mtime_ns == mtime_ns:
+            self._listings.move_to_end(key)
+            return listing
+
+        try:
+            listing = self.scan(key, mtime_ns)
+        except OSError:
+            return None
+        self._listings[key] = listing
+        if len(self._listings) > DirectoryListingCache.MAX_DIRECTORIES:
+            self._listings.popitem(last=False)
+        return listing
+
+    def scan(self, directory: str, mtime_ns: int) -> DirectoryListing:
+        """
+        Reads the entries of a directory, sorted and split into directories and files.
+        """
+        self.scans += 1
+        entries, directories, files = [], [], []
+        extensions = frozenset(VALID_EXTENSIONS)
+        with os.scandir(directory) as iterator:
+            for entry in iterator:
+                try:
+                    is_directory = entry.is_dir()
+                except OSError:
+                    is_directory = False
+                if is_directory:
+                    name = entry.name + os.sep
+                    directories.append(name)
+                    files.append(name)
+                else:
+                    name = entry.name
+                    if os.path.splitext(name)[1] in extensions:
+                        files.append(name)
+                entries.append(name)
+        entries.sort()
+        directories.sort()
+        files.sort()
+        return DirectoryListing(mtime_ns, entries, directories, files)
+
+
+def starting_with(names: List[str], prefix: str, limit: int, hidden: bool = False) -> List[str]:
+    """
+    Returns up to 'limit' names of the sorted list starting with the prefix,
+    found with a binary search. Names starting with a dot only when 'hidden' is set.
+    """
+    index = bisect_left(names, prefix)
+    matches = []
+    while index < len(names) and len(matches) < limit and names[index].startswith(prefix):
+        if hidden or not names[index].startswith("."):
+            matches.append(names[index])
+        index += 1
+    return matches
+
+
+class Completer:
+    """
+    The readline completer of the shell.
+
+    Attributes:
+        cache (DirectoryListingCache): The listings the paths are completed from.
+    """
+
+    # completing to every entry of a huge directory is useless, readline would list them all
+    MAX_MATCHES = 1000
+
+    def __init__(self, cache: DirectoryListingCache | None = None) -> None:
+        self.cache = cache or DirectoryListingCache()
+        self._matches: List[str] = []
+        self._readline = None
+
+    def install(self) -> bool:
+        """
+        Binds Tab to the completer.
+
+        Returns:
+            bool: False when readline is not available on this platform.
+        """
+        try:
+            import readline  # pylint: disable=import-outside-toplevel
+        except ImportError:
+            return False
+
+        self._readline = readline
+        readline.set_completer(self.complete)
+        # a path is a single word, only blanks separate words
+        readline.set_completer_delims(" \t\n")
+        if "libedit" in (readline.__doc__ or ""):
+            readline.parse_and_bind("bind ^I rl_complete")
+        else:
+            readline.parse_and_bind("tab: complete")
+        return True
+
+    def complete(self, text: str, state: int) -> str | None:
+        """
+        The readline completion function, called with 0, 1, ... until it returns None.
+        """
+        if state == 0:
+            line = self._readline.get_line_buffer()
+            words = line[:self._readline.get_begidx()].split()
+            try:
+                self._matches = self.matches(words, text)
+            except Exception:  # pylint: disable=broad-except
+                # an error would be swallowed by readline and stop the completion silently anyway
+                self._matches = []
+        return self._matches[state] if state < len(self._matches) else None
+
+    def matches(self, words: List[str], text: str) -> List[str]:
+        """
+        Returns the completions of the word 'text' that follows the words 'words'.
+        """
+        if "|" in words:
+            # every stage of a pipeline starts with its own command
+            words = words[len(words) - words[::-1].index("|"):]
+        if not words or words[0] == "help":
+            return [name + " " for name in COMMANDS.names() if name.startswith(text.lower())]
+        if words[-1] in (">", "<"):
+            return self.complete_path(text, "files")
+
+        command_spec = COMMANDS.get(words[0].lower())
+        if command_spec is None:
+            return []
+        if command_spec.handler_path is None and command_spec.name not in InspectionCommand:
+            # the other builtins without a handler take no path
+            return []
+        return self.complete_path(text, self.kind(command_spec.name))
+
+    @staticmethod
+    def kind(command: str) -> str:
+        """
+        Returns which entries of a directory the command completes to.
+        """
+        if command in (DirectoryOperation.CHANGE, DirectoryOperation.MAKE,
+                       DirectoryOperation.REMOVE, InspectionCommand.WATCH, InspectionCommand.FIND,
+                       InspectionCommand.USAGE, InspectionCommand.DUPES):
+            return "directories"
+        if command in FileOperation or command == InspectionCommand.SEARCH:
+            return "files"
+        return "entries"
+
+    def complete_path(self, text: str, kind: str) -> List[str]:
+        """
+        Returns:
+            List[str]: The paths of the 'kind' starting with 'text', from the cached listing.
+        """
+        directory, prefix = os.path.split(text)
+        listing = self.cache.get(os.path.expanduser(directory) or os.curdir)
+        if listing is None:
+            return []
+
+        names = starting_with(
+            getattr(listing, kind), prefix, Completer.MAX_MATCHES, prefix.startswith(".")
+        )
+        matches = [os.path.join(directory, name) for name in names]
+        # a file is complete, a directory goes on with its entries
+        return [match if match.endswith(os.sep) else match + " " for match in matches]
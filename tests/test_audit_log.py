@@ -0,0 +1,43 @@
+"""
+Checks the rotation of an audit log shared by several shells.
+"""
+
+# pylint: disable=missing-function-docstring
+
+import glob
+import json
+import multiprocessing
+
+from audit_log import AuditEntry, AuditLog
+
+
+SHELLS = 4
+ENTRIES = 300
+
+
+def write_entries(path: str) -> None:
+    audit = AuditLog(path, max_bytes=4096, backups=1000)
+    for index in range(ENTRIES):
+        audit.record(AuditEntry("create", [f"{index}.txt"], "/"))
+    audit.close()
+
+
+def test_shells_rotating_the_same_log_keep_every_entry(tmp_path):
+    path = str(tmp_path / "audit.log")
+    processes = [multiprocessing.Process(target=write_entries, args=(path,)) for _ in range(SHELLS)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    entries = []
+    for log_file in glob.glob(f"{path}*"):
+        if log_file.endswith(".lock"):
+            continue
+        with open(log_file, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        assert sum(len(line) + 1 for line in lines) <= 4096
+        entries += [json.loads(line) for line in lines]
+
+    assert len(entries) == SHELLS * ENTRIES
+    assert len({(entry["pid"], entry["args"][0]) for entry in entries}) == SHELLS * ENTRIES
@@ -0,0 +1,59 @@
+"""
+Compares the lines found by 'ContentSearch' with those of 'grep -n', on a
+file cut into many ranges, for patterns that can match an empty string.
+"""
+
+# pylint: disable=missing-function-docstring
+
+import io
+import random
+import shutil
+import subprocess
+
+import pytest
+
+from SyntaxShift import content_search
+from SyntaxShift.content_search import ContentSearch, SearchOptions
+
+
+PATTERNS = ["^$", "^", "$", "x*", "a|", "^b*$", "[0-9]+", "error"]
+
+
+def grep_lines(pattern: str, path: str) -> list[str]:
+    completed = subprocess.run(
+        ["grep", "-nE", pattern, path], capture_output=True, text=True, check=False
+    )
+    return [f"{path}:{line}" for line in completed.stdout.splitlines()]
+
+
+def search_lines(pattern: str, path: str) -> list[str]:
+    output = io.StringIO()
+    ContentSearch(pattern, path, SearchOptions(), jobs=2).run(output)
+    return output.getvalue().splitlines()
+
+
+@pytest.fixture(name="log_file")
+def fixture_log_file(tmp_path) -> str:
+    generator = random.Random(7)
+    words = ["", "", "a", "b", "bb", "error 42", "x", "xx", "ok 7", "no match here"]
+    lines = [generator.choice(words) for _ in range(3000)]
+    path = tmp_path / "t.txt"
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+@pytest.mark.skipif(shutil.which("grep") is None, reason="grep is not available")
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_search_matches_grep_across_ranges(pattern, log_file, monkeypatch):
+    # a chunk that is not a multiple of any line length, so ranges end inside lines
+    # and on line starts
+    monkeypatch.setattr(content_search, "CHUNK_SIZE", 997)
+    assert search_lines(pattern, log_file) == grep_lines(pattern, log_file)
+
+
+@pytest.mark.skipif(shutil.which("grep") is None, reason="grep is not available")
+def test_empty_line_of_a_small_file(tmp_path):
+    path = tmp_path / "t.txt"
+    path.write_bytes(b"a\n\nb\n")
+    assert search_lines("^$", str(path)) == [f"{path}:2:"]
+    assert search_lines("^$", str(path)) == grep_lines("^$", str(path))
@@ -0,0 +1,59 @@
+"""
+Checks the paths 'remove' refuses before any of the tree is deleted.
+"""
+
+# pylint: disable=missing-function-docstring
+
+import os
+
+import pytest
+
+from validator.directory_management_validator import DirectoryManagementValidator
+from validator.stat_snapshot import begin_snapshot
+from validator.static.exceptions import DirectoryManagementError
+
+
+def validate(*command: str) -> bool:
+    begin_snapshot()
+    return DirectoryManagementValidator(list(command)).validate()
+
+
+@pytest.fixture(name="tree")
+def fixture_tree(tmp_path, monkeypatch):
+    (tmp_path / "work" / "sub").mkdir(parents=True)
+    (tmp_path / "work" / "data.csv").write_text("a,b\n", encoding="utf-8")
+    monkeypatch.chdir(tmp_path / "work")
+    return tmp_path
+
+
+@pytest.mark.parametrize("path", [".", "./", "..", "sub/..", "../work", os.sep])
+def test_remove_refuses_the_working_directory_and_its_ancestors(tree, path):
+    with pytest.raises(DirectoryManagementError, match="refusing"):
+        validate("remove", path)
+    assert (tree / "work" / "sub").is_dir()
+
+
+def test_remove_refuses_an_ancestor_by_absolute_path(tree):
+    with pytest.raises(DirectoryManagementError, match="working directory"):
+        validate("remove", str(tree))
+
+
+def test_remove_refuses_a_regular_file(tree):
+    with pytest.raises(DirectoryManagementError, match="not a directory"):
+        validate("remove", "data.csv")
+    assert (tree / "work" / "data.csv").is_file()
+
+
+def test_remove_refuses_a_missing_path(tree):
+    with pytest.raises(DirectoryManagementError):
+        validate("remove", "missing")
+
+
+def test_remove_accepts_a_subdirectory(tree):
+    assert validate("remove", "sub")
+
+
+def test_remove_accepts_a_symlink_to_the_working_directory(tree):
+    # the link is unlinked, the directory it points to is not walked
+    os.symlink(tree / "work", tree / "work" / "here")
+    assert validate("remove", "here")
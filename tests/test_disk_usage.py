@@ -0,0 +1,96 @@
+"""
+Checks the cache of 'usage': the directories unchanged since a previous run
+are not read again, and a modified or unreadable entry is never trusted.
+"""
+
+# pylint: disable=missing-function-docstring
+
+import io
+import os
+
+import pytest
+
+from SyntaxShift.disk_usage import DirectoryUsage, DiskUsage, UsageCache, UsageOptions
+
+
+def age(*paths) -> None:
+    """
+    Moves the mtime of the paths an hour back, past the racy window of the cache.
+    """
+    for path in paths:
+        info = os.stat(path)
+        os.utime(path, ns=(info.st_atime_ns, info.st_mtime_ns - 3600 * 10**9))
+
+
+@pytest.fixture(name="tree")
+def fixture_tree(tmp_path):
+    root = tmp_path / "tree"
+    (root / "a").mkdir(parents=True)
+    (root / "b").mkdir()
+    (root / "a" / "one.txt").write_bytes(b"x" * 10_000)
+    (root / "b" / "two.txt").write_bytes(b"x" * 20_000)
+    age(root, root / "a", root / "b")
+    return root
+
+
+def usage(root, cache: UsageCache, *arguments: str) -> DiskUsage:
+    disk_usage = DiskUsage(str(root), UsageOptions.from_arguments(list(arguments)), cache=cache)
+    disk_usage.run(io.StringIO())
+    return disk_usage
+
+
+def test_a_saved_entry_is_loaded_back(tmp_path):
+    entry = DirectoryUsage(123, 4096, 2, ("sub",), ((1, 2, 4096),))
+    cache = UsageCache(str(tmp_path / "cache"))
+    cache.update({(1, 7): entry})
+    cache.save()
+
+    loaded = UsageCache(str(tmp_path / "cache"))
+    loaded.load()
+    assert loaded.get((1, 7), 123) == entry
+
+
+def test_an_entry_of_another_mtime_is_not_used(tmp_path):
+    cache = UsageCache(str(tmp_path / "cache"))
+    cache.update({(1, 7): DirectoryUsage(123, 4096, 0, ())})
+    assert cache.get((1, 7), 124) is None
+    assert cache.get((1, 8), 123) is None
+
+
+def test_an_unreadable_cache_file_is_an_empty_cache(tmp_path):
+    path = tmp_path / "cache"
+    path.write_text("{not json", encoding="utf-8")
+    cache = UsageCache(str(path))
+    cache.load()
+    assert cache.entries == {}
+
+
+def test_a_second_run_reads_only_what_changed(tree, tmp_path):
+    cache_path = str(tmp_path / "cache")
+    first = usage(tree, UsageCache(cache_path))
+    assert first.summary.scanned == 3
+
+    second = usage(tree, UsageCache(cache_path))
+    assert second.summary.scanned == 0
+    assert second.summary.size == first.summary.size
+    assert second.summary.files == 2
+
+    (tree / "b" / "three.txt").write_bytes(b"x" * 30_000)
+    third = usage(tree, UsageCache(cache_path))
+    assert third.summary.scanned == 1
+    assert third.summary.files == 3
+    assert third.summary.size > second.summary.size
+
+
+def test_no_cache_reads_every_directory(tree, tmp_path):
+    cache = UsageCache(str(tmp_path / "cache"))
+    usage(tree, cache)
+    assert usage(tree, cache, "--no-cache").summary.scanned == 3
+
+
+def test_a_recently_modified_directory_is_not_cached(tree, tmp_path):
+    # its mtime may not change again if a file is added within the same tick
+    (tree / "a" / "new.txt").write_bytes(b"x")
+    cache_path = str(tmp_path / "cache")
+    usage(tree, UsageCache(cache_path))
+    assert usage(tree, UsageCache(cache_path)).summary.scanned == 1
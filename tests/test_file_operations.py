@@ -0,0 +1,90 @@
+"""
+Runs bulk and wildcard file operations from the command line to the file
+system: several files per command, patterns, and the pairs of 'rename'.
+"""
+
+# pylint: disable=missing-function-docstring
+
+import pytest
+
+from compute import ComputeOperations
+from input_parser import InputParser
+from main import get_platform
+from validator.stat_snapshot import begin_snapshot
+from validator.static.exceptions import FileOperationError
+
+
+def run(command: str) -> None:
+    begin_snapshot()
+    parsed_input = InputParser(command).retrieved_parsed_input()
+    ComputeOperations(parsed_input, get_platform()).execute_operation()
+
+
+def names(directory) -> list[str]:
+    return sorted(path.name for path in directory.iterdir())
+
+
+@pytest.fixture(autouse=True)
+def fixture_working_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+
+def test_create_and_delete_several_files(tmp_path):
+    run("create a.txt b.txt c.log")
+    assert names(tmp_path) == ["a.txt", "b.txt", "c.log"]
+
+    run("delete a.txt c.log")
+    assert names(tmp_path) == ["b.txt"]
+
+
+def test_a_failed_file_does_not_stop_the_batch(tmp_path):
+    run("create a.txt")
+    with pytest.raises(FileOperationError, match="1 of 2 files succeeded"):
+        run("create a.txt b.txt")
+    assert names(tmp_path) == ["a.txt", "b.txt"]
+
+
+def test_rename_pairs_of_old_and_new_names(tmp_path):
+    run("create a.txt b.txt")
+    run("rename a.txt x.txt b.txt y.txt")
+    assert names(tmp_path) == ["x.txt", "y.txt"]
+
+
+def test_rename_a_pattern_to_a_new_extension(tmp_path):
+    run("create a.txt b.txt c.log")
+    run("rename *.txt .csv")
+    assert names(tmp_path) == ["a.csv", "b.csv", "c.log"]
+
+
+def test_a_wildcard_does_not_match_hidden_files(tmp_path):
+    (tmp_path / ".hidden.txt").touch()
+    run("create a.txt")
+    run("delete *.txt")
+    assert names(tmp_path) == [".hidden.txt"]
+
+
+def test_a_pattern_without_matches_is_reported(tmp_path):
+    run("create a.log")
+    with pytest.raises(FileOperationError, match="No files match"):
+        run("rename *.txt .csv")
+    assert names(tmp_path) == ["a.log"]
+
+
+def test_rename_onto_an_existing_file_is_refused(tmp_path):
+    run("create a.txt b.txt")
+    with pytest.raises(FileOperationError, match="already exists"):
+        run("rename a.txt b.txt")
+    assert names(tmp_path) == ["a.txt", "b.txt"]
+
+
+@pytest.mark.parametrize("command", [
+    "create *.txt",
+    "rename a.txt b.txt c.txt",
+    "rename *.txt csv",
+    "rename a*.txt b*.txt",
+])
+def test_invalid_shapes_are_refused_before_anything_runs(command, tmp_path):
+    (tmp_path / "a.txt").touch()
+    with pytest.raises(FileOperationError):
+        InputParser(command).retrieved_parsed_input()
+    assert names(tmp_path) == ["a.txt"]
@@ -0,0 +1,21 @@
+"""
+Checks the labels of the phase metrics and their Prometheus textfile.
+"""
+
+# pylint: disable=missing-function-docstring
+
+from phase_metrics import INVALID_COMMAND, Phase, PhaseMetrics, command_type
+
+
+def test_an_unknown_command_is_labelled_invalid():
+    assert command_type(["bogus", "a.txt"]) == INVALID_COMMAND
+    assert command_type(['bo"gus']) == INVALID_COMMAND
+    assert command_type(["create", "a.txt"]) == "create"
+    assert command_type(["list", ".", "|", "modify", "a.txt", "add", "r"]) == "pipeline"
+
+
+def test_label_values_are_escaped():
+    metrics = PhaseMetrics()
+    metrics.enabled = True
+    metrics.record('a\\b"c\nd', Phase.PARSE, metrics.clock())
+    assert 'command="a\\\\b\\"c\\nd",phase="parse"' in metrics.to_prometheus()
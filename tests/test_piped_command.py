@@ -0,0 +1,55 @@
+"""
+Checks how a piped command is split into stages and which stages are refused.
+"""
+
+# pylint: disable=missing-function-docstring
+
+import pytest
+
+from SyntaxShift.pipe_operation_handler import PipeCommandHandler
+from validator.piped_command import PipedCommandValidator
+from validator.stat_snapshot import begin_snapshot
+from validator.static.exceptions import InvalidCommand
+
+
+def validate(command: str) -> bool:
+    begin_snapshot()
+    return PipedCommandValidator(command.split()).validate()
+
+
+@pytest.fixture(autouse=True)
+def fixture_working_directory(tmp_path, monkeypatch):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "a.txt").write_text("a\n", encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+
+
+def test_split_on_every_pipe():
+    stages = PipeCommandHandler("list . | modify a.txt add r".split()).split_piped_commands()
+    assert stages == [["list", "."], ["modify", "a.txt", "add", "r"]]
+
+
+def test_adjacent_pipes_give_an_empty_stage():
+    stages = PipeCommandHandler("list . | | list .".split()).split_piped_commands()
+    assert stages == [["list", "."], [], ["list", "."]]
+
+
+def test_an_empty_stage_is_refused():
+    with pytest.raises(ValueError):
+        validate("create b.txt | | list .")
+
+
+def test_a_stage_must_pipe_into_the_next():
+    assert validate("create b.txt | list .")
+    assert not validate("create b.txt | create c.txt")
+
+
+@pytest.mark.parametrize("command", ["change sub | list .", "list . | change sub"])
+def test_change_is_refused_as_a_stage(command):
+    with pytest.raises(InvalidCommand, match="'change'"):
+        validate(command)
+
+
+def test_options_of_list_are_refused_in_a_stage():
+    with pytest.raises(InvalidCommand, match="--sort"):
+        validate("create b.txt | list . --sort size")
@@ -0,0 +1,54 @@
+"""
+Runs scripts through 'ScriptRunner': the syntax of every line is checked
+before anything runs, the file system when each line runs.
+"""
+
+# pylint: disable=missing-function-docstring
+
+import io
+
+import pytest
+
+from compute import ComputeOperations
+from main import get_platform
+from script_runner import ScriptRunner
+
+
+def run_script(*lines: str) -> int:
+    def dispatch(parsed_input):
+        ComputeOperations(parsed_input, get_platform()).execute_operation()
+
+    return ScriptRunner(dispatch, io.StringIO()).execute(lines)
+
+
+@pytest.fixture(autouse=True)
+def fixture_working_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+
+def test_a_line_uses_what_the_lines_before_it_created(tmp_path):
+    assert run_script("make d1", "change d1", "create a.txt", "change ..") == 0
+    assert (tmp_path / "d1" / "a.txt").is_file()
+
+
+def test_an_invalid_line_stops_the_script_before_anything_runs(tmp_path):
+    assert run_script("make d1", "bogus", "create a.txt b.txt c.txt", "create x.txt &") == 1
+    assert not (tmp_path / "d1").exists()
+
+
+def test_a_rename_without_its_new_name_is_refused_before_anything_runs(tmp_path):
+    assert run_script("make d1", "create a.txt", "rename a.txt") == 1
+    assert not (tmp_path / "d1").exists()
+
+
+def test_a_missing_path_stops_the_script_at_its_line(tmp_path, capsys):
+    assert run_script("make d1", "change missing", "create a.txt") == 1
+    assert (tmp_path / "d1").is_dir()
+    assert not (tmp_path / "a.txt").exists()
+    assert "line 2: change missing" in capsys.readouterr().err
+
+
+def test_comments_blank_lines_and_exit(tmp_path):
+    assert run_script("# setup", "", "make d1", "e", "make d2") == 0
+    assert (tmp_path / "d1").is_dir()
+    assert not (tmp_path / "d2").exists()
@@ -0,0 +1,29 @@
+"""
+Checks that the validators answer their file system checks from the stat snapshot.
+"""
+
+# pylint: disable=missing-function-docstring
+
+import os
+
+from input_parser import InputParser
+
+
+def test_an_inspection_command_stats_each_path_once(tmp_path, monkeypatch):
+    (tmp_path / "logs").mkdir()
+    (tmp_path / "logs" / "app.txt").write_text("error\n", encoding="utf-8")
+    os.symlink("logs", tmp_path / "current")
+    monkeypatch.chdir(tmp_path)
+
+    for command in ("search error logs/app.txt", "usage logs"):
+        parser = InputParser(command)
+        parser.retrieved_parsed_input()
+        assert parser.snapshot.max_stats_per_path == 1, command
+
+    # a symlink is 'lstat'-ed, then its target 'stat'-ed, once
+    for command in ("search error current", "find current"):
+        parser = InputParser(command)
+        parser.retrieved_parsed_input()
+        assert parser.snapshot.stat_calls == {"current": 2}, command
+        parser.retrieved_parsed_input()
+        assert parser.snapshot.stat_calls == {"current": 2}, command
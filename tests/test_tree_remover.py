@@ -0,0 +1,95 @@
+"""
+Removes trees with 'TreeRemover': symlinks are unlinked and never followed,
+and a failure keeps the directories above it instead of stopping the removal.
+"""
+
+# pylint: disable=missing-function-docstring
+
+import os
+
+import pytest
+
+from SyntaxShift.tree_remover import TreeRemover
+
+
+def build_tree(root, depth: int = 3, width: int = 3) -> int:
+    """
+    Creates 'width' files and subdirectories per directory, returns the number of files.
+    """
+    root.mkdir()
+    files = 0
+    for index in range(width):
+        (root / f"f{index}.txt").write_text("x", encoding="utf-8")
+        files += 1
+        if depth > 1:
+            files += build_tree(root / f"d{index}", depth - 1, width)
+    return files
+
+
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_the_whole_tree_is_removed(tmp_path, jobs):
+    root = tmp_path / "tree"
+    files = build_tree(root)
+
+    progress = TreeRemover(str(root), jobs).remove()
+
+    assert not root.exists()
+    assert progress.failures == []
+    assert progress.files == files
+    assert progress.directories == 1 + 3 + 9
+
+
+def test_a_symlink_in_the_tree_is_unlinked_not_followed(tmp_path):
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    (outside / "keep.txt").write_text("x", encoding="utf-8")
+    root = tmp_path / "tree"
+    root.mkdir()
+    (root / "link").symlink_to(outside, target_is_directory=True)
+
+    TreeRemover(str(root)).remove()
+
+    assert not root.exists()
+    assert (outside / "keep.txt").is_file()
+
+
+def test_a_symlink_root_is_unlinked_not_followed(tmp_path):
+    target = tmp_path / "target"
+    build_tree(target, depth=1)
+    link = tmp_path / "link"
+    link.symlink_to(target, target_is_directory=True)
+
+    progress = TreeRemover(str(link)).remove()
+
+    assert not os.path.lexists(link)
+    assert sorted(path.name for path in target.iterdir()) == ["f0.txt", "f1.txt", "f2.txt"]
+    assert progress.files == 1
+
+
+def test_a_failure_keeps_the_directories_above_it(tmp_path, monkeypatch):
+    root = tmp_path / "tree"
+    build_tree(root, depth=2)
+    (root / "d1" / "locked.txt").write_text("x", encoding="utf-8")
+
+    unlink = os.unlink
+
+    def failing_unlink(path, *args, **kwargs):
+        if os.path.basename(path) == "locked.txt":
+            raise PermissionError(1, "Operation not permitted")
+        return unlink(path, *args, **kwargs)
+
+    monkeypatch.setattr(os, "unlink", failing_unlink)
+    progress = TreeRemover(str(root), jobs=2).remove()
+
+    assert sorted(path.name for path in root.iterdir()) == ["d1"]
+    assert os.listdir(root / "d1") == ["locked.txt"]
+    assert len(progress.failures) == 1
+    assert "locked.txt" in progress.failures[0]
+    assert "1 failed" in str(progress)
+
+
+def test_a_missing_root_is_reported(tmp_path):
+    progress = TreeRemover(str(tmp_path / "missing")).remove()
+
+    assert len(progress.failures) == 1
+    assert "missing" in progress.failures[0]
@@ -0,0 +1,185 @@
+"""
+This module holds the registry of every command the shell supports.
+
+The registry is built once, when the module is first imported, and maps
+each command name to a 'CommandSpec' describing its arguments, the
+validator that checks it and the handler that translates it, so looking a
+command up is a single dictionary access. 'InputParser' and the validators
+all dispatch through it: adding a command means registering it here.
+
+Validators and handlers are referenced by their 'module:Class' path and
+imported when first used, which lets the validators import this registry
+without a circular import and keeps them out of the startup of the shell:
+a command only imports the modules it needs the first time it runs.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from importlib import import_module
+from typing import Dict, Iterator, List, Tuple
+
+from validator.static.exceptions import InvalidCommand
+
+
+@lru_cache(maxsize=None)
+def resolve(path: str) -> type:
+    """
+    Imports and returns the class at 'module:Class'.
+    """
+    module_name, class_name = path.split(":")
+    return getattr(import_module(module_name), class_name)
+
+
+@dataclass(frozen=True)
+class CommandSpec:
+    """
+    Describes a single command.
+
+    Attributes:
+        name (str): The command name typed by the user.
+        arguments (Tuple[str, ...]): The argument schema, the name of each argument in order,
+            a trailing '...' marks an argument that may be repeated.
+        min_args (int): The minimum number of arguments.
+        max_args (int | None): The maximum number of arguments, None when unbounded.
+        validator_path (str): The 'module:Class' of the validator of the command.
+        handler_path (str | None): The 'module:Class' of the handler translating the command.
+        pipes_into (str | None): The only command this command may be piped into.
+    """
+    name: str
+    arguments: Tuple[str, ...]
+    min_args: int
+    max_args: int | None
+    validator_path: str
+    handler_path: str | None = None
+    pipes_into: str | None = None
+
+    @property
+    def validator(self) -> type:
+        """
+        The validator class of the command, imported on first use.
+        """
+        return resolve(self.validator_path)
+
+    @property
+    def handler(self) -> type | None:
+        """
+        The handler class of the command, None for the builtins without one.
+        """
+        return resolve(self.handler_path) if self.handler_path else None
+
+    def usage(self) -> str:
+        """
+        Returns the usage line of the command, 'copy <file|pattern...> <destination>'.
+        """
+        return " ".join([self.name, *(f"<{argument}>" for argument in self.arguments)])
+
+    def check_arity(self, parsed_inputs: List[str]) -> None:
+        """
+        Raises:
+            InvalidCommand: If the command is given too few or too many arguments.
+        """
+        count = len(parsed_inputs) - 1
+        if count < self.min_args or (self.max_args is not None and count > self.max_args):
+            raise InvalidCommand(
+                f"Invalid number of arguments for '{self.name}', usage: {self.usage()}"
+            )
+
+    def validate(self, parsed_inputs: List[str]) -> bool:
+        """
+        Checks the arity then runs the registered validator on the command.
+        """
+        self.check_arity(parsed_inputs)
+        return self.validator.from_parsed_input(parsed_inputs).validate()
+
+
+class CommandRegistry:
+    """
+    A name to 'CommandSpec' mapping with O(1) lookups.
+    """
+
+    def __init__(self) -> None:
+        self._commands: Dict[str, CommandSpec] = {}
+
+    def register(self, spec: CommandSpec) -> None:
+        """
+        Adds a command.
+
+        Raises:
+            ValueError: If a command of the same name is already registered.
+        """
+        if spec.name in self._commands:
+            raise ValueError(f"Command '{spec.name}' is already registered")
+        self._commands[spec.name] = spec
+
+    def get(self, name: str) -> CommandSpec | None:
+        """
+        Returns the spec of the command, None if it is not registered.
+        """
+        return self._commands.get(name)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._commands
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._commands)
+
+    def names(self) -> List[str]:
+        """
+        Returns the names of the commands, in registration order.
+        """
+        return list(self._commands)
+
+
+FILE_OPERATION_VALIDATOR = "validator.file_operation_validator:FileOperationValidator"
+FILE_ACCESS_VALIDATOR = "validator.file_access_validator:FileAccessValidator"
+DIRECTORY_VALIDATOR = "validator.directory_management_validator:DirectoryManagementValidator"
+HELP_VALIDATOR = "validator.help_validator:HelpValidator"
+JOB_CONTROL_VALIDATOR = "validator.job_control_validator:JobControlValidator"
+STATS_VALIDATOR = "validator.stats_validator:StatsValidator"
+HISTORY_VALIDATOR = "validator.history_validator:HistoryValidator"
+INSPECTION_VALIDATOR = "validator.inspection_validator:InspectionValidator"
+PIPE_VALIDATOR = "validator.piped_command:PipedCommandValidator"
+REDIRECT_VALIDATOR = "validator.redirect_validator:RedirectValidator"
+
+FILE_OPERATION_HANDLER = "SyntaxShift.file_operation_handler:FileOperationHandler"
+FILE_ACCESS_HANDLER = "SyntaxShift.file_access_handler:FileAccessHandler"
+DIRECTORY_HANDLER = "SyntaxShift.directory_handler:DirectoryManagementHandler"
+PIPE_HANDLER = "SyntaxShift.pipe_operation_handler:PipeCommandHandler"
+REDIRECT_HANDLER = "SyntaxShift.redirect_handlier:RedirectHandler"
+
+
+COMMANDS = CommandRegistry()
+
+for command_spec in (
+    CommandSpec("create", ("file...",), 1, None, FILE_OPERATION_VALIDATOR,
+                FILE_OPERATION_HANDLER, "list"),
+    CommandSpec("delete", ("file|pattern...",), 1, None, FILE_OPERATION_VALIDATOR,
+                FILE_OPERATION_HANDLER, "list"),
+    # the new name is asked at the prompt of the interactive shell before validation, never later
+    CommandSpec("rename", ("file|pattern", "new_file|.ext..."), 2, None, FILE_OPERATION_VALIDATOR,
+                FILE_OPERATION_HANDLER, "list"),
+    CommandSpec("copy", ("file|pattern...", "destination", "--preserve"), 2, None,
+                FILE_OPERATION_VALIDATOR, FILE_OPERATION_HANDLER, "list"),
+    CommandSpec("modify", ("path", "action", "permission..."), 3, 5, FILE_ACCESS_VALIDATOR,
+                FILE_ACCESS_HANDLER),
+    CommandSpec("list", ("path", "option..."), 1, None, FILE_ACCESS_VALIDATOR,
+                FILE_ACCESS_HANDLER, "modify"),
+    CommandSpec("make", ("directory", "--parents"), 1, 2, DIRECTORY_VALIDATOR,
+                DIRECTORY_HANDLER, "list"),
+    CommandSpec("remove", ("directory",), 1, 1, DIRECTORY_VALIDATOR, DIRECTORY_HANDLER, "list"),
+    # not a pipeline stage, it would only change the working directory of its own process
+    CommandSpec("change", ("directory",), 1, 1, DIRECTORY_VALIDATOR, DIRECTORY_HANDLER),
+    CommandSpec("pwd", (), 0, 0, DIRECTORY_VALIDATOR, DIRECTORY_HANDLER),
+    CommandSpec("help", ("command",), 0, None, HELP_VALIDATOR),
+    CommandSpec("jobs", (), 0, 0, JOB_CONTROL_VALIDATOR),
+    CommandSpec("wait", ("job_id",), 0, 1, JOB_CONTROL_VALIDATOR),
+    CommandSpec("kill", ("job_id",), 1, 1, JOB_CONTROL_VALIDATOR),
+    CommandSpec("stats", ("action", "path"), 0, 2, STATS_VALIDATOR),
+    CommandSpec("history", ("count|search|prefix", "text..."), 0, None, HISTORY_VALIDATOR),
+    CommandSpec("watch", ("directory", "--recursive", "--poll"), 1, 3, INSPECTION_VALIDATOR),
+    CommandSpec("find", ("root", "option..."), 1, None, INSPECTION_VALIDATOR),
+    CommandSpec("search", ("pattern", "path", "option..."), 2, None, INSPECTION_VALIDATOR),
+    CommandSpec("usage", ("directory", "option..."), 1, None, INSPECTION_VALIDATOR),
+    CommandSpec("dupes", ("directory", "option..."), 1, None, INSPECTION_VALIDATOR),
+):
+    COMMANDS.register(command_spec)
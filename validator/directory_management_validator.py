@@ -1,8 +1,11 @@
 from typing import List
 import os
+import stat
 
 from validator.validator import Validator
+from validator.static.constant_types import MAKE_PARENTS_OPTIONS
 from validator.static.exceptions import DirectoryManagementError
+from validator.stat_snapshot import current_snapshot
 
 class DirectoryManagementValidator(Validator):
 
@@ -21,9 +24,13 @@ class DirectoryManagementValidator(Validator):
         elif self.command[0] == "pwd" and len(self.command) == 1:
             return True
 
+        if self.command[0] == "make":
+            return self.validate_make()
+        if self.command[0] == "remove":
+            return self.validate_remove()
         return self.validate_dir()
 
-    
+
     def validate_dir(self):
         """
         Validates the directory command based on its requirements.
@@ -43,6 +50,77 @@ class DirectoryManagementValidator(Validator):
 
         raise DirectoryManagementError(f"Invalid Command: '{command}' for path existence is: {path_exists}")
 
-    def path_exists(self):
-        return os.path.exists(self.command[1])
+    def validate_make(self):
+        """
+        Validates 'make <directory> [--parents]', without '--parents' the parent
+        directory must already exist, with it an existing directory is accepted.
+        """
+        options = self.command[2:]
+        unknown = [option for option in options if option not in MAKE_PARENTS_OPTIONS]
+        if unknown:
+            raise DirectoryManagementError(
+                f"Invalid Command: unknown option {unknown} for 'make', "
+                f"expected one of {MAKE_PARENTS_OPTIONS}"
+            )
+
+        snapshot = current_snapshot()
+        path = self.command[1]
+
+        if options:
+            if snapshot.exists(path) and not snapshot.is_dir(path):
+                raise DirectoryManagementError(
+                    f"Invalid Command: '{path}' exists and is not a directory"
+                )
+            return True
+
+        parent = os.path.dirname(os.path.normpath(path))
+        if parent and not snapshot.is_dir(parent):
+            raise DirectoryManagementError(
+                f"Invalid Command: parent directory '{parent}' does not exist, "
+                f"use 'make {path} --parents'"
+            )
+        return self.validate_dir()
+
+    def validate_remove(self):
+        """
+        Validates 'remove <directory>', which deletes the whole tree: the
+        path must be a directory (a symlink is unlinked, not followed), and
+        '.', '..', the root and the working directory or one of its ancestors
+        are refused, as 'rm -r' does.
+        """
+        path = self.command[1]
+        info = current_snapshot().lstat(path)
+        if info is None:
+            return self.validate_dir()
+        if not stat.S_ISDIR(info.st_mode) and not stat.S_ISLNK(info.st_mode):
+            raise DirectoryManagementError(
+                f"Invalid Command: '{path}' is not a directory, use 'delete' for files"
+            )
 
+        if os.path.basename(os.path.normpath(path)) in (os.curdir, os.pardir):
+            raise DirectoryManagementError(f"Invalid Command: refusing to remove '{path}'")
+
+        # the parent is resolved, not the path, so a symlink is checked as itself
+        absolute = os.path.abspath(path)
+        parent = os.path.realpath(os.path.dirname(absolute))
+        target = os.path.join(parent, os.path.basename(absolute))
+        if os.path.dirname(target) == target:
+            raise DirectoryManagementError(
+                f"Invalid Command: refusing to remove the root directory '{path}'"
+            )
+
+        working_directory = os.path.realpath(os.getcwd())
+        try:
+            common = os.path.commonpath([target, working_directory])
+            holds_working_directory = common == target
+        except ValueError:
+            # on different drives
+            holds_working_directory = False
+        if holds_working_directory:
+            raise DirectoryManagementError(
+                f"Invalid Command: refusing to remove '{path}', it holds the working directory"
+            )
+        return True
+
+    def path_exists(self):
+        return current_snapshot().exists(self.command[1])
@@ -1,7 +1,8 @@
 
-import os
-
+from SyntaxShift.listing_engine import ListOptions
+from SyntaxShift.pattern_expander import is_pattern
 from validator.static.exceptions import FileAccessError, InvalidCommand
+from validator.stat_snapshot import current_snapshot
 from validator.validator import Validator
 
 class FileAccessValidator(Validator):
@@ -45,9 +46,10 @@ class FileAccessValidator(Validator):
     def validate_list(self):
 
         folder_file_path = self.access[1]
-        if not os.path.exists(folder_file_path):
+        if not current_snapshot().exists(folder_file_path):
             raise FileAccessError(f"Specified path does not exists, {folder_file_path}")
 
+        ListOptions.from_arguments(self.access[2:])
         return True
 
     def validate_modify(self):
@@ -65,7 +67,8 @@ class FileAccessValidator(Validator):
         if len(self.access) < 4:
             raise InvalidCommand(f"Invalid command, {self.access},length: {len(self.access)} (expected at least 4)")
         folder_file_path = self.access[1]
-        if not os.path.exists(folder_file_path):
+        # a wildcard path is expanded, and reported when nothing matches, by the handler
+        if not is_pattern(folder_file_path) and not current_snapshot().exists(folder_file_path):
             raise FileAccessError(f"Specified path does not exists, {folder_file_path}")
 
         if not self.validate_action():
@@ -97,11 +100,11 @@ class FileAccessValidator(Validator):
         """
         permission = self.access[3:]
 
-        # Check basic constraints: length must be between 1 and 3, must contain 'f' if length is 1
-        if not (1 <= len(permission) <= 3) or (len(permission) == 1 and permission[0] != 'f'):
+        # Check basic constraints: length must be between 1 and 3
+        if not 1 <= len(permission) <= 3:
             return False
 
-        # Check that all characters are valid permissions ('r', 'w', 'x') and no 'f' is present
+        # Check that all characters are valid permissions ('r', 'w', 'x')
         if not all(p in FileAccessValidator.VALID_PERMISSIONS for p in permission):
             return False
 
@@ -1,15 +1,25 @@
+from SyntaxShift.pattern_expander import is_pattern
 from validator.validator import Validator
-from validator.static.constant_types import VALID_EXTENSIONS
+from validator.static.constant_types import COPY_PRESERVE_OPTIONS, FileOperation, VALID_EXTENSIONS
 from validator.static.exceptions import FileOperationError
+from validator.stat_snapshot import current_snapshot
 
 class FileOperationValidator(Validator):
 
-    def __init__(self, args):
+    def __init__(self, args, operation: str | None = None):
         super().__init__()
-        if len(args) != 1:
+        # the number of arguments of each operation is checked by the command registry
+        if not args:
             raise FileOperationError(f"Invalid file operation is invalid length, for file: {args}")
         self.args: list[str] = args
+        self.operation = operation
 
+    @classmethod
+    def from_parsed_input(cls, parsed_inputs: list[str]) -> "FileOperationValidator":
+        return cls(parsed_inputs[1:], parsed_inputs[0])
+
+    def validate(self) -> bool:
+        return self.is_operation_valid()
 
     def is_operation_valid(self) -> bool:
         """
@@ -17,14 +27,79 @@ class FileOperationValidator(Validator):
             This function checks whether both the operation and the provided arguments are valid.
             For example, if the user wants to create a file, the function checks if the operation
             is 'create' and the arguments include a valid file extension (e.g., 'filename.txt').
+            Several files may be given, 'delete' and 'rename' also accept wildcard patterns
+            and 'rename' takes pairs of old and new names or a pattern and a new extension.
+            'copy' takes files or patterns followed by the destination file or directory.
             :return: True if both the operation and its arguments are valid.
         """
+        if self.operation == FileOperation.COPY:
+            return self.validate_copy_arguments()
 
-        if self.valid_file_extension(self.args[0]):
-            return True
+        if self.operation == FileOperation.RENAME:
+            self.validate_rename_arguments()
+        elif self.operation == FileOperation.CREATE and any(is_pattern(file) for file in self.args):
+            raise FileOperationError(f"Wildcards cannot be used to create files.. {self.args}")
+
+        for file in self.args:
+            if not self.valid_file_extension(file):
+                raise FileOperationError(f"Invalid or missing file extention.. {file}")
+
+        return True
+
+
+    def validate_rename_arguments(self):
+        """
+            Checks the shapes rename accepts: pairs of old and new names, or one
+            pattern followed by the new extension of its matches.
+        """
+        if len(self.args) == 2 and is_pattern(self.args[0]):
+            if self.args[1] not in VALID_EXTENSIONS:
+                raise FileOperationError(
+                    f"Renaming '{self.args[0]}' expects a new file extension, got '{self.args[1]}'"
+                )
+            return
 
-        raise FileOperationError(f"Invalid or missing file extention.. {self.args[0]}")
+        if any(is_pattern(file) for file in self.args):
+            raise FileOperationError(
+                "Wildcards in rename are only supported as: rename <pattern> <.ext>"
+            )
 
+        if len(self.args) > 1 and len(self.args) % 2:
+            raise FileOperationError(
+                f"Rename expects pairs of old and new filenames, got {len(self.args)} names"
+            )
+
+    def validate_copy_arguments(self) -> bool:
+        """
+            Checks the sources of 'copy' and its destination, several files or a
+            pattern must be copied into an existing directory.
+        """
+        files = [file for file in self.args if file not in COPY_PRESERVE_OPTIONS]
+        if len(files) < 2:
+            raise FileOperationError(
+                f"Copy expects the files to copy and a destination, got {files}"
+            )
+
+        *sources, destination = files
+        for file in sources:
+            if not self.valid_file_extension(file):
+                raise FileOperationError(f"Invalid or missing file extention.. {file}")
+
+        if is_pattern(destination):
+            raise FileOperationError(
+                f"Wildcards cannot be used in the copy destination.. {destination}"
+            )
+
+        if current_snapshot().is_dir(destination):
+            return True
+        if len(sources) > 1 or is_pattern(sources[0]):
+            raise FileOperationError(
+                "Copying several files expects an existing destination directory, "
+                f"got '{destination}'"
+            )
+        if not self.valid_file_extension(destination):
+            raise FileOperationError(f"Invalid or missing file extention.. {destination}")
+        return True
 
     @staticmethod
     def valid_file_extension(file: str) -> bool:
@@ -2,21 +2,28 @@ from validator.validator import Validator
 
 class HelpValidator(Validator):
 
+    SEARCH = "search"
+
     def __init__(self, parsed_inputs):
         super().__init__()
         self.parsed_inputs = parsed_inputs
 
 
+    def validate(self) -> bool:
+        return self.valid_help_input()
+
     def valid_help_input(self):
         """
             if the user request to use the help operation, this function is called to validate
             the user input for the help command, it checks id the user is requesting
             specific help for a supported command or the general help where list all
-            supported commands.
+            supported commands, or is searching the help details with 'help search <terms>'.
             :return: True or False.
         """
-        valid_help = set(self.get_valid_operations()) - {"help"}
         if len(self.parsed_inputs) == 1:
             return True
 
-        return self.parsed_inputs[1] in valid_help
\ No newline at end of file
+        if len(self.parsed_inputs) > 2:
+            return self.parsed_inputs[1] == HelpValidator.SEARCH
+
+        return self.parsed_inputs[1] != "help" and self.parsed_inputs[1] in self.REGISTRY
\ No newline at end of file
@@ -0,0 +1,36 @@
+from typing import List
+
+from validator.validator import Validator
+from validator.static.exceptions import HistoryError
+
+
+class HistoryValidator(Validator):
+    """
+        Validates the 'history' builtin: 'history [count]' shows the last
+        commands, 'history search <text>' the newest commands containing the
+        text and 'history prefix <text>' those starting with it.
+    """
+
+    SEARCH = "search"
+    PREFIX = "prefix"
+
+    def __init__(self, parsed_inputs: List[str]):
+        super().__init__()
+        self.parsed_inputs = parsed_inputs
+
+    def validate(self) -> bool:
+        if len(self.parsed_inputs) == 1:
+            return True
+
+        action = self.parsed_inputs[1]
+        if action in (HistoryValidator.SEARCH, HistoryValidator.PREFIX):
+            if len(self.parsed_inputs) < 3:
+                raise HistoryError(f"Usage: history {action} <text>")
+            return True
+
+        if len(self.parsed_inputs) > 2 or not action.isdigit() or int(action) == 0:
+            raise HistoryError(
+                f"Invalid history argument: '{' '.join(self.parsed_inputs[1:])}', "
+                "expected a count, 'search <text>' or 'prefix <text>'"
+            )
+        return True
@@ -0,0 +1,95 @@
+from typing import List
+import os
+
+from SyntaxShift.content_search import SearchOptions, compile_pattern
+from SyntaxShift.disk_usage import UsageOptions
+from SyntaxShift.duplicate_finder import DupesOptions
+from SyntaxShift.file_finder import FindOptions
+from validator.validator import Validator
+from validator.static.constant_types import (
+    InspectionCommand,
+    VALID_EXTENSIONS,
+    WATCH_POLL_OPTIONS,
+    WATCH_RECURSIVE_OPTIONS,
+)
+from validator.static.exceptions import InspectionError
+from validator.stat_snapshot import current_snapshot
+
+
+class InspectionValidator(Validator):
+    """
+        Validates the builtins that inspect a directory tree:
+        'watch <directory> [--recursive] [--poll]' streams the changes of the directory,
+        'find <root> [options]' the files of the tree passing the filters,
+        'search <pattern> <path> [options]' the lines of the files matching the pattern,
+        'usage <directory> [options]' the space taken by its subdirectories,
+        'dupes <directory> [options]' the files of the tree with the same contents.
+    """
+
+    def __init__(self, parsed_inputs: List[str]):
+        super().__init__()
+        self.parsed_inputs = parsed_inputs
+
+    def validate(self) -> bool:
+        if self.parsed_inputs[0] == InspectionCommand.WATCH:
+            return self.validate_watch()
+        if self.parsed_inputs[0] == InspectionCommand.FIND:
+            FindOptions.from_arguments(self.parsed_inputs[2:])
+            return self.validate_directory(self.parsed_inputs[1])
+        if self.parsed_inputs[0] == InspectionCommand.SEARCH:
+            return self.validate_search()
+        if self.parsed_inputs[0] == InspectionCommand.USAGE:
+            UsageOptions.from_arguments(self.parsed_inputs[2:])
+            return self.validate_directory(self.parsed_inputs[1])
+        if self.parsed_inputs[0] == InspectionCommand.DUPES:
+            DupesOptions.from_arguments(self.parsed_inputs[2:])
+            return self.validate_directory(self.parsed_inputs[1])
+        raise InspectionError(f"Invalid Command: '{self.parsed_inputs[0]}'")
+
+    def validate_directory(self, path: str) -> bool:
+        """
+        Raises:
+            InspectionError: If the path is not a readable directory.
+        """
+        snapshot = current_snapshot()
+        if not snapshot.is_dir(path, follow_symlinks=True):
+            raise InspectionError(
+                f"Invalid Command: '{self.parsed_inputs[0]}', not a directory: {path}"
+            )
+        if not snapshot.access(path, os.R_OK | os.X_OK):
+            raise InspectionError(
+                f"Invalid Command: '{self.parsed_inputs[0]}', cannot read the directory: {path}"
+            )
+        return True
+
+    def validate_watch(self) -> bool:
+        """
+        Validates 'watch <directory> [--recursive] [--poll]'.
+        """
+        options = self.parsed_inputs[2:]
+        known = (*WATCH_RECURSIVE_OPTIONS, *WATCH_POLL_OPTIONS)
+        unknown = [option for option in options if option not in known]
+        if unknown:
+            raise InspectionError(
+                f"Invalid Command: unknown option {unknown} for 'watch', expected one of {known}"
+            )
+        return self.validate_directory(self.parsed_inputs[1])
+
+    def validate_search(self) -> bool:
+        """
+        The pattern must compile, the path must be a directory, or a readable
+        file with one of the valid extensions.
+        """
+        pattern, path = self.parsed_inputs[1:3]
+        compile_pattern(pattern, SearchOptions.from_arguments(self.parsed_inputs[3:]))
+        snapshot = current_snapshot()
+        if snapshot.is_dir(path, follow_symlinks=True):
+            return self.validate_directory(path)
+
+        if not snapshot.is_file(path, follow_symlinks=True):
+            raise InspectionError(f"Invalid Command: 'search', no such file or directory: {path}")
+        if os.path.splitext(path)[1] not in VALID_EXTENSIONS:
+            raise InspectionError(f"Invalid Command: 'search', invalid file extension: {path}")
+        if not snapshot.access(path, os.R_OK):
+            raise InspectionError(f"Invalid Command: 'search', cannot read the file: {path}")
+        return True
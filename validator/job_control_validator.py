@@ -0,0 +1,32 @@
+from typing import List
+
+from validator.validator import Validator
+from validator.static.exceptions import JobControlError
+
+
+class JobControlValidator(Validator):
+    """
+        Validates the job control builtins 'jobs', 'wait [id]' and 'kill id',
+        the number of arguments of each is checked by the command registry.
+        Whether the job exists is only known when the command runs.
+    """
+
+    def __init__(self, parsed_inputs: List[str]):
+        super().__init__()
+        self.parsed_inputs = parsed_inputs
+
+    def validate(self) -> bool:
+        for job_id in self.parsed_inputs[1:]:
+            if not job_id.lstrip("%").isdigit():
+                raise JobControlError(
+                    f"Invalid job id: '{job_id}', expected a job number such as 1 or %1"
+                )
+        return True
+
+    @staticmethod
+    def job_id(argument: str) -> int:
+        """
+            Returns:
+                int: The number of a job id given as '1' or '%1'.
+        """
+        return int(argument.lstrip("%"))
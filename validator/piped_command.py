@@ -1,69 +1,65 @@
 from typing import List
 
+from SyntaxShift.pipe_operation_handler import PipeCommandHandler
 from validator.validator import Validator
+from validator.static.constant_types import DirectoryOperation, FilePermission
+from validator.static.exceptions import InvalidCommand
 
 class PipedCommandValidator(Validator):
     """
-    Validates piped commands to ensure operations on the right-hand side are valid.
+    Validates piped commands to ensure the operation of every stage is valid
+    for the stage feeding it.
     """
 
-    VALID_PIPED_COMMANDS = {
-        'list': 'modify',
-        'create': 'list',
-        'delete': 'list',
-        'rename': 'list',
-        'make': 'list',
-        'remove': 'list',
-        'change': 'list',
-    }
-
     def __init__(self, command):
         """
         Initialize the validator with a command.
 
         Args:
-            command (List[str]): The left-hand side command of the piped operation.
+            command (List[str]): The full piped command, stages separated by '|'.
         """
         super().__init__()
         self.command: List[str] = command
 
-    def get_piped_command(self):
-        """
-        Extracts and returns the portion of the command list following a pipe ("|").
-        """
-        if "|" in self.command:
-            pipe_index = self.command.index("|")
-            return self.command[pipe_index + 1:]
-        return []
+    def validate(self) -> bool:
+        return self.valid_piped_operations()
 
     def valid_piped_operations(self) -> bool:
         """
-        Validates the right-hand side operations in a piped command.
+        Validates every stage of a piped command through the command registry,
+        and every pair of adjacent stages against the command the left stage
+        may be piped into.
 
         Returns:
             bool: True if the piped operations are valid, False otherwise.
 
         Raises:
-            ValueError: If the piped operations list is empty.
+            ValueError: If a stage of the pipeline is empty.
+            InvalidCommand: If a 'list' stage is given options, or a stage is 'change'.
         """
 
-        piped_operations: list[str] = self.get_piped_command()
-        if not piped_operations:
+        stages = PipeCommandHandler(self.command).split_piped_commands()
+        if not all(stages):
             raise ValueError("Piped operations cannot be empty.")
-
-        valid_operations = set(self.get_valid_operations())
-        valid_operations.discard("help")  # Exclude "help" from valid piped operations.
-
-
-        if piped_operations[0] not in valid_operations:
+        for stage in stages:
+            if stage[0] == DirectoryOperation.CHANGE:
+                # a stage is a child process, 'change' would only move the directory of that child
+                raise InvalidCommand(
+                    "'change' cannot be a stage of a pipeline, run it on its own first"
+                )
+            if stage[0] == FilePermission.LIST and len(stage) > 2:
+                # a stage runs the platform listing, the options of the builtin 'list' do not apply
+                raise InvalidCommand(
+                    f"Options of 'list' are not supported in a pipeline: {' '.join(stage[2:])}"
+                )
+
+        specs = [self.REGISTRY.get(stage[0]) for stage in stages]
+        # Exclude the builtins without a handler ("help", job control) from valid piped operations.
+        if any(spec is None or spec.handler_path is None for spec in specs):
             return False
 
-        if self.command[0] == piped_operations[0]:
-            return False # Prevent self-referential operations.
-
-
-        required_command = PipedCommandValidator.VALID_PIPED_COMMANDS.get(self.command[0])
-        if not required_command or required_command != piped_operations[0]:
-            return False
-        return True
+        for left, right in zip(specs, specs[1:]):
+            if left.pipes_into is None or left.pipes_into != right.name:
+                return False
 
+        return all(spec.validate(stage) for spec, stage in zip(specs, stages))
@@ -1,9 +1,9 @@
-import os
 from typing import List
 
 from validator.validator import Validator
-from validator.static.constant_types import  VALID_EXTENSIONS
+from validator.static.constant_types import  InspectionCommand, VALID_EXTENSIONS
 from validator.static.exceptions import InvalidCommand
+from validator.stat_snapshot import current_snapshot
 
 
 class RedirectValidator(Validator):
@@ -41,7 +41,7 @@ class RedirectValidator(Validator):
             raise InvalidCommand("No redirection symbol ('<' or '>') found in the command.")
 
         if '>' in self.command:
-            return self.into_redirect()
+            return self.into_redirect() and self.validate_redirected_command('>')
 
         if '<' in self.command:
             return self.from_redirect()
@@ -74,12 +74,11 @@ class RedirectValidator(Validator):
         Raises:
             InvalidCommand: If the input file is invalid.
         """
-        commands = set(self.get_valid_operations()) - {"help", "pwd"}
         index = self.command.index(self.REDIRECT[0]) + 1
         file_exists = self.check_file_exists(index)
 
 
-        if self.command[0] not in commands:
+        if self.command[0] in ("help", "pwd") or self.command[0] not in self.REGISTRY:
             raise InvalidCommand(f"Into Redirect is invalid, command not supported {self.command}")
 
         if not file_exists:
@@ -90,6 +89,24 @@ class RedirectValidator(Validator):
             raise InvalidCommand("Input redirection symbol ('<') is missing a valid file.")
 
 
+    def validate_redirected_command(self, symbol: str) -> bool:
+        """
+        Validate the command on the left of the redirection symbol with the
+        validator registered for it.
+        """
+        command = self.command[:self.command.index(symbol)]
+        command_spec = self.REGISTRY.get(command[0])
+
+        # builtins without a handler ('help', job control) have no output to redirect,
+        # except the inspection commands, 'watch' never ends
+        redirected = (InspectionCommand.FIND, InspectionCommand.SEARCH,
+                      InspectionCommand.USAGE, InspectionCommand.DUPES)
+        if command_spec is None or (
+                command_spec.handler_path is None and command_spec.name not in redirected):
+            raise InvalidCommand(f"Redirect is invalid, command not supported {self.command}")
+
+        return command_spec.validate(command)
+
     def validate_file_extention(self, index):
 
 
@@ -102,5 +119,5 @@ class RedirectValidator(Validator):
 
     def check_file_exists(self, index):
         file = self.command[index]
-        return os.path.exists(file)
+        return current_snapshot().exists(file)
 
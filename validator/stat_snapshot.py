@@ -0,0 +1,152 @@
+"""
+This module provides the file system snapshot shared by the validators and
+handlers of a single command.
+
+The first time a path is looked up during a command it is 'lstat'-ed once
+and the result, including a missing path, is cached. Every later check of
+the same path in that command, in a validator or in a handler, is answered
+from the cache, which removes redundant syscalls and keeps validation and
+execution working from the same view of the path. The target of a symlink
+is only 'stat'-ed by the checks following it, and 'access' checks are
+cached the same way. Operations that change a path invalidate its entries.
+
+A snapshot is started for every command with 'begin_snapshot' and found by
+the validators and handlers with 'current_snapshot'. It is held in a
+context variable so commands running concurrently keep their own.
+"""
+
+from contextvars import ContextVar
+from typing import Dict, Tuple
+import os
+import stat
+
+
+class StatSnapshot:
+    """
+    Caches the 'lstat' result of every path a command touches.
+
+    Attributes:
+        lookups (int): The number of checks answered by the snapshot.
+        stat_calls (Dict[str, int]): The number of 'lstat' syscalls made for each path.
+    """
+
+    def __init__(self) -> None:
+        self._stats: Dict[str, os.stat_result | None] = {}
+        # the 'stat' of the symlinks followed, and the 'access' checks made
+        self._targets: Dict[str, os.stat_result | None] = {}
+        self._access: Dict[Tuple[str, int], bool] = {}
+        self.lookups = 0
+        self.stat_calls: Dict[str, int] = {}
+
+    def lstat(self, path: str) -> os.stat_result | None:
+        """
+        Returns:
+            os.stat_result | None: The 'lstat' result of the path, None if it does not exist.
+        """
+        self.lookups += 1
+        key = os.path.normpath(path)
+
+        if key not in self._stats:
+            self.stat_calls[key] = self.stat_calls.get(key, 0) + 1
+            try:
+                self._stats[key] = os.lstat(key)
+            except (FileNotFoundError, NotADirectoryError):
+                self._stats[key] = None
+        return self._stats[key]
+
+    def stat(self, path: str) -> os.stat_result | None:
+        """
+        Returns:
+            os.stat_result | None: The 'stat' result of the path, following a symlink,
+            None if it does not exist or the symlink is dangling.
+        """
+        result = self.lstat(path)
+        if result is None or not stat.S_ISLNK(result.st_mode):
+            return result
+
+        key = os.path.normpath(path)
+        if key not in self._targets:
+            self.stat_calls[key] = self.stat_calls.get(key, 0) + 1
+            try:
+                self._targets[key] = os.stat(key)
+            except OSError:
+                self._targets[key] = None
+        return self._targets[key]
+
+    def exists(self, path: str) -> bool:
+        """
+        Whether the path exists, a dangling symlink included.
+        """
+        return self.lstat(path) is not None
+
+    def is_dir(self, path: str, follow_symlinks: bool = False) -> bool:
+        """
+        Whether the path is a directory, a symlink to one only with 'follow_symlinks'.
+        """
+        result = self.stat(path) if follow_symlinks else self.lstat(path)
+        return result is not None and stat.S_ISDIR(result.st_mode)
+
+    def is_file(self, path: str, follow_symlinks: bool = False) -> bool:
+        """
+        Whether the path is a regular file, a symlink to one only with 'follow_symlinks'.
+        """
+        result = self.stat(path) if follow_symlinks else self.lstat(path)
+        return result is not None and stat.S_ISREG(result.st_mode)
+
+    def access(self, path: str, mode: int) -> bool:
+        """
+        Returns:
+            bool: Whether the user may access the path with 'mode', as 'os.access'.
+        """
+        self.lookups += 1
+        key = (os.path.normpath(path), mode)
+        if key not in self._access:
+            self._access[key] = os.access(key[0], mode)
+        return self._access[key]
+
+    def invalidate(self, *paths: str) -> None:
+        """
+        Drops the cached entry of paths that were created, removed or renamed.
+        """
+        for path in paths:
+            key = os.path.normpath(path)
+            self._stats.pop(key, None)
+            self._targets.pop(key, None)
+            for access_key in [access_key for access_key in self._access if access_key[0] == key]:
+                del self._access[access_key]
+
+    @property
+    def max_stats_per_path(self) -> int:
+        """
+        The most syscalls made for a single path, 0 before the first check.
+        """
+        return max(self.stat_calls.values(), default=0)
+
+    def report(self) -> str:
+        """
+        Returns the counters of the snapshot on one line, for '--stat-report'.
+        """
+        return (
+            f"stat snapshot: {self.lookups} lookups, {sum(self.stat_calls.values())} lstat calls "
+            f"over {len(self.stat_calls)} paths (max {self.max_stats_per_path} per path)"
+        )
+
+
+_current_snapshot: ContextVar[StatSnapshot | None] = ContextVar("current_snapshot", default=None)
+
+
+def begin_snapshot() -> StatSnapshot:
+    """
+    Starts a new snapshot for the command about to be parsed and executed.
+    """
+    snapshot = StatSnapshot()
+    _current_snapshot.set(snapshot)
+    return snapshot
+
+
+def current_snapshot() -> StatSnapshot:
+    """
+    Returns the snapshot of the running command, starting one when there is none.
+    """
+    snapshot = _current_snapshot.get()
+    return snapshot if snapshot is not None else begin_snapshot()
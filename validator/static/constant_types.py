@@ -10,6 +10,7 @@ class FileOperation(StrEnum):
     CREATE = "create"
     DELETE = "delete"
     RENAME = "rename"
+    COPY = "copy"
 
 
 class FilePermission(StrEnum):
@@ -32,6 +33,39 @@ class DirectoryOperation(StrEnum):
     CURRENT = "pwd"
 
 
+class JobControl(StrEnum):
+    """
+    A string enum class used to store the builtin commands that control
+    the background jobs started with a trailing '&'.
+    """
+    JOBS = "jobs"
+    WAIT = "wait"
+    KILL = "kill"
+
+
+class StatsAction(StrEnum):
+    """
+    A string enum class used to store the actions of the 'stats' builtin,
+    which shows the per-phase latency metrics of the commands.
+    """
+    EXPORT = "export"
+    RESET = "reset"
+    ON = "on"
+    OFF = "off"
+
+
+class InspectionCommand(StrEnum):
+    """
+    A string enum class used to store the builtin commands that inspect a
+    directory tree without changing it.
+    """
+    WATCH = "watch"
+    FIND = "find"
+    SEARCH = "search"
+    USAGE = "usage"
+    DUPES = "dupes"
+
+
 class Platform(StrEnum):
     """
         A string enum class that stores the various platforms/ Operating Systems
@@ -42,6 +76,16 @@ class Platform(StrEnum):
     MAC = "darwin"
 
 
+class ExecutionMode(StrEnum):
+    """
+        A string enum class that stores the backends available for executing
+        file operations, either directly in the process through 'os' calls
+        or by spawning the platform command.
+    """
+    BUILTIN = "builtin"
+    SUBPROCESS = "subprocess"
+
+
 
 #A dictionary that maps each file operation to its corresponding commands
 # for different platforms. Each key represents a FileOperation, and its value
@@ -63,6 +107,23 @@ FILE_OPERATIONS: Dict[FileOperation, Dict[Platform, List[str]]] = {
         Platform.LINUX: ["mv"],  # Command for renaming a file on Linux
         Platform.MAC: ["mv"],  # Command for renaming a file on macOS
     },
+    FileOperation.COPY: {
+        Platform.WINDOWS: ["cmd", "/c", "copy"],  # Command for copying a file on Windows
+        Platform.LINUX: ["cp"],  # Command for copying a file on Linux
+        Platform.MAC: ["cp"],  # Command for copying a file on macOS
+    },
+}
+
+
+# The options of 'copy' that also copy the timestamps and permissions of the files.
+COPY_PRESERVE_OPTIONS = ("--preserve", "-p")
+
+# The arguments added to the 'copy' command to preserve the metadata of the files,
+# 'copy' on Windows always keeps the modification time.
+COPY_PRESERVE_FLAGS: Dict[Platform, List[str]] = {
+    Platform.WINDOWS: [],
+    Platform.LINUX: ["-p"],
+    Platform.MAC: ["-p"],
 }
 
 
@@ -96,8 +157,8 @@ FILE_PERMISSIONS: Dict[FilePermission, Dict[Platform, List[str]]] ={
 
     FilePermission.MODIFY: {
         Platform.WINDOWS: ["cmd", "/c","icacls"],
-        Platform.MAC: ["chmod", "permission"],
-        Platform.LINUX: ["chmod", "permission"]
+        Platform.MAC: ["chmod"],
+        Platform.LINUX: ["chmod"]
 
     },
     FilePermission.LIST:{
@@ -133,6 +194,24 @@ DIRECTORY_OPERATIONS: Dict[DirectoryOperation, Dict[Platform, List[str]]] = {
 }
 
 
+# The options of 'make' that create the missing parent directories of the path.
+MAKE_PARENTS_OPTIONS = ("--parents", "-p")
+
+# The arguments added to the 'make' command to create missing parent directories,
+# 'mkdir' on Windows always creates them.
+MAKE_PARENTS_FLAGS: Dict[Platform, List[str]] = {
+    Platform.WINDOWS: [],
+    Platform.LINUX: ["-p"],
+    Platform.MAC: ["-p"],
+}
+
+
+# The options of 'watch' that also watch the subdirectories, and that scan the
+# directory periodically instead of subscribing to the change notifications of the kernel.
+WATCH_RECURSIVE_OPTIONS = ("--recursive", "-r")
+WATCH_POLL_OPTIONS = ("--poll",)
+
+
 # A dictionary to store different ASCII color codes for console output formatting.
 ConsoleColors = {
     "RESET": "\033[0m",  # Resets color to default
@@ -144,7 +223,10 @@ ConsoleColors = {
 
 
 # A list that contains the valid file extensions that the program supports.
-VALID_EXTENSIONS = [".txt", ".pdf", ".docx",".dat",".csv",".json",".xml",".html",".css",".js",".py",".java",".cpp",".c",".h",".hpp",".php",".sql",".sh",".bat"]
+VALID_EXTENSIONS = [
+    ".txt", ".pdf", ".docx", ".dat", ".csv", ".json", ".xml", ".html", ".css", ".js", ".py",
+    ".java", ".cpp", ".c", ".h", ".hpp", ".php", ".sql", ".sh", ".bat", ".tmp", ".log",
+]
 
 
 # A list of valid pipe symbols that may be used in command-line operations.
@@ -45,3 +45,32 @@ class RedirectionError(CustomBaseException):
     Exception raised for an invalid directory management command.
     """
     pass
+
+
+class JobControlError(CustomBaseException):
+    """
+    Exception raised for an invalid background job or job control command.
+    """
+    pass
+
+
+class MetricsError(CustomBaseException):
+    """
+    Exception raised for an invalid 'stats' command or a failed metrics export.
+    """
+    pass
+
+
+class HistoryError(CustomBaseException):
+    """
+    Exception raised for an invalid 'history' command.
+    """
+    pass
+
+
+class InspectionError(CustomBaseException):
+    """
+    Exception raised for an invalid 'watch', 'find', 'search', 'usage' or 'dupes' command,
+    or a path that cannot be inspected.
+    """
+    pass
@@ -0,0 +1,39 @@
+from typing import List
+import os
+
+from validator.validator import Validator
+from validator.static.constant_types import StatsAction
+from validator.static.exceptions import MetricsError
+from validator.stat_snapshot import current_snapshot
+
+
+class StatsValidator(Validator):
+    """
+        Validates the 'stats' builtin: 'stats' shows the phase metrics,
+        'stats export <path>' writes them to a file, 'stats reset' clears them
+        and 'stats on' / 'stats off' start or stop collecting them.
+    """
+
+    def __init__(self, parsed_inputs: List[str]):
+        super().__init__()
+        self.parsed_inputs = parsed_inputs
+
+    def validate(self) -> bool:
+        if len(self.parsed_inputs) == 1:
+            return True
+
+        action = self.parsed_inputs[1]
+        if action not in StatsAction:
+            raise MetricsError(
+                f"Invalid stats action: '{action}', expected one of: {', '.join(StatsAction)}"
+            )
+
+        if action == StatsAction.EXPORT:
+            if len(self.parsed_inputs) != 3:
+                raise MetricsError("Usage: stats export <path>, a '.json' path is written as JSON")
+            directory = os.path.dirname(os.path.abspath(self.parsed_inputs[2]))
+            if not current_snapshot().is_dir(directory, follow_symlinks=True):
+                raise MetricsError(f"Directory does not exist: {directory}")
+        elif len(self.parsed_inputs) > 2:
+            raise MetricsError(f"'stats {action}' takes no argument")
+        return True
@@ -1,34 +1,36 @@
 from typing import List
 
-from validator.static.constant_types import FileOperation, FilePermission, DirectoryOperation
+from validator.command_registry import COMMANDS, CommandRegistry
 
 
 class Validator:
+    """
+        Base class of the validators, every registered command is validated
+        by constructing its validator with 'from_parsed_input' and calling 'validate'.
+    """
 
+    REGISTRY: CommandRegistry = COMMANDS
 
-    def __init__(self):
-        self.VALID_OPERATIONS: List[str] = self.get_valid_operations()
+    @classmethod
+    def from_parsed_input(cls, parsed_inputs: List[str]) -> "Validator":
+        """
+            Builds the validator from the full parsed command, the command name included.
+        """
+        return cls(parsed_inputs)
+
+    def validate(self) -> bool:
+        """
+            Checks the command, raising the error of the validator when it is invalid.
+        """
+        raise NotImplementedError
 
     @staticmethod
     def get_valid_operations() -> List[str]:
         """
             function is used to retrieve the operations
             the program support
-            operations is retrieved from the enum: 'FileOperation'
-            from 'FileOperation' it retrieves the names which are essentially
-            the variables in that enum and because they are upper
-            case they are needed to be lowercase
-            and 'help' operation will be added as that is not in
-            the 'FileOperation' enum, but it is a
-            valid operation.
+            operations are the names of the commands in the command registry,
+            'help' included.
             :return: A list of valid operations.
         """
-        operations = [
-            operation.value
-            for group in (FileOperation, FilePermission, DirectoryOperation)
-            for operation in group
-        ]
-        operations.append("help")
-        return operations
-
-
+        return COMMANDS.names()